@@ -1,6 +1,7 @@
 import 'package:supabase_flutter/supabase_flutter.dart';
 import 'dart:convert';
 import '../../core/storage/hive_service.dart';
+import '../../core/storage/question_id_migration.dart';
 import '../../core/storage/user_preferences_service.dart';
 import '../../domain/usecases/exam_readiness_calculator.dart';
 import '../debug/app_logger.dart';
@@ -314,7 +315,11 @@ class SyncService {
         answersRaw.map((key, value) => MapEntry(key.toString(), value)),
       );
     }
-    result['answers'] = mergedAnswers;
+    // Cloud progress may still use question IDs renamed since it was uploaded
+    result['answers'] = QuestionIdMigration.remapAnswers(
+      mergedAnswers,
+      QuestionIdMigration.appliedRenames(localProgress),
+    );
 
     // Update exam history from merged progress
     // Convert Hive's List<dynamic> to List<Map<String, dynamic>>
@@ -116,6 +116,23 @@ class FavoritesService {
     }
   }
 
+  /// استبدال معرف قديم بمعرف جديد في المفضلة (QuestionIdMigration)
+  static Future<void> replaceFavorite(int oldId, int newId) async {
+    final favorites = getFavoriteIds();
+    if (!favorites.contains(oldId)) return;
+    favorites.remove(oldId);
+    if (!favorites.contains(newId)) favorites.add(newId);
+    await _favoritesBox?.put(_favoritesListKey, favorites);
+  }
+
+  /// إضافة المعرف الجديد إلى المفضلة إذا كان المعرف القديم فيها (QuestionIdMigration)
+  static Future<void> copyFavorite(int oldId, int newId) async {
+    final favorites = getFavoriteIds();
+    if (!favorites.contains(oldId) || favorites.contains(newId)) return;
+    favorites.add(newId);
+    await _favoritesBox?.put(_favoritesListKey, favorites);
+  }
+
   /// مسح جميع المفضلة
   static Future<void> clearAll() async {
     AppLogger.functionStart('clearAll', source: 'FavoritesService');
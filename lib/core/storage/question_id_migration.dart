@@ -0,0 +1,188 @@
+import '../debug/app_logger.dart';
+import 'favorites_service.dart';
+import 'hive_service.dart';
+import 'srs_service.dart';
+import 'user_preferences_service.dart';
+
+/// ترحيل معرفات أسئلة الولايات التي تغيّرت
+///
+/// Two states shipped question IDs that were also used by another state
+/// (Hessen 20621-20630 = Bremen, Brandenburg 20410 = Berlin) and were
+/// renumbered. Progress, SRS data and favorites saved under the old IDs are
+/// moved to the new ones once, for the state the user selected.
+///
+/// The renames that were applied are kept in the progress map, so answers
+/// restored from the cloud under an old ID can be moved as well
+/// (see [remapAnswers]).
+///
+/// The category files (rights, system, history, society, welfare) used IDs
+/// that belong to other general questions, e.g. rights #20 next to general
+/// #20. Both questions showed the progress saved under that ID. They now have
+/// their own IDs (301-319, or the ID of the general question they repeat), so
+/// that progress is copied to the new ID; the old ID keeps it for the general
+/// question (see [_categoryIds]).
+class QuestionIdMigration {
+  static const String _migrationKey = 'question_id_migration';
+  static const String _renamesKey = 'renamed_question_ids';
+  static const int _stateVersion = 1;
+  static const int _version = 2;
+
+  // مفتاح المفضلة القديم داخل صندوق التقدم (HiveService)
+  static const String _favoritesKey = 'favorites';
+
+  /// القديم -> الجديد لكل ولاية
+  static const Map<String, Map<int, int>> _renamedIds = {
+    'HE': {
+      20621: 20631,
+      20622: 20632,
+      20623: 20633,
+      20624: 20634,
+      20625: 20635,
+      20626: 20636,
+      20627: 20637,
+      20628: 20638,
+      20629: 20639,
+      20630: 20640,
+    },
+    'BB': {
+      20410: 20420,
+    },
+  };
+
+  /// أسئلة الفئات: المعرف القديم (مشترك مع سؤال عام) -> المعرف الجديد
+  static const Map<int, int> _categoryIds = {
+    // questions_rights.json
+    20: 301, 60: 247, 70: 302, 77: 303, 83: 304, 127: 305, 132: 306,
+    // questions_system.json
+    11: 307, 14: 308, 26: 309, 43: 310, 55: 311, 99: 242,
+    // questions_history.json (300 before 297 below: 300 is copied first)
+    155: 312, 156: 313, 157: 175, 158: 314, 300: 315,
+    // questions_society.json
+    27: 316, 255: 317, 297: 300,
+    // questions_welfare.json
+    73: 318, 250: 319,
+  };
+
+  /// تنفيذ الترحيل مرة واحدة (بعد تهيئة Hive و FavoritesService)
+  static Future<void> run() async {
+    AppLogger.functionStart('QuestionIdMigration.run', source: 'QuestionIdMigration');
+    try {
+      final progress = HiveService.getUserProgress();
+      final done = (progress?[_migrationKey] as num?)?.toInt() ?? 0;
+      if (progress == null || done >= _version) {
+        AppLogger.functionEnd('QuestionIdMigration.run', source: 'QuestionIdMigration');
+        return;
+      }
+
+      // بدون ولاية مختارة لا يمكن معرفة أي سؤال تعنيه المعرفات - نعيد المحاولة لاحقاً
+      final stateCode = await UserPreferencesService.getSelectedState();
+      if (stateCode == null) {
+        AppLogger.functionEnd('QuestionIdMigration.run', source: 'QuestionIdMigration');
+        return;
+      }
+
+      var renames = const <int, int>{};
+      if (done < _stateVersion) {
+        renames = _renamedIds[stateCode] ?? const <int, int>{};
+        for (final entry in renames.entries) {
+          await SrsService.moveSrsData(entry.key, entry.value);
+          await FavoritesService.replaceFavorite(entry.key, entry.value);
+        }
+        progress['answers'] = remapAnswers(progress['answers'], renames);
+        final stateFavorites = _remapIds(progress[_favoritesKey], renames);
+        if (stateFavorites != null) progress[_favoritesKey] = stateFavorites;
+        progress[_renamesKey] =
+            renames.map((oldId, newId) => MapEntry(oldId.toString(), newId));
+      }
+
+      // أسئلة الفئات: نسخ (وليس نقل) لأن المعرف القديم ما زال سؤالاً عاماً
+      for (final entry in _categoryIds.entries) {
+        await SrsService.copySrsData(entry.key, entry.value);
+        await FavoritesService.copyFavorite(entry.key, entry.value);
+      }
+      progress['answers'] = copyAnswers(progress['answers'], _categoryIds);
+      final categoryFavorites = _copyIds(progress[_favoritesKey], _categoryIds);
+      if (categoryFavorites != null) progress[_favoritesKey] = categoryFavorites;
+
+      progress[_migrationKey] = _version;
+      await HiveService.saveUserProgress(progress);
+
+      AppLogger.event('Question IDs migrated', source: 'QuestionIdMigration', data: {
+        'state': stateCode,
+        'renamed': renames.length,
+        'copied': _categoryIds.length,
+      });
+      AppLogger.functionEnd('QuestionIdMigration.run', source: 'QuestionIdMigration');
+    } catch (e, stackTrace) {
+      AppLogger.error('Failed to migrate question IDs',
+          source: 'QuestionIdMigration', error: e, stackTrace: stackTrace);
+    }
+  }
+
+  /// المعرفات التي تم ترحيلها لهذا المستخدم (من خريطة التقدم)
+  static Map<int, int> appliedRenames(Map<String, dynamic> progress) {
+    final renamesRaw = progress[_renamesKey];
+    if (renamesRaw is! Map) return const {};
+    final renames = <int, int>{};
+    renamesRaw.forEach((oldId, newId) {
+      final from = int.tryParse(oldId.toString());
+      final to = newId is int ? newId : int.tryParse(newId.toString());
+      if (from != null && to != null) renames[from] = to;
+    });
+    return renames;
+  }
+
+  /// نقل الإجابات المحفوظة تحت معرف قديم إلى المعرف الجديد
+  ///
+  /// An answer already saved under the new ID is kept; the old entry is
+  /// dropped either way.
+  static Map<String, dynamic> remapAnswers(dynamic answersRaw, Map<int, int> renames) {
+    final answers = answersRaw is Map
+        ? Map<String, dynamic>.from(
+            answersRaw.map((key, value) => MapEntry(key.toString(), value)))
+        : <String, dynamic>{};
+    for (final entry in renames.entries) {
+      final answer = answers.remove(entry.key.toString());
+      if (answer != null) {
+        answers.putIfAbsent(entry.value.toString(), () => answer);
+      }
+    }
+    return answers;
+  }
+
+  /// نسخ الإجابات المحفوظة تحت معرف قديم إلى المعرف الجديد (يبقى القديم)
+  static Map<String, dynamic> copyAnswers(dynamic answersRaw, Map<int, int> copies) {
+    final answers = answersRaw is Map
+        ? Map<String, dynamic>.from(
+            answersRaw.map((key, value) => MapEntry(key.toString(), value)))
+        : <String, dynamic>{};
+    for (final entry in copies.entries) {
+      final answer = answers[entry.key.toString()];
+      if (answer != null) {
+        answers.putIfAbsent(entry.value.toString(), () => answer);
+      }
+    }
+    return answers;
+  }
+
+  static List<int>? _copyIds(dynamic idsRaw, Map<int, int> copies) {
+    final ids = _remapIds(idsRaw, const {});
+    if (ids == null) return null;
+    for (final entry in copies.entries) {
+      if (ids.contains(entry.key) && !ids.contains(entry.value)) ids.add(entry.value);
+    }
+    return ids;
+  }
+
+  static List<int>? _remapIds(dynamic idsRaw, Map<int, int> renames) {
+    if (idsRaw is! List) return null;
+    final ids = <int>[];
+    for (final raw in idsRaw) {
+      final id = raw is int ? raw : int.tryParse(raw.toString());
+      if (id == null) continue;
+      final mapped = renames[id] ?? id;
+      if (!ids.contains(mapped)) ids.add(mapped);
+    }
+    return ids;
+  }
+}
@@ -22,6 +22,23 @@ class SrsService {
     });
   }
 
+  /// نقل بيانات SRS من معرف قديم إلى معرف جديد (QuestionIdMigration)
+  static Future<void> moveSrsData(int oldId, int newId) async {
+    final data = _srsBox?.get('q_$oldId');
+    if (data == null) return;
+    if (_srsBox?.get('q_$newId') == null) {
+      await _srsBox?.put('q_$newId', data);
+    }
+    await _srsBox?.delete('q_$oldId');
+  }
+
+  /// نسخ بيانات SRS من معرف قديم إلى معرف جديد دون حذف القديم (QuestionIdMigration)
+  static Future<void> copySrsData(int oldId, int newId) async {
+    final data = _srsBox?.get('q_$oldId');
+    if (data == null || _srsBox?.get('q_$newId') != null) return;
+    await _srsBox?.put('q_$newId', data);
+  }
+
   /// جلب بيانات SRS لسؤال معين
   static Map<String, dynamic>? getSrsData(int questionId) {
     final data = _srsBox?.get('q_$questionId');
@@ -82,26 +82,8 @@ class LocalDataSourceImpl implements LocalDataSource {
           }
         }
       } catch (e2) {
-        // Last fallback: try old questions.json
-        try {
-          final String response = await rootBundle.loadString('assets/data/questions.json');
-          final List<dynamic> data = json.decode(response);
-          
-          for (var item in data) {
-            try {
-              if (item is Map<String, dynamic>) {
-                final question = QuestionModel.fromJson(item);
-                if (question.stateCode == null) {
-                  allQuestions.add(question);
-                }
-              }
-            } catch (e3) {
-              continue;
-            }
-          }
-        } catch (e3) {
-          throw Exception('Failed to load general questions from all sources: $e3');
-        }
+        // questions.json is the content source and is not bundled
+        throw Exception('Failed to load general questions from all sources: $e2');
       }
     }
     
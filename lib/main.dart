@@ -8,6 +8,7 @@ import 'core/theme/app_colors.dart';
 import 'core/storage/hive_service.dart';
 import 'core/storage/user_preferences_service.dart';
 import 'core/storage/favorites_service.dart';
+import 'core/storage/question_id_migration.dart';
 import 'core/services/notification_service.dart';
 import 'core/services/subscription_service.dart';
 import 'core/services/sync_service.dart';
@@ -47,6 +48,13 @@ void main() async {
     AppLogger.error('Failed to init FavoritesService', source: 'main', error: e, stackTrace: stack);
   }
 
+  try {
+    // نقل التقدم المحفوظ تحت معرفات الأسئلة التي تغيّرت
+    await QuestionIdMigration.run();
+  } catch (e, stack) {
+    AppLogger.error('Failed to migrate question IDs', source: 'main', error: e, stackTrace: stack);
+  }
+
   try {
     await SubscriptionService.init();
   } catch (e, stack) {
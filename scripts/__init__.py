@@ -0,0 +1,15 @@
+"""
+Content scripts for the question assets.
+
+The scripts are run directly (python scripts/<name>.py) and import each other
+as top-level modules (from corpus import Corpus). Importing them as a package
+(from scripts.corpus import Corpus) works too: the package directory is put on
+sys.path so those sibling imports resolve.
+"""
+
+import os
+import sys
+
+_SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if _SCRIPTS_DIR not in sys.path:
+    sys.path.append(_SCRIPTS_DIR)
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Content Pipeline Benchmarks
+Times the content scripts on synthetic corpora shaped like questions.json at
+1x, 10x, 100x and 1000x its size, offline.
+
+The 1x corpus is questions.json plus the questions of the state files (the
+what the question store holds). Each further copy gets new IDs and its German
+and translated texts get a copy suffix, so deduplication and caches see
+distinct strings, as with a larger catalogue.
+
+Cases (each run in a fresh worker process, inside a temporary project tree):
+  load             corpus.load_questions on questions.json
+  questions        question_store.py build (general and state files from the store)
+  translate        translate_questions.py engine pass (all target languages missing)
+  translate_states generate_state_questions.py translate pass over the state questions
+  refine           improve_translation on every Arabic string
+  glossary_links   glossary_links.py index over every question, all languages
+
+Translation cases run once per fake backend: 'fake' (no latency) and
+'fake:<ms>' (fixed latency per request). Every result records wall time, peak
+memory (RSS high-water mark of the worker process) and items per second.
+
+Results are written as JSON (.cache/benchmarks/latest.json) and compared with
+the stored baseline (.cache/benchmarks/baseline.json) when one exists; results
+slower or larger than the baseline by more than the threshold are flagged as
+regressions.
+
+Usage:
+  python scripts/benchmark.py                          # scales 1,10,100
+  python scripts/benchmark.py --scales 1,10,100,1000 --cases questions,refine
+  python scripts/benchmark.py --save-baseline          # store this run as the baseline
+  python scripts/benchmark.py --fail-on-regression     # exit 1 on regressions (CI)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows: no RSS high-water mark
+    resource = None
+
+from corpus import load_questions, question_files, state_file
+from json_io import JsonArrayWriter, atomic_write_json
+from question_store import GENERAL_OUTPUT, LAYOUT_FILE, STATES_OUTPUT_DIR, save_layout
+
+# Configuration
+DATA_DIR = 'assets/data'
+QUESTIONS_FILE = 'assets/data/questions.json'
+RULES_DIR = 'scripts/refinement_rules'
+GLOSSARY_FILE = 'assets/data/glossary.json'
+RESULTS_FILE = '.cache/benchmarks/latest.json'
+BASELINE_FILE = '.cache/benchmarks/baseline.json'
+SCALES = [1, 10, 100, 1000]
+DEFAULT_SCALES = [1, 10, 100]
+CASES = ['load', 'questions', 'translate', 'translate_states', 'refine', 'glossary_links']
+TRANSLATION_CASES = {'translate', 'translate_states'}
+DEFAULT_LATENCY_MS = 20
+# Fixed-latency translation runs grow with the number of requests, so they are
+# only run up to this scale unless --latency-max-scale says otherwise
+LATENCY_MAX_SCALE = 10
+REGRESSION_THRESHOLD = 1.25
+SOURCE_LANGUAGE = 'de'
+ID_STRIDE = 1_000_000
+
+
+def template_questions(data_dir: str = DATA_DIR) -> List[Dict[str, Any]]:
+    """questions.json plus the state questions that are not in it."""
+    questions = load_questions(os.path.join(data_dir, 'questions.json'))
+    seen = {(q.get('id'), q.get('state_code')) for q in questions}
+    for path in question_files(data_dir):
+        if os.path.dirname(path) == os.path.join(data_dir, 'states'):
+            for question in load_questions(path):
+                if (question.get('id'), question.get('state_code')) not in seen:
+                    seen.add((question.get('id'), question.get('state_code')))
+                    questions.append(question)
+    return questions
+
+
+def _suffixed(text: Any, suffix: str) -> Any:
+    if isinstance(text, dict):
+        return {lang: f"{value}{suffix}" if isinstance(value, str) and value else value
+                for lang, value in text.items()}
+    return text
+
+
+def synthetic_questions(templates: List[Dict[str, Any]], scale: int) -> Iterator[Dict[str, Any]]:
+    """scale copies of templates; copy k > 0 has shifted IDs and suffixed texts."""
+    for copy_index in range(scale):
+        if copy_index == 0:
+            yield from templates
+            continue
+        suffix = f" ({copy_index})"
+        for question in templates:
+            variant = dict(question)
+            if isinstance(question.get('id'), int):
+                variant['id'] = question['id'] + copy_index * ID_STRIDE
+            variant['question'] = _suffixed(question.get('question'), suffix)
+            variant['answers'] = [dict(answer, text=_suffixed(answer.get('text'), suffix))
+                                  for answer in question.get('answers', [])]
+            yield variant
+
+
+def write_corpus(root: str, templates: List[Dict[str, Any]], scale: int) -> Tuple[int, int]:
+    """
+    Write the synthetic questions.json under root, with a layout that selects
+    each question for the general file or its state file. Returns (questions, bytes).
+    """
+    writer = JsonArrayWriter(os.path.join(root, QUESTIONS_FILE))
+    layout: Dict[str, List[int]] = {}
+    for question in synthetic_questions(templates, scale):
+        writer.write(question)
+        code = question.get('state_code')
+        output = (state_file(code, STATES_OUTPUT_DIR) if code else None) or GENERAL_OUTPUT
+        layout.setdefault(output.replace(os.sep, '/'), []).append(question['id'])
+    writer.close()
+    save_layout(layout, os.path.join(root, LAYOUT_FILE))
+    os.makedirs(os.path.join(root, DATA_DIR, 'states'), exist_ok=True)
+    if not os.path.exists(os.path.join(root, RULES_DIR)):
+        shutil.copytree(RULES_DIR, os.path.join(root, RULES_DIR))
+    shutil.copyfile(GLOSSARY_FILE, os.path.join(root, GLOSSARY_FILE))
+    return writer.count, writer.size
+
+
+def _source_only(text: Any) -> Any:
+    return {SOURCE_LANGUAGE: text.get(SOURCE_LANGUAGE, '')} if isinstance(text, dict) else text
+
+
+def strip_translations(questions: List[Dict[str, Any]]) -> None:
+    """Drop every translation, so each field needs work."""
+    for question in questions:
+        question['question'] = _source_only(question.get('question'))
+        for answer in question.get('answers', []):
+            answer['text'] = _source_only(answer.get('text'))
+
+
+# Cases run inside the worker process, in the corpus root. Each takes the
+# backend name and returns (result counts, seconds), timing only its own work.
+
+def case_load(backend: str) -> Tuple[Dict[str, Any], float]:
+    start = time.perf_counter()
+    questions = load_questions(QUESTIONS_FILE)
+    return {'items': len(questions)}, time.perf_counter() - start
+
+
+def case_questions(backend: str) -> Tuple[Dict[str, Any], float]:
+    import question_store
+    start = time.perf_counter()
+    results = question_store.build()
+    seconds = time.perf_counter() - start
+    return {'items': sum(count for count, _ in results.values())}, seconds
+
+
+def case_translate(backend: str) -> Tuple[Dict[str, Any], float]:
+    import translate_questions
+    from translation_engine import TranslationEngine, create_backend
+
+    questions = load_questions(QUESTIONS_FILE)
+    strip_translations(questions)
+    engine = TranslationEngine(create_backend(backend), rps=0, source_lang=SOURCE_LANGUAGE)
+    start = time.perf_counter()
+    jobs = translate_questions.process_corpus({QUESTIONS_FILE: questions}, engine)
+    seconds = time.perf_counter() - start
+    return {'items': jobs, 'requests': engine.backend.calls}, seconds
+
+
+def case_translate_states(backend: str) -> Tuple[Dict[str, Any], float]:
+    import generate_state_questions
+
+    corpus: Dict[str, List[Dict[str, Any]]] = {}
+    for question in load_questions(QUESTIONS_FILE):
+        if question.get('state_code'):
+            corpus.setdefault(question['state_code'], []).append(question)
+    for questions in corpus.values():
+        strip_translations(questions)
+    jobs = sum(len(generate_state_questions.TARGET_LANGUAGES) * (1 + len(q.get('answers', [])))
+               for questions in corpus.values() for q in questions)
+    start = time.perf_counter()
+    generate_state_questions.translate_state_corpus(corpus, backend=backend)
+    return {'items': jobs}, time.perf_counter() - start
+
+
+def case_refine(backend: str) -> Tuple[Dict[str, Any], float]:
+    from refine_arabic_translations_system import improve_translation
+
+    pairs = []
+    for question in load_questions(QUESTIONS_FILE):
+        texts = [question.get('question')] + [a.get('text') for a in question.get('answers', [])]
+        pairs.extend((t['ar'], t.get(SOURCE_LANGUAGE, '')) for t in texts if isinstance(t, dict) and t.get('ar'))
+    start = time.perf_counter()
+    for text, context in pairs:
+        improve_translation(text, context)
+    return {'items': len(pairs)}, time.perf_counter() - start
+
+
+def case_glossary_links(backend: str) -> Tuple[Dict[str, Any], float]:
+    import glossary_links
+
+    terms = load_questions(GLOSSARY_FILE)
+    questions = list(glossary_links.bundled_questions())
+    start = time.perf_counter()
+    glossary_links.link_index(questions, terms)
+    return {'items': len(questions)}, time.perf_counter() - start
+
+
+CASE_FUNCTIONS = {
+    'load': case_load,
+    'questions': case_questions,
+    'translate': case_translate,
+    'translate_states': case_translate_states,
+    'refine': case_refine,
+    'glossary_links': case_glossary_links,
+}
+
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def run_case_here(case: str, backend: str) -> Dict[str, Any]:
+    """Run one case in this process (the worker); output is suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        result, seconds = CASE_FUNCTIONS[case](backend)
+    result['seconds'] = round(seconds, 4)
+    result['items_per_second'] = round(result['items'] / seconds, 1) if seconds else None
+    if 'requests' in result:
+        result['requests_per_second'] = round(result['requests'] / seconds, 1) if seconds else None
+    result['peak_mb'] = peak_rss_mb()
+    return result
+
+
+def run_case(root: str, case: str, backend: str) -> Dict[str, Any]:
+    """Run one case in a fresh worker process with root as working directory."""
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '_worker', case, backend],
+        cwd=root, capture_output=True, text=True, encoding='utf-8')
+    if completed.returncode != 0:
+        return {'error': (completed.stderr.strip().splitlines() or ['worker failed'])[-1]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def plan(cases: List[str], scales: List[int], latency_ms: float,
+         latency_max_scale: int) -> List[Tuple[int, str, str]]:
+    """(scale, case, backend) runs in order."""
+    runs = []
+    for scale in scales:
+        for case in cases:
+            if case in TRANSLATION_CASES:
+                runs.append((scale, case, 'fake'))
+                if latency_ms and scale <= latency_max_scale:
+                    runs.append((scale, case, f"fake:{latency_ms:g}"))
+            else:
+                runs.append((scale, case, '-'))
+    return runs
+
+
+def result_key(result: Dict[str, Any]) -> Tuple[str, int, str]:
+    return result['case'], result['scale'], result['backend']
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any],
+            threshold: float) -> List[str]:
+    """Annotate results with ratios to the baseline; return regression descriptions."""
+    previous = {result_key(r): r for r in baseline.get('results', []) if 'seconds' in r}
+    regressions = []
+    for result in results:
+        old = previous.get(result_key(result))
+        if old is None or 'seconds' not in result:
+            continue
+        result['time_ratio'] = round(result['seconds'] / old['seconds'], 2) if old['seconds'] else None
+        if result.get('peak_mb') and old.get('peak_mb'):
+            result['memory_ratio'] = round(result['peak_mb'] / old['peak_mb'], 2)
+        for metric in ('time_ratio', 'memory_ratio'):
+            if result.get(metric) and result[metric] > threshold:
+                regressions.append(f"{result['case']} {result['scale']}x [{result['backend']}]: "
+                                   f"{metric.split('_')[0]} x{result[metric]}")
+    return regressions
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    label = f"{result['case']:<17} {result['scale']:>5}x {result['backend']:<8}"
+    if 'error' in result:
+        print(f"  {label} ERROR {result['error']}")
+        return
+    peak = f"{result['peak_mb']:8.1f} MB" if result.get('peak_mb') is not None else '        -'
+    ratios = ''.join(f"  {name} x{result[key]}" for name, key in (('time', 'time_ratio'), ('mem', 'memory_ratio'))
+                     if result.get(key) is not None)
+    print(f"  {label} {result['seconds'] * 1000:10.1f} ms {peak} {result['items_per_second'] or 0:12,.0f} items/s{ratios}")
+
+
+def benchmark(cases: List[str], scales: List[int], latency_ms: float, latency_max_scale: int,
+              out: str, baseline_file: str, threshold: float) -> Tuple[Dict[str, Any], List[str]]:
+    templates = template_questions()
+    runs = plan(cases, scales, latency_ms, latency_max_scale)
+    results = []
+    with tempfile.TemporaryDirectory(prefix='benchmark-') as tmp:
+        root = None
+        for scale, case, backend in runs:
+            if root != os.path.join(tmp, str(scale)):
+                root = os.path.join(tmp, str(scale))
+                count, size = write_corpus(root, templates, scale)
+                print(f"[INFO] {scale}x corpus: {count:,} questions, {size / (1024 * 1024):.1f} MB")
+            result = {'case': case, 'scale': scale, 'backend': backend, 'questions': count}
+            result.update(run_case(root, case, backend))
+            results.append(result)
+
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'results': results,
+    }
+    regressions = []
+    if baseline_file and os.path.exists(baseline_file):
+        with open(baseline_file, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), threshold)
+        report['baseline'] = baseline_file
+    report['regressions'] = regressions
+
+    print()
+    for result in results:
+        print_result(result)
+    atomic_write_json(report, out)
+    print(f"\n[OK] Results written to {out}")
+    return report, regressions
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == '_worker':
+        print(json.dumps(run_case_here(sys.argv[2], sys.argv[3])))
+        return
+
+    parser = argparse.ArgumentParser(description="Benchmark the content scripts on synthetic corpora")
+    parser.add_argument('--scales', default=','.join(map(str, DEFAULT_SCALES)),
+                        help=f"Comma-separated corpus scales out of {SCALES} (default {DEFAULT_SCALES})")
+    parser.add_argument('--cases', default=','.join(CASES), help=f"Comma-separated cases (default: all of {CASES})")
+    parser.add_argument('--latency-ms', type=float, default=DEFAULT_LATENCY_MS,
+                        help=f"Latency of the fixed-latency fake backend, 0 to skip (default {DEFAULT_LATENCY_MS})")
+    parser.add_argument('--latency-max-scale', type=int, default=LATENCY_MAX_SCALE,
+                        help=f"Largest scale for fixed-latency runs (default {LATENCY_MAX_SCALE})")
+    parser.add_argument('--out', default=RESULTS_FILE, help=f"Results file (default {RESULTS_FILE})")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help=f"Baseline file (default {BASELINE_FILE})")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help=f"Ratio to the baseline counted as a regression (default {REGRESSION_THRESHOLD})")
+    parser.add_argument('--fail-on-regression', action='store_true', help="Exit with status 1 on regressions")
+    args = parser.parse_args()
+
+    scales = [int(s) for s in args.scales.split(',') if s]
+    cases = [c for c in args.cases.split(',') if c]
+    unknown = [c for c in cases if c not in CASE_FUNCTIONS] + [str(s) for s in scales if s not in SCALES]
+    if unknown:
+        parser.error(f"unknown case or scale: {', '.join(unknown)}")
+
+    report, regressions = benchmark(cases, scales, args.latency_ms, args.latency_max_scale,
+                                    args.out, None if args.save_baseline else args.baseline, args.threshold)
+    if args.save_baseline:
+        atomic_write_json(report, args.baseline)
+        print(f"[OK] Baseline saved to {args.baseline}")
+    elif regressions:
+        print(f"\n[WARNING] {len(regressions)} regression(s) against {args.baseline}:")
+        for regression in regressions:
+            print(f"   - {regression}")
+    elif 'baseline' in report:
+        print(f"[OK] No regressions against {args.baseline} (threshold x{args.threshold})")
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
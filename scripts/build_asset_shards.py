@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Asset Shard Builder
+Splits the bundled question and glossary files into
+  - a language-neutral core file (ids, category, state, correct answer, ...)
+  - one text shard per language (only the strings of that language)
+so the app only has to decode the core plus German plus the UI language
+instead of all six languages.
+
+Shards are written to assets/data/shards/ (mirroring the source layout) as
+compact JSON. Top-level records in a text shard are in the same order as in the
+core file and carry the same 'id'. Nested records are aligned by index, and a
+nested record with a single text field becomes a bare string, e.g. a question
+shard record is {"id": 1, "question": "...", "answers": ["A", "B", "C", "D" texts]}.
+
+Usage:
+  python scripts/build_asset_shards.py [--out assets/data/shards] [--ui-lang en]
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+from typing import Any, Dict, List
+
+from json_io import write_text_if_changed
+
+# Configuration
+LANGUAGES = ['de', 'ar', 'en', 'tr', 'uk', 'ru']
+BASE_LANGUAGE = 'de'
+DATA_DIR = 'assets/data'
+SHARDS_DIR = 'assets/data/shards'
+SOURCE_FILES = ['questions_general.json', 'glossary.json']
+STATES_GLOB = 'states/*.json'
+PARSE_REPEATS = 20
+
+_LANGUAGE_SET = frozenset(LANGUAGES)
+
+
+def is_text_dict(value: Any) -> bool:
+    """A dict holding one string per language, e.g. question['question']."""
+    return isinstance(value, dict) and bool(value) and set(value) <= _LANGUAGE_SET
+
+
+def core_of(value: Any) -> Any:
+    """Copy of value with every language dict removed."""
+    if isinstance(value, dict):
+        return {k: core_of(v) for k, v in value.items() if not is_text_dict(v)}
+    if isinstance(value, list):
+        return [core_of(v) for v in value]
+    return value
+
+
+def has_text(value: Any) -> bool:
+    if is_text_dict(value):
+        return True
+    if isinstance(value, dict):
+        return any(has_text(v) for v in value.values())
+    if isinstance(value, list):
+        return any(has_text(v) for v in value)
+    return False
+
+
+def text_of(value: Any, lang: str, top_level: bool = True) -> Any:
+    """Projection of value onto one language: language dicts become plain strings."""
+    if is_text_dict(value):
+        return value.get(lang, '')
+    if isinstance(value, dict):
+        projected = {k: text_of(v, lang, False) for k, v in value.items() if has_text(v)}
+        if top_level:
+            return {'id': value['id'], **projected} if 'id' in value else projected
+        if len(projected) == 1:
+            return next(iter(projected.values()))
+        return projected
+    if isinstance(value, list):
+        return [text_of(v, lang, top_level) for v in value]
+    return value
+
+
+def compact(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def parse_ms(texts: List[str]) -> float:
+    """Median time (ms) to json.loads all texts."""
+    timings = []
+    for _ in range(PARSE_REPEATS):
+        start = time.perf_counter()
+        for text in texts:
+            json.loads(text)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+def shard_file(source_path: str, out_dir: str, ui_lang: str) -> Dict[str, Any]:
+    """Write the core + language shards for one source file and measure the savings."""
+    with open(source_path, 'r', encoding='utf-8') as f:
+        original = f.read()
+    records = json.loads(original)
+
+    relative = os.path.relpath(source_path, DATA_DIR)
+    stem = os.path.splitext(os.path.join(out_dir, relative))[0]
+
+    outputs = {f"{stem}.core.json": compact(core_of(records))}
+    for lang in LANGUAGES:
+        outputs[f"{stem}.{lang}.json"] = compact(text_of(records, lang))
+
+    written = sum(write_text_if_changed(text, path) for path, text in outputs.items())
+
+    needed = [outputs[f"{stem}.core.json"], outputs[f"{stem}.{BASE_LANGUAGE}.json"]]
+    if ui_lang != BASE_LANGUAGE:
+        needed.append(outputs[f"{stem}.{ui_lang}.json"])
+    return {
+        'file': relative,
+        'written': written,
+        'original_bytes': len(original.encode('utf-8')),
+        'needed_bytes': sum(len(text.encode('utf-8')) for text in needed),
+        'original_ms': parse_ms([original]),
+        'needed_ms': parse_ms(needed),
+    }
+
+
+def source_paths() -> List[str]:
+    paths = [os.path.join(DATA_DIR, name) for name in SOURCE_FILES]
+    paths += sorted(glob.glob(os.path.join(DATA_DIR, STATES_GLOB)))
+    return [path for path in paths if os.path.exists(path)]
+
+
+def pct(before: float, after: float) -> str:
+    return f"{100 * (1 - after / before):.0f}%" if before else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build per-language asset shards")
+    parser.add_argument('--out', default=SHARDS_DIR, help=f"Output directory (default {SHARDS_DIR})")
+    parser.add_argument('--ui-lang', default='en', choices=LANGUAGES,
+                        help="UI language assumed for the size/parse report (default en)")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("Asset Shard Builder")
+    print("=" * 70)
+
+    reports = [shard_file(path, args.out, args.ui_lang) for path in source_paths()]
+
+    print(f"\n{'File':<36}{'Bytes (all -> de+' + args.ui_lang + ')':>30}{'Parse ms':>18}")
+    for r in reports:
+        print(f"{r['file']:<36}{r['original_bytes']:>12,} -> {r['needed_bytes']:>9,} {pct(r['original_bytes'], r['needed_bytes']):>5}"
+              f"{r['original_ms']:>8.2f} -> {r['needed_ms']:.2f}")
+
+    total = {k: sum(r[k] for r in reports) for k in ('original_bytes', 'needed_bytes', 'original_ms', 'needed_ms', 'written')}
+    print(f"\n[SUMMARY]")
+    print(f"  - Source files: {len(reports)} ({total['written']} shard files written, others unchanged)")
+    print(f"  - Bytes to decode: {total['original_bytes']:,} -> {total['needed_bytes']:,} "
+          f"({pct(total['original_bytes'], total['needed_bytes'])} less)")
+    print(f"  - Parse time: {total['original_ms']:.1f} ms -> {total['needed_ms']:.1f} ms "
+          f"({pct(total['original_ms'], total['needed_ms'])} less)")
+    print(f"  - Output: {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Content Build Pipeline
+Runs the content scripts as stages with declared inputs and outputs under
+assets/data/, make-style but content-addressed:
+
+- A stage is skipped when the sha256 of its inputs (and of its script) matches
+  the digest recorded after its last successful run and all outputs exist.
+- A stage depends on every earlier stage it shares files with; stages without
+  a dependency between them run in parallel.
+
+Usage:
+  python scripts/build_content.py                 # build what changed
+  python scripts/build_content.py --dry-run       # show what would run
+  python scripts/build_content.py --force refine_arabic
+  python scripts/build_content.py --only questions --only refine_arabic
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, List, Set
+
+from json_io import atomic_write_json
+from metrics import metrics, run_metrics
+
+# Configuration
+BUILD_STATE_FILE = '.cache/build_state.json'
+SCRIPTS_DIR = 'scripts'
+STATES_GLOB = 'assets/data/states/*.json'
+STORE_FILES = ['assets/data/questions.json', 'assets/data/question_layout.json']
+GENERATED_FILES = ['assets/data/questions_general.json', 'assets/data/questions_rights.json',
+                   'assets/data/questions_system.json', 'assets/data/questions_europe.json',
+                   'assets/data/questions_history.json', 'assets/data/questions_society.json',
+                   'assets/data/questions_welfare.json', STATES_GLOB]
+
+
+@dataclass
+class Stage:
+    """One pipeline step: a script invocation with declared file patterns."""
+
+    name: str
+    command: List[str]
+    inputs: List[str]
+    outputs: List[str]
+
+    @property
+    def script(self) -> str:
+        return os.path.join(SCRIPTS_DIR, self.command[0])
+
+
+STAGES = [
+    # Creates the missing state files, with IDs and distractors taken from the store
+    Stage('state_templates', ['create_all_state_templates.py'],
+          inputs=[STATES_GLOB] + STORE_FILES,
+          outputs=[STATES_GLOB] + STORE_FILES),
+    Stage('translate_states', ['generate_state_questions.py', 'translate-all'],
+          inputs=[STATES_GLOB],
+          outputs=[STATES_GLOB] + STORE_FILES),
+    Stage('questions', ['question_store.py', 'build'],
+          inputs=STORE_FILES,
+          outputs=GENERATED_FILES),
+    Stage('refine_arabic', ['refine_arabic_translations_system.py'],
+          inputs=['assets/data/questions_system.json', 'scripts/refinement_rules/ar.json'],
+          outputs=GENERATED_FILES + STORE_FILES),
+    Stage('glossary_links', ['glossary_links.py'],
+          inputs=STORE_FILES + ['assets/data/glossary.json'],
+          outputs=['assets/data/glossary_links.json']),
+    Stage('asset_shards', ['build_asset_shards.py'],
+          inputs=['assets/data/questions_general.json', 'assets/data/glossary.json', STATES_GLOB],
+          outputs=['assets/data/shards/*.core.json']),
+    Stage('validate', ['validate_assets.py', '--summary'],
+          inputs=['assets/data/questions*.json', 'assets/data/questions_general.json',
+                  'assets/data/questions_system.json', 'assets/data/glossary.json', STATES_GLOB,
+                  'scripts/validation_allowlist.json'],
+          outputs=[]),
+]
+
+
+def expand(patterns: List[str]) -> List[str]:
+    """Expand glob patterns to a sorted list of existing files."""
+    files = set()
+    for pattern in patterns:
+        files.update(glob.glob(pattern))
+    return sorted(files)
+
+
+def stage_digest(stage: Stage) -> str:
+    """Content hash of a stage's script and its current input files."""
+    h = hashlib.sha256()
+    for path in [stage.script] + expand(stage.inputs):
+        h.update(path.encode('utf-8'))
+        h.update(b'\0')
+        with open(path, 'rb') as f:
+            h.update(hashlib.sha256(f.read()).digest())
+    return h.hexdigest()
+
+
+def outputs_exist(stage: Stage) -> bool:
+    """Every output pattern matches at least one file."""
+    return all(glob.glob(pattern) for pattern in stage.outputs)
+
+
+def dependencies(stages: List[Stage]) -> Dict[str, Set[str]]:
+    """
+    Stage -> earlier stages it must wait for: any earlier stage that writes a
+    pattern this one reads or writes, or reads a pattern this one writes.
+    """
+    deps: Dict[str, Set[str]] = {}
+    for i, stage in enumerate(stages):
+        reads, writes = set(stage.inputs), set(stage.outputs)
+        deps[stage.name] = {
+            earlier.name for earlier in stages[:i]
+            if set(earlier.outputs) & (reads | writes) or set(earlier.inputs) & writes
+        }
+    return deps
+
+
+def load_state() -> Dict[str, str]:
+    if not os.path.exists(BUILD_STATE_FILE):
+        return {}
+    with open(BUILD_STATE_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def run_stage(stage: Stage) -> subprocess.CompletedProcess:
+    """Run a stage script from the project root and capture its output."""
+    command = [sys.executable, stage.script] + stage.command[1:]
+    with metrics().stage(stage.name):
+        return subprocess.run(command, capture_output=True, text=True, encoding='utf-8')
+
+
+def build(stages: List[Stage], force: Set[str], dry_run: bool, jobs: int) -> bool:
+    """Run out-of-date stages in dependency order. Returns True if all succeeded."""
+    state = load_state()
+    deps = dependencies(stages)
+    by_name = {stage.name: stage for stage in stages}
+    remaining = [stage.name for stage in stages]
+    finished: Set[str] = set()
+    failed: Set[str] = set()
+    summary: Dict[str, str] = {}
+
+    def up_to_date(stage: Stage) -> bool:
+        return (stage.name not in force
+                and state.get(stage.name) == stage_digest(stage)
+                and outputs_exist(stage))
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        running = {}
+        while remaining or running:
+            # Start every stage whose dependencies are done
+            for name in list(remaining):
+                if not deps[name] <= finished | failed:
+                    continue
+                remaining.remove(name)
+                stage = by_name[name]
+                if deps[name] & failed:
+                    failed.add(name)
+                    summary[name] = 'blocked'
+                    continue
+                if up_to_date(stage):
+                    finished.add(name)
+                    summary[name] = 'up to date'
+                    continue
+                if dry_run:
+                    finished.add(name)
+                    summary[name] = 'would run'
+                    continue
+                print(f"[INFO] {name}: running {' '.join(stage.command)}")
+                running[pool.submit(run_stage, stage)] = (name, time.perf_counter())
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, started = running.pop(future)
+                result = future.result()
+                seconds = time.perf_counter() - started
+                output = (result.stdout + result.stderr).rstrip()
+                if output:
+                    print('\n'.join(f"   {name} | {line}" for line in output.splitlines()))
+                if result.returncode == 0:
+                    state[name] = stage_digest(by_name[name])
+                    atomic_write_json(state, BUILD_STATE_FILE)
+                    finished.add(name)
+                    summary[name] = f"ran in {seconds:.2f}s"
+                else:
+                    failed.add(name)
+                    summary[name] = f"FAILED (exit {result.returncode})"
+
+    print("\n[SUMMARY]")
+    for stage in stages:
+        print(f"  - {stage.name}: {summary.get(stage.name, 'skipped')}")
+    return not failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the question assets")
+    parser.add_argument('--only', action='append', choices=[s.name for s in STAGES],
+                        help="Limit the build to these stages (repeatable)")
+    parser.add_argument('--force', action='append', default=[], choices=[s.name for s in STAGES],
+                        help="Run a stage even if it is up to date (repeatable)")
+    parser.add_argument('--dry-run', action='store_true', help="Only report what would run")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 2,
+                        help="Maximum number of stages running at once")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("Content Build Pipeline")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    stages = [s for s in STAGES if not args.only or s.name in args.only]
+    ok = build(stages, set(args.force), args.dry_run, args.jobs)
+    print(f"\n[{'SUCCESS' if ok else 'ERROR'}] Build finished in {time.perf_counter() - start:.2f}s")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    with run_metrics('build_content'):
+        main()
@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Question Corpus
+Shared state table, question file I/O and a compact in-memory model of every
+question file in the asset tree.
+
+The asset files repeat most of their text: questions.json, questions_general.json,
+the category files and the backup hold the same questions, and every text is a
+dict of six languages. Loaded as plain JSON, each copy is a separate set of
+dicts and strings. The Corpus instead stores:
+
+- slotted records (Question, Answer, Text) instead of dicts,
+- one interned tuple of language keys per key layout, shared by all texts,
+- a single string table, so a text that appears in several files is held once.
+
+Records convert back to dicts with the original key order (to_dict), so
+scripts that write files produce byte-identical output.
+
+Records are shared and read-only; edit the dicts from to_dict() instead. The
+loaded corpus is also saved as a marshal snapshot (.cache/corpus.marshal, or
+.cache/corpus-<hash>.marshal for another set of files) that is restored instead
+of parsing the JSON while no question file changed.
+
+The read-only consumers load through the Corpus: distractors.py,
+near_duplicates.py and glossary_links.py. Scripts that edit files use
+load_questions/save_questions; validate_assets.py checks the raw JSON types in
+per-file worker processes and question_registry.py re-reads only changed files,
+so both read the JSON directly.
+
+Usage:
+  python scripts/corpus.py stats     # files, questions and string table size
+  python scripts/corpus.py bench     # load time and memory vs. plain JSON dicts
+"""
+
+import argparse
+import gc
+import glob
+import hashlib
+import json
+import marshal
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from json_io import atomic_write_bytes, write_json_if_changed
+from metrics import metrics
+
+# Configuration
+DATA_DIR = 'assets/data'
+STATES_DIR = 'assets/data/states'
+QUESTION_PATTERNS = ['questions*.json', 'states/*.json']
+EXCLUDED_FILES = {'questions_backup.json'}
+SNAPSHOT_FILE = '.cache/corpus.marshal'
+SNAPSHOT_VERSION = 1
+
+
+class State(NamedTuple):
+    code: str
+    name: str
+    filename: str
+
+
+STATES: Dict[str, State] = {state.code: state for state in [
+    State('BW', 'Baden-Württemberg', 'baden-wuerttemberg.json'),
+    State('BY', 'Bayern', 'bayern.json'),
+    State('BE', 'Berlin', 'berlin.json'),
+    State('BB', 'Brandenburg', 'brandenburg.json'),
+    State('HB', 'Bremen', 'bremen.json'),
+    State('HH', 'Hamburg', 'hamburg.json'),
+    State('HE', 'Hessen', 'hessen.json'),
+    State('MV', 'Mecklenburg-Vorpommern', 'mecklenburg-vorpommern.json'),
+    State('NI', 'Niedersachsen', 'niedersachsen.json'),
+    State('NW', 'Nordrhein-Westfalen', 'nordrhein-westfalen.json'),
+    State('RP', 'Rheinland-Pfalz', 'rheinland-pfalz.json'),
+    State('SL', 'Saarland', 'saarland.json'),
+    State('SN', 'Sachsen', 'sachsen.json'),
+    State('ST', 'Sachsen-Anhalt', 'sachsen-anhalt.json'),
+    State('SH', 'Schleswig-Holstein', 'schleswig-holstein.json'),
+    State('TH', 'Thüringen', 'thueringen.json'),
+]}
+
+
+def state_file(state_code: str, states_dir: str = STATES_DIR) -> Optional[str]:
+    """Path of a state's question file, or None for an unknown state code."""
+    state = STATES.get(state_code.upper())
+    return os.path.join(states_dir, state.filename) if state else None
+
+
+def question_files(data_dir: str = DATA_DIR, include_backup: bool = False) -> List[str]:
+    """Every asset file holding questions (without the backup unless asked)."""
+    paths = set()
+    for pattern in QUESTION_PATTERNS:
+        paths.update(glob.glob(os.path.join(data_dir, pattern)))
+    return sorted(p for p in paths if include_backup or os.path.basename(p) not in EXCLUDED_FILES)
+
+
+def signature(path: str) -> List[int]:
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def snapshot_file(paths: List[str], data_dir: str = DATA_DIR, cache: str = SNAPSHOT_FILE) -> str:
+    """
+    Snapshot path for a set of files: cache for the default set, a name with
+    a hash of the paths otherwise, so scripts loading different sets do not
+    overwrite each other's snapshot.
+    """
+    if sorted(paths) == question_files(data_dir):
+        return cache
+    digest = hashlib.sha256('\n'.join(sorted(paths)).encode('utf-8')).hexdigest()[:12]
+    root, ext = os.path.splitext(cache)
+    return f"{root}-{digest}{ext}"
+
+
+def load_questions(file_path: str) -> List[Dict[str, Any]]:
+    """Load a question file as a list of dicts."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        metrics().read(os.fstat(f.fileno()).st_size)
+        return json.load(f)
+
+
+def save_questions(questions: List[Any], file_path: str) -> bool:
+    """
+    Atomically write questions (dicts or Question records) in the asset format.
+    Skips the write if the file already has identical content. Returns True if written.
+    """
+    return write_json_if_changed([q.to_dict() if isinstance(q, Question) else q for q in questions],
+                                 file_path)
+
+
+class StringTable:
+    """Interns strings, key tuples and texts, so equal values are stored once."""
+
+    def __init__(self) -> None:
+        self._strings: Dict[str, str] = {}
+        self._layouts: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        self.texts: Dict['Text', 'Text'] = {}
+
+    def string(self, value: Any) -> Any:
+        if type(value) is not str:
+            return value
+        return self._strings.setdefault(value, value)
+
+    def strings(self, values: Iterable[Any]) -> Tuple[Any, ...]:
+        strings = self._strings
+        return tuple([strings.setdefault(v, v) if type(v) is str else v for v in values])
+
+    def adopt(self, values: Iterable[Any]) -> None:
+        """Register already distinct strings (restored from a snapshot)."""
+        self._strings.update((v, v) for v in values if type(v) is str)
+
+    def text(self, text: 'Text') -> 'Text':
+        """The shared Text equal to text (unhashable values are not shared)."""
+        try:
+            return self.texts.setdefault(text, text)
+        except TypeError:
+            return text
+
+    def layout(self, keys: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Shared tuple for a key layout (keys interned with sys.intern)."""
+        shared = self._layouts.get(keys)
+        if shared is None:
+            shared = self._layouts[keys] = tuple(sys.intern(key) for key in keys)
+        return shared
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+
+class Text:
+    """Text in several languages: a shared key layout plus a tuple of values."""
+
+    __slots__ = ('langs', 'values')
+
+    def __init__(self, langs: Tuple[str, ...], values: Tuple[Any, ...]) -> None:
+        self.langs = langs
+        self.values = values
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], table: StringTable) -> 'Text':
+        return table.text(cls(table.layout(tuple(data)), table.strings(data.values())))
+
+    def get(self, lang: str, default: Any = None) -> Any:
+        try:
+            return self.values[self.langs.index(lang)]
+        except ValueError:
+            return default
+
+    def __getitem__(self, lang: str) -> Any:
+        try:
+            return self.values[self.langs.index(lang)]
+        except ValueError:
+            raise KeyError(lang) from None
+
+    def __contains__(self, lang: str) -> bool:
+        return lang in self.langs
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return zip(self.langs, self.values)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Text) and self.langs == other.langs and self.values == other.values
+
+    def __hash__(self) -> int:
+        return hash((self.langs, self.values))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(zip(self.langs, self.values))
+
+
+class Answer:
+    __slots__ = ('id', 'text', 'layout', 'extra')
+
+    def __init__(self, answer_id: str, text: Text, layout: Tuple[str, ...],
+                 extra: Optional[Dict[str, Any]] = None) -> None:
+        self.id = answer_id
+        self.text = text
+        self.layout = layout
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], table: StringTable) -> 'Answer':
+        extra = {k: v for k, v in data.items() if k not in ('id', 'text')} or None
+        text = data.get('text')
+        return cls(table.string(data.get('id')),
+                   Text.from_dict(text, table) if isinstance(text, dict) else text,
+                   table.layout(tuple(data)), extra)
+
+    def to_dict(self) -> Dict[str, Any]:
+        values = {'id': self.id, 'text': self.text.to_dict() if isinstance(self.text, Text) else self.text}
+        if self.extra:
+            values.update(self.extra)
+        return {key: values[key] for key in self.layout}
+
+
+class Question:
+    """One question record; fields not modelled here are kept in `extra`."""
+
+    __slots__ = ('id', 'category_id', 'state_code', 'topic', 'question', 'answers',
+                 'correct_answer', 'layout', 'extra', 'file')
+
+    FIELDS = ('id', 'category_id', 'state_code', 'topic', 'question', 'answers', 'correct_answer')
+
+    def __init__(self, question_id: Any, category_id: Optional[str], state_code: Optional[str],
+                 topic: Optional[str], question: Any, answers: Tuple[Answer, ...],
+                 correct_answer: Optional[str], layout: Tuple[str, ...],
+                 extra: Optional[Dict[str, Any]] = None, file: str = '') -> None:
+        self.id = question_id
+        self.category_id = category_id
+        self.state_code = state_code
+        self.topic = topic
+        self.question = question
+        self.answers = answers
+        self.correct_answer = correct_answer
+        self.layout = layout
+        self.extra = extra
+        self.file = file
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], table: StringTable, file: str = '') -> 'Question':
+        text = data.get('question')
+        return cls(data.get('id'),
+                   table.string(data.get('category_id')),
+                   table.string(data.get('state_code')),
+                   table.string(data.get('topic')),
+                   Text.from_dict(text, table) if isinstance(text, dict) else text,
+                   tuple(Answer.from_dict(a, table) for a in data.get('answers', ()) if isinstance(a, dict)),
+                   table.string(data.get('correct_answer')),
+                   table.layout(tuple(data)),
+                   {k: v for k, v in data.items() if k not in cls.FIELDS} or None,
+                   file)
+
+    def text(self, lang: str = 'de') -> str:
+        return self.question.get(lang, '') if isinstance(self.question, Text) else ''
+
+    def to_dict(self) -> Dict[str, Any]:
+        values = {
+            'id': self.id,
+            'category_id': self.category_id,
+            'state_code': self.state_code,
+            'topic': self.topic,
+            'question': self.question.to_dict() if isinstance(self.question, Text) else self.question,
+            'answers': [answer.to_dict() for answer in self.answers],
+            'correct_answer': self.correct_answer,
+        }
+        if self.extra:
+            values.update(self.extra)
+        return {key: values[key] for key in self.layout}
+
+
+class Corpus:
+    """All question files, loaded once, with lookups by file, id, category and state."""
+
+    def __init__(self) -> None:
+        self.table = StringTable()
+        self.files: Dict[str, List[Question]] = {}
+        self._by_id: Dict[Any, List[Question]] = {}
+        self._by_category: Dict[Any, List[Question]] = {}
+        self._by_state: Dict[Any, List[Question]] = {}
+
+    @classmethod
+    def load(cls, paths: Optional[List[str]] = None, data_dir: str = DATA_DIR,
+             cache: Optional[str] = SNAPSHOT_FILE) -> 'Corpus':
+        """
+        Load paths (default: every question file except the backup). With a
+        cache file, the corpus is restored from its snapshot when no file changed
+        since (same paths, mtimes and sizes), and the snapshot is rewritten otherwise.
+        """
+        paths = question_files(data_dir) if paths is None else list(paths)
+        signatures = {path: signature(path) for path in paths}
+        if cache:
+            cache = snapshot_file(paths, data_dir, cache)
+        if cache and os.path.exists(cache):
+            try:
+                with open(cache, 'rb') as f:
+                    data = f.read()
+                metrics().read(len(data))
+                snapshot = marshal.loads(data)
+            except (EOFError, ValueError, TypeError):
+                snapshot = None
+            if (isinstance(snapshot, dict) and snapshot.get('version') == SNAPSHOT_VERSION
+                    and snapshot.get('signatures') == signatures):
+                return cls._from_snapshot(snapshot)
+
+        corpus = cls()
+        for path in paths:
+            corpus.add_file(path, load_questions(path))
+        if cache:
+            atomic_write_bytes(corpus._snapshot(signatures), cache)
+        return corpus
+
+    def _snapshot(self, signatures: Dict[str, List[int]]) -> bytes:
+        """
+        marshal dump of the corpus: every distinct value, key layout, text and
+        answer once in its own list, questions as tuples of indexes into them.
+        """
+        refs: Dict[str, int] = {}
+        values: List[Any] = []
+        layouts: Dict[Tuple[str, ...], int] = {}
+        texts: Dict[Tuple[int, Any], int] = {}
+        answers: Dict[Tuple[Any, ...], int] = {}
+        answer_rows: List[Tuple[Any, ...]] = []
+
+        def ref(value: Any) -> int:
+            if type(value) is str:
+                index = refs.get(value)
+                if index is not None:
+                    return index
+                refs[value] = len(values)
+            values.append(value)
+            return len(values) - 1
+
+        def layout(keys: Tuple[str, ...]) -> int:
+            return layouts.setdefault(keys, len(layouts))
+
+        def text(value: Any) -> int:
+            if isinstance(value, Text):
+                row = (layout(value.langs), tuple(ref(v) for v in value.values))
+            else:
+                row = (-1, ref(value))
+            return texts.setdefault(row, len(texts))
+
+        def answer(value: Answer) -> int:
+            row = (ref(value.id), text(value.text), layout(value.layout), value.extra)
+            if value.extra is not None:  # dicts are not hashable, so not shared
+                answer_rows.append(row)
+                return len(answer_rows) - 1
+            index = answers.get(row)
+            if index is None:
+                index = answers[row] = len(answer_rows)
+                answer_rows.append(row)
+            return index
+
+        files = {}
+        for path, records in self.files.items():
+            files[path] = [
+                (q.id, ref(q.category_id), ref(q.state_code), ref(q.topic), text(q.question),
+                 tuple(answer(a) for a in q.answers), ref(q.correct_answer), layout(q.layout), q.extra)
+                for q in records
+            ]
+        return marshal.dumps({'version': SNAPSHOT_VERSION, 'signatures': signatures,
+                              'values': values, 'layouts': list(layouts), 'texts': list(texts),
+                              'answers': answer_rows, 'files': files})
+
+    @classmethod
+    def _from_snapshot(cls, snapshot: Dict[str, Any]) -> 'Corpus':
+        corpus = cls()
+        values = snapshot['values']
+        corpus.table.adopt(values)
+        layouts = [corpus.table.layout(tuple(keys)) for keys in snapshot['layouts']]
+        get = values.__getitem__
+        texts = [values[refs] if layout < 0 else Text(layouts[layout], tuple(map(get, refs)))
+                 for layout, refs in snapshot['texts']]
+        for text in texts:
+            if isinstance(text, Text):
+                corpus.table.texts[text] = text
+        answers = [Answer(values[answer_id], texts[text], layouts[layout], extra)
+                   for answer_id, text, layout, extra in snapshot['answers']]
+        get_answer = answers.__getitem__
+
+        for path, rows in snapshot['files'].items():
+            corpus._add_records(path, [
+                Question(question_id, values[category], values[state], values[topic], texts[text],
+                         tuple(map(get_answer, answer_refs)), values[correct], layouts[layout], extra, path)
+                for question_id, category, state, topic, text, answer_refs, correct, layout, extra in rows
+            ])
+        return corpus
+
+    def add_file(self, path: str, questions: List[Dict[str, Any]]) -> None:
+        """Add (or replace) one file's questions."""
+        self._add_records(path, [Question.from_dict(q, self.table, path) for q in questions if isinstance(q, dict)])
+
+    def _add_records(self, path: str, records: List[Question]) -> None:
+        if path in self.files:
+            self._unindex(self.files[path])
+        self.files[path] = records
+        for record in records:
+            self._by_id.setdefault(record.id, []).append(record)
+            self._by_category.setdefault(record.category_id, []).append(record)
+            self._by_state.setdefault(record.state_code, []).append(record)
+
+    def _unindex(self, records: List[Question]) -> None:
+        for record in records:
+            for index, key in ((self._by_id, record.id), (self._by_category, record.category_id),
+                               (self._by_state, record.state_code)):
+                index[key] = [r for r in index[key] if r is not record]
+                if not index[key]:
+                    del index[key]
+
+    def __iter__(self) -> Iterator[Question]:
+        for records in self.files.values():
+            yield from records
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self.files.values())
+
+    def by_id(self, question_id: Any) -> List[Question]:
+        """Every record with this id (the same question appears in several files)."""
+        return list(self._by_id.get(question_id, ()))
+
+    def by_category(self, category_id: str) -> List[Question]:
+        return list(self._by_category.get(category_id, ()))
+
+    def by_state(self, state_code: str) -> List[Question]:
+        return list(self._by_state.get(state_code.upper(), ()))
+
+    def file(self, path: str) -> List[Question]:
+        return self.files.get(path, [])
+
+    def to_dicts(self, path: str) -> List[Dict[str, Any]]:
+        """A file's questions as dicts, in the original layout."""
+        return [record.to_dict() for record in self.file(path)]
+
+
+def _measure(load) -> Tuple[float, int, int]:
+    """Run load once under tracemalloc, then time it; return (best seconds, peak bytes, retained bytes)."""
+    gc.collect()
+    tracemalloc.start()
+    result = load()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    times = []
+    for _ in range(5):
+        gc.collect()
+        start = time.perf_counter()
+        load()
+        times.append(time.perf_counter() - start)
+    return min(times), peak, retained
+
+
+def bench(include_backup: bool = True) -> None:
+    """Compare load time and memory of plain JSON dicts and the Corpus (cold and from its snapshot)."""
+    paths = question_files(include_backup=include_backup)
+    size = sum(os.path.getsize(p) for p in paths)
+    print(f"[INFO] {len(paths)} files, {size / 1024:.0f} KiB")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = os.path.join(tmp, 'corpus.marshal')
+        Corpus.load(paths, cache=cache)
+        loaders = [
+            ('json dicts', lambda: {path: load_questions(path) for path in paths}),
+            ('corpus (cold)', lambda: Corpus.load(paths, cache=None)),
+            ('corpus (snapshot)', lambda: Corpus.load(paths, cache=cache)),
+        ]
+        for label, load in loaders:
+            seconds, peak, retained = _measure(load)
+            print(f"  {label:<18} load {seconds * 1000:6.1f} ms   peak {peak / 1024:7.0f} KiB   "
+                  f"retained {retained / 1024:7.0f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Question corpus tools")
+    sub = parser.add_subparsers(dest='command')
+    sub.add_parser('stats', help="Summarize the loaded corpus")
+    bench_parser = sub.add_parser('bench', help="Load time and memory vs. plain JSON dicts")
+    bench_parser.add_argument('--no-backup', action='store_true', help="Leave questions_backup.json out")
+    args = parser.parse_args()
+
+    if args.command == 'stats':
+        corpus = Corpus.load()
+        print(f"[INFO] {len(corpus)} question records in {len(corpus.files)} files, "
+              f"{len(corpus.table)} distinct strings")
+        for path, records in corpus.files.items():
+            print(f"   {os.path.relpath(path, DATA_DIR):<36} {len(records):>4}")
+    elif args.command == 'bench':
+        bench(include_backup=not args.no_backup)
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
@@ -3,10 +3,16 @@
 """
 Create template files for all 16 German states.
 These are empty templates that can be filled with actual questions.
+The templates are added to the question store, which generates the files.
 """
 
-import json
 import os
+import sys
+
+from corpus import STATES
+from distractors import DistractorIndex
+from question_registry import QuestionRegistry
+from question_store import write_back
 
 STATES_DIR = 'assets/data/states/'
 
@@ -93,40 +99,23 @@ STATE_TEMPLATES = {
     },
 }
 
-FILENAME_MAP = {
-    'BW': 'baden-wuerttemberg.json',
-    'BY': 'bayern.json',
-    'BE': 'berlin.json',
-    'BB': 'brandenburg.json',
-    'HB': 'bremen.json',
-    'HH': 'hamburg.json',
-    'HE': 'hessen.json',
-    'MV': 'mecklenburg-vorpommern.json',
-    'NI': 'niedersachsen.json',
-    'NW': 'nordrhein-westfalen.json',
-    'RP': 'rheinland-pfalz.json',
-    'SL': 'saarland.json',
-    'SN': 'sachsen.json',
-    'ST': 'sachsen-anhalt.json',
-    'SH': 'schleswig-holstein.json',
-    'TH': 'thueringen.json',
-}
+def capital_distractors() -> DistractorIndex:
+    """Distractor index over the corpus answers, with all state capitals as cities."""
+    index = DistractorIndex.from_corpus()
+    for template in STATE_TEMPLATES.values():
+        index.add(template['capital'], 'city')
+    return index
 
-def create_capital_question(state_code: str, template: dict) -> dict:
-    """Create a capital city question for a state."""
+def create_capital_question(state_code: str, template: dict, registry: QuestionRegistry,
+                            distractors: DistractorIndex) -> dict:
+    """Create a capital city question for a state (ID allocated from the registry)."""
     capital = template['capital']
     state_name = template['name']
     
-    # Generate wrong answers (other state capitals)
-    other_capitals = [
-        'München', 'Berlin', 'Potsdam', 'Bremen', 'Hamburg',
-        'Wiesbaden', 'Schwerin', 'Hannover', 'Düsseldorf', 'Mainz',
-        'Saarbrücken', 'Dresden', 'Magdeburg', 'Kiel', 'Erfurt', 'Stuttgart'
-    ]
-    # Remove the correct capital
-    wrong_answers = [c for c in other_capitals if c != capital][:3]
+    # Wrong answers: other cities from the corpus, different for each state
+    wrong_answers = distractors.pick(capital, 'city')
     
-    question_id = 20000 + int(state_code, 36) % 1000
+    question_id = registry.allocate(20000 + int(state_code, 36) % 1000, step=1000)
     
     return {
         "id": question_id,
@@ -196,11 +185,13 @@ def main():
     
     os.makedirs(STATES_DIR, exist_ok=True)
     
-    created = 0
+    created = {}
     skipped = 0
+    registry = QuestionRegistry.load()
+    distractors = capital_distractors()
     
     for state_code, template in STATE_TEMPLATES.items():
-        filename = FILENAME_MAP[state_code]
+        filename = STATES[state_code].filename
         file_path = os.path.join(STATES_DIR, filename)
         
         if os.path.exists(file_path):
@@ -209,17 +200,24 @@ def main():
             continue
         
         # Create a template with one capital question
-        questions = [create_capital_question(state_code, template)]
+        questions = [create_capital_question(state_code, template, registry, distractors)]
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(questions, f, ensure_ascii=False, indent=2)
+        created[file_path] = questions
+        registry.update_file(file_path, questions)
         
         print(f"[OK] {state_code}: Created {filename} with 1 template question")
-        created += 1
+    
+    if created:
+        try:
+            write_back(created)
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            sys.exit(1)
+    registry.save()
     
     print("\n" + "=" * 70)
     print(f"[SUMMARY]")
-    print(f"  - Created: {created} files")
+    print(f"  - Created: {len(created)} files")
     print(f"  - Skipped: {skipped} files (already exist)")
     print(f"  - Total states: {len(STATE_TEMPLATES)}")
     print("\n[INFO] Next steps:")
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Distractor Engine
+Picks wrong answers for templated questions from the answers that already exist
+in the corpus.
+
+The index groups every German answer text of questions.json and the state files
+by answer type (city, person, institution, year, number, sentence, term). Each
+candidate is stored as a bitset of hashed character trigrams, so similarity to
+the correct answer is a bitwise AND/OR plus popcount per candidate:
+
+  score = trigram Jaccard + 0.5 * length ratio - 0.25 * times already used
+
+Candidates that are near-duplicates or variants of the correct answer, or
+near-duplicates of an already chosen distractor, are skipped, and the usage penalty spreads picks across the
+candidate pool so different questions get different distractor sets.
+
+Usage:
+  python scripts/distractors.py show Wiesbaden [--type city] [--count 3]
+  python scripts/distractors.py bench [--questions 5000]
+"""
+
+import argparse
+import glob
+import os
+import re
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from corpus import Corpus, Text
+
+# Configuration
+DATA_DIR = 'assets/data'
+CORPUS_FILES = ['questions.json', 'states/*.json']
+SOURCE_LANGUAGE = 'de'
+TRIGRAM_BITS = 1024
+NEAR_DUPLICATE = 0.8
+LENGTH_WEIGHT = 0.5
+USAGE_PENALTY = 0.25
+
+ANSWER_TYPES = ['city', 'person', 'institution', 'year', 'number', 'sentence', 'term']
+
+INSTITUTION_WORDS = (
+    'bundes', 'gericht', 'regierung', 'parlament', 'landtag', 'minister', 'partei',
+    'amt', 'rat', 'versammlung', 'polizei', 'behörde', 'kammer', 'verwaltung',
+    'gewerkschaft', 'senat', 'bürgerschaft', 'kommission', 'verband',
+)
+_CITY_QUESTION = re.compile(r'\b(Stadt|Hauptstadt|Landeshauptstadt|Städte)\b')
+_YEAR = re.compile(r'\b(1[5-9]|20)\d\d\b')
+_MARKERS = re.compile(r'\s*✓\s*$')
+_ARTICLE = re.compile(r'^(der|die|das|den|dem|des|ein|eine|einen|einem|einer)\s+', re.IGNORECASE)
+_NAME_PARTICLES = ('von', 'van', 'de', 'zu')
+
+
+def clean(text: str) -> str:
+    """Answer text without check marks and surrounding whitespace."""
+    return _MARKERS.sub('', text).strip()
+
+
+def normalize(text: str) -> str:
+    """Comparison form: case-folded, without leading article or trailing punctuation."""
+    return _ARTICLE.sub('', clean(text).rstrip('.!?')).casefold()
+
+
+def trigram_bits(text: str) -> int:
+    """Bitset of the hashed character trigrams of text (padded with spaces)."""
+    padded = f"  {normalize(text)} "
+    bits = 0
+    for i in range(len(padded) - 2):
+        bits |= 1 << (zlib.crc32(padded[i:i + 3].encode('utf-8')) % TRIGRAM_BITS)
+    return bits
+
+
+def classify(answer: str, question: str = '') -> str:
+    """Answer type from the answer text and the German question it belongs to."""
+    text = clean(answer)
+    words = text.split()
+    lower = text.casefold()
+    if _YEAR.search(text):
+        return 'year'
+    if any(ch.isdigit() for ch in text):
+        return 'number'
+    if question and _CITY_QUESTION.search(question) and len(words) <= 4 and text[:1].isupper():
+        return 'city'
+    if any(word in lower for word in INSTITUTION_WORDS) and len(words) <= 6:
+        return 'institution'
+    if (2 <= len(words) <= 4 and words[0][:1].isupper() and not _ARTICLE.match(text)
+            and all(w[:1].isupper() or w in _NAME_PARTICLES for w in words)):
+        return 'person'
+    if text.endswith('.') or len(words) >= 6:
+        return 'sentence'
+    return 'term'
+
+
+class DistractorIndex:
+    """Candidate answers grouped by type, with trigram bitsets and usage counts."""
+
+    def __init__(self) -> None:
+        self._texts: Dict[str, List[str]] = {t: [] for t in ANSWER_TYPES}
+        self._bits: Dict[str, List[int]] = {t: [] for t in ANSWER_TYPES}
+        self._sizes: Dict[str, List[int]] = {t: [] for t in ANSWER_TYPES}
+        self._usage: Dict[str, List[int]] = {t: [] for t in ANSWER_TYPES}
+        self._types: Dict[str, str] = {}
+
+    def add(self, answer: str, answer_type: str) -> None:
+        """Add a candidate (ignored if its normalized text is already indexed)."""
+        text = clean(answer)
+        key = normalize(text)
+        if not key or key in self._types:
+            return
+        self._types[key] = answer_type
+        self._texts[answer_type].append(text)
+        self._bits[answer_type].append(trigram_bits(text))
+        self._sizes[answer_type].append(len(text))
+        self._usage[answer_type].append(0)
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Tuple[str, str]]) -> 'DistractorIndex':
+        """Build from (answer, question) German text pairs."""
+        index = cls()
+        pairs = list(pairs)
+        # Cities first, so a city name answering another question type stays a city
+        for answer, question in sorted(pairs, key=lambda p: classify(*p) != 'city'):
+            index.add(answer, classify(answer, question))
+        return index
+
+    @classmethod
+    def from_corpus(cls, data_dir: str = DATA_DIR) -> 'DistractorIndex':
+        """Build from every answer in questions.json and the state files."""
+        corpus = Corpus.load(data_dir=data_dir)
+        pairs = []
+        for pattern in CORPUS_FILES:
+            for path in sorted(glob.glob(os.path.join(data_dir, pattern))):
+                for question in corpus.file(path):
+                    question_de = question.text(SOURCE_LANGUAGE)
+                    for answer in question.answers:
+                        answer_de = answer.text.get(SOURCE_LANGUAGE, '') if isinstance(answer.text, Text) else ''
+                        if answer_de:
+                            pairs.append((answer_de, question_de))
+        return cls.from_pairs(pairs)
+
+    def type_of(self, answer: str, question: str = '') -> str:
+        """Indexed type of answer, or its classification if it is not indexed."""
+        return self._types.get(normalize(answer)) or classify(answer, question)
+
+    def candidates(self, answer_type: str) -> Sequence[str]:
+        return self._texts[answer_type]
+
+    def sizes(self) -> Dict[str, int]:
+        return {t: len(texts) for t, texts in self._texts.items()}
+
+    def pick(self, correct: str, answer_type: Optional[str] = None, question: str = '',
+             count: int = 3, exclude: Iterable[str] = ()) -> List[str]:
+        """
+        Choose count distractors for correct. Each pick counts as a use, so later
+        calls prefer candidates that were chosen less often.
+        """
+        answer_type = answer_type or self.type_of(correct, question)
+        texts = self._texts[answer_type]
+        bits = self._bits[answer_type]
+        sizes = self._sizes[answer_type]
+        usage = self._usage[answer_type]
+
+        target = trigram_bits(correct)
+        target_size = max(1, len(clean(correct)))
+        correct_key = normalize(correct)
+        skip = {correct_key} | {normalize(e) for e in exclude}
+
+        scored = []
+        for i, candidate in enumerate(bits):
+            union = (target | candidate).bit_count()
+            similarity = (target & candidate).bit_count() / union if union else 0.0
+            if similarity >= NEAR_DUPLICATE:
+                continue
+            size = sizes[i]
+            length_ratio = min(size, target_size) / max(size, target_size)
+            scored.append((similarity + LENGTH_WEIGHT * length_ratio - USAGE_PENALTY * usage[i], i))
+        scored.sort(key=lambda item: (-item[0], texts[item[1]]))
+
+        chosen: List[int] = []
+        for _, i in scored:
+            key = normalize(texts[i])
+            # Variants of the correct answer ("Polizei" / "die deutsche Polizei") are not distractors
+            if key in skip or key in correct_key or correct_key in key:
+                continue
+            if any(_jaccard(bits[i], bits[j]) >= NEAR_DUPLICATE for j in chosen):
+                continue
+            chosen.append(i)
+            if len(chosen) == count:
+                break
+        for i in chosen:
+            usage[i] += 1
+        return [texts[i] for i in chosen]
+
+
+def _jaccard(a: int, b: int) -> float:
+    union = (a | b).bit_count()
+    return (a & b).bit_count() / union if union else 0.0
+
+
+def bench(questions: int) -> None:
+    """Time distractor selection for many templated questions."""
+    start = time.perf_counter()
+    index = DistractorIndex.from_corpus()
+    build = time.perf_counter() - start
+    print(f"[INFO] Index: {sum(index.sizes().values())} candidates "
+          f"({', '.join(f'{t} {n}' for t, n in index.sizes().items())}) built in {build * 1000:.0f} ms")
+
+    # Templated questions: every candidate in turn is the correct answer
+    pool = [(text, t) for t in ANSWER_TYPES for text in index.candidates(t)]
+    work = [pool[i % len(pool)] for i in range(questions)]
+    start = time.perf_counter()
+    sets = [index.pick(correct, answer_type) for correct, answer_type in work]
+    seconds = time.perf_counter() - start
+
+    distinct = len({tuple(sorted(s)) for s in sets})
+    print(f"[INFO] {questions} distractor sets in {seconds:.2f}s "
+          f"({questions / seconds:.0f} questions/s), {distinct} distinct sets")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Corpus-driven distractor engine")
+    sub = parser.add_subparsers(dest='command')
+    show_parser = sub.add_parser('show', help="Show distractors for an answer")
+    show_parser.add_argument('answer')
+    show_parser.add_argument('--type', choices=ANSWER_TYPES)
+    show_parser.add_argument('--count', type=int, default=3)
+    bench_parser = sub.add_parser('bench', help="Time distractor selection")
+    bench_parser.add_argument('--questions', type=int, default=5000)
+    args = parser.parse_args()
+
+    if args.command == 'show':
+        index = DistractorIndex.from_corpus()
+        answer_type = args.type or index.type_of(args.answer)
+        print(f"[{answer_type}] {args.answer}: {', '.join(index.pick(args.answer, answer_type, count=args.count))}")
+    elif args.command == 'bench':
+        bench(args.questions)
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
@@ -3,48 +3,69 @@
 """
 State Questions Generator & Translator
 Helps create and translate state-specific questions for all 16 German states.
+
+Bulk import (CSV or JSONL, one question per row/line):
+  CSV columns:  state_code, question, answer_a, answer_b, answer_c, answer_d,
+                correct_answer, id (optional)
+  JSONL lines:  the same keys, or a question object in the state file schema
+                plus "state_code"
+All rows are validated first; nothing is written if any row is invalid. The new
+questions are then translated in one batched engine pass and every affected
+state file is written once.
+
+State files are generated from the question store (see question_store.py):
+saving a state file writes its questions back to the store, so the next build
+regenerates the same file.
 """
 
+import csv
 import json
 import os
-from deep_translator import GoogleTranslator
-from typing import Dict, List, Any
+import sys
+import time
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+from corpus import STATES, load_questions, state_file
+from json_io import atomic_write_json
+from metrics import metrics, run_metrics, stage
+from near_duplicates import similar_questions
+from question_registry import QuestionRegistry
+from question_store import write_back
+from translation_engine import (
+    TranslationEngine, TranslationJob, collect_jobs, create_backend, print_run_stats, unique_strings,
+)
+from translation_fingerprints import FingerprintStore
+from translation_journal import Checkpointer, TranslationJournal, journaled
+from translation_memory import default_memory, print_stats
+from translator_pool import default_pool, print_pool_stats
 
 # Configuration
 STATES_DIR = 'assets/data/states/'
+GENERAL_FILE = 'assets/data/questions_general.json'
+SIMILARITY_WARNING = 0.7
 SOURCE_LANGUAGE = 'de'
 TARGET_LANGUAGES = ['ar', 'en', 'tr', 'uk', 'ru']
-
-# State codes and their filenames
-STATE_MAP = {
-    'BW': 'baden-wuerttemberg.json',
-    'BY': 'bayern.json',
-    'BE': 'berlin.json',
-    'BB': 'brandenburg.json',
-    'HB': 'bremen.json',
-    'HH': 'hamburg.json',
-    'HE': 'hessen.json',
-    'MV': 'mecklenburg-vorpommern.json',
-    'NI': 'niedersachsen.json',
-    'NW': 'nordrhein-westfalen.json',
-    'RP': 'rheinland-pfalz.json',
-    'SL': 'saarland.json',
-    'SN': 'sachsen.json',
-    'ST': 'sachsen-anhalt.json',
-    'SH': 'schleswig-holstein.json',
-    'TH': 'thueringen.json',
-}
+JOURNAL_FILE = '.cache/generate_state_questions.journal.jsonl'
+ANSWER_IDS = ['A', 'B', 'C', 'D']
 
 def translate_text(text: str, target_lang: str, source_lang: str = SOURCE_LANGUAGE) -> str:
-    """Translate text from source to target language."""
+    """Translate text from source to target language (cached in the translation memory)."""
     if not text or not text.strip():
         return ""
     
+    memory = default_memory()
+    cached = memory.get(text, target_lang, source_lang)
+    if cached is not None:
+        return cached
+    
+    start = time.perf_counter()
     try:
-        translator = GoogleTranslator(source=source_lang, target=target_lang)
-        translated = translator.translate(text)
+        translated = default_pool().translate(text, target_lang, source_lang)
+        memory.put(text, target_lang, source_lang, translated)
+        metrics().backend_call('google', time.perf_counter() - start, empty=int(not translated))
         return translated if translated else ""
     except Exception as e:
+        metrics().backend_call('google', time.perf_counter() - start, failed=True)
         print(f"    [WARNING] Translation error ({source_lang} -> {target_lang}): {e}")
         return ""
 
@@ -76,45 +97,46 @@ def translate_question(question: Dict[str, Any]) -> Dict[str, Any]:
 
 def load_state_file(state_code: str) -> List[Dict[str, Any]]:
     """Load questions from a state file."""
-    filename = STATE_MAP.get(state_code.upper())
-    if not filename:
-        return []
-    
-    file_path = os.path.join(STATES_DIR, filename)
-    if not os.path.exists(file_path):
+    file_path = state_file(state_code, STATES_DIR)
+    if not file_path or not os.path.exists(file_path):
         return []
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_questions(file_path)
     except Exception as e:
         print(f"[ERROR] Failed to load {file_path}: {e}")
         return []
 
 def save_state_file(state_code: str, questions: List[Dict[str, Any]]) -> None:
-    """Save questions to a state file."""
-    filename = STATE_MAP.get(state_code.upper())
-    if not filename:
-        print(f"[ERROR] Invalid state code: {state_code}")
+    """Save questions to a state file through the question store."""
+    save_state_files({state_code: questions})
+
+def save_state_files(corpus: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Write state files (state code -> questions) back to the question store in one update."""
+    files = {}
+    for state_code, questions in corpus.items():
+        file_path = state_file(state_code, STATES_DIR)
+        if not file_path:
+            print(f"[ERROR] Invalid state code: {state_code}")
+            continue
+        files[file_path] = questions
+    if not files:
         return
+    try:
+        write_back(files)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
     
-    file_path = os.path.join(STATES_DIR, filename)
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(questions, f, ensure_ascii=False, indent=2)
-    
-    print(f"[OK] Saved {len(questions)} questions to {file_path}")
+    for file_path, questions in files.items():
+        print(f"[OK] Saved {len(questions)} questions to {file_path}")
 
-def add_question_to_state(state_code: str, question_de: str, answers_de: List[str], correct_answer: str, question_id: int = None) -> None:
-    """Add a new question to a state file with automatic translation."""
-    questions = load_state_file(state_code)
-    
-    # Generate ID if not provided
-    if question_id is None:
-        question_id = 20000 + (len(questions) + 1) * 100 + int(state_code, 36) % 100
-    
-    # Create question structure
+def next_question_id(state_code: str, questions: List[Dict[str, Any]], registry: QuestionRegistry) -> int:
+    """Default ID for the next question of a state, skipping IDs used in any asset file."""
+    return registry.allocate(20000 + (len(questions) + 1) * 100 + int(state_code, 36) % 100, step=100)
+
+def build_question(state_code: str, question_id: int, question_de: str, answers_de: List[str], correct_answer: str) -> Dict[str, Any]:
+    """Question object in the state file schema (German only)."""
     new_question = {
         "id": question_id,
         "category_id": "state",
@@ -127,14 +149,30 @@ def add_question_to_state(state_code: str, question_de: str, answers_de: List[st
     }
     
     # Add answers
-    answer_ids = ['A', 'B', 'C', 'D']
     for i, answer_text in enumerate(answers_de[:4]):
         new_question["answers"].append({
-            "id": answer_ids[i],
+            "id": ANSWER_IDS[i],
             "text": {
                 "de": answer_text
             }
         })
+    return new_question
+
+def add_question_to_state(state_code: str, question_de: str, answers_de: List[str], correct_answer: str, question_id: int = None) -> None:
+    """Add a new question to a state file with automatic translation."""
+    questions = load_state_file(state_code)
+    registry = QuestionRegistry.load()
+    
+    # Generate ID if not provided
+    if question_id is None:
+        question_id = next_question_id(state_code, questions, registry)
+    elif question_id in registry:
+        print(f"[ERROR] Question ID {question_id} is already used in: "
+              f"{', '.join(sorted(registry.owners(question_id)))}")
+        return
+    
+    new_question = build_question(state_code, question_id, question_de, answers_de, correct_answer)
+    warn_similar({state_code: [new_question]}, {state_code: questions})
     
     # Translate the question
     print(f"[INFO] Translating question for {state_code}...")
@@ -145,43 +183,316 @@ def add_question_to_state(state_code: str, question_de: str, answers_de: List[st
     
     # Save
     save_state_file(state_code, questions)
+    registry.update_file(state_file(state_code, STATES_DIR), questions)
+    registry.save()
     print(f"[SUCCESS] Question added and translated for {state_code}")
 
-def translate_existing_state_file(state_code: str) -> None:
+def warn_similar(new: Dict[str, List[Dict[str, Any]]], existing: Dict[str, List[Dict[str, Any]]]) -> int:
+    """
+    Warn about new questions whose German text is a near-duplicate of a question
+    of the same state or of the general catalogue. Other states are not compared:
+    their questions follow the same templates with another state name.
+    Returns the number of warnings.
+    """
+    general = load_questions(GENERAL_FILE) if os.path.exists(GENERAL_FILE) else []
+    warnings = 0
+    for state_code, questions in sorted(new.items()):
+        candidates = general + existing.get(state_code, [])
+        for question, other, similarity in similar_questions(questions, candidates, SIMILARITY_WARNING):
+            warnings += 1
+            print(f"[WARNING] {state_code} question {question['id']} is {similarity:.0%} similar to "
+                  f"question {other.get('id')}: {other.get('question', {}).get(SOURCE_LANGUAGE, '')[:70]}")
+    return warnings
+
+def create_engine(backend: str = 'google') -> TranslationEngine:
+    """
+    Translation engine for a backend. Only real translations go into the
+    translation memory, and only the real service is rate limited.
+    """
+    if backend == 'google':
+        return TranslationEngine(create_backend(backend), memory=default_memory(), source_lang=SOURCE_LANGUAGE)
+    return TranslationEngine(create_backend(backend), rps=0, source_lang=SOURCE_LANGUAGE)
+
+class StateProgress:
+    """Engine callback printing per-state progress at every quarter of its jobs."""
+    
+    def __init__(self, jobs: List[TranslationJob], names: Dict[str, str]) -> None:
+        self.names = names
+        self.total: Dict[str, int] = {}
+        for job in jobs:
+            self.total[job.key] = self.total.get(job.key, 0) + 1
+        self.done = {key: 0 for key in self.total}
+        self.start = time.perf_counter()
+    
+    def __call__(self, job: TranslationJob) -> None:
+        self.done[job.key] += 1
+        done, total = self.done[job.key], self.total[job.key]
+        if done == total or done * 4 // total != (done - 1) * 4 // total:
+            print(f"   [PROGRESS] {self.names[job.key]}: {done}/{total} "
+                  f"({100 * done // total}%, {time.perf_counter() - self.start:.1f}s)")
+
+def print_state_summary(progress: StateProgress, stats: Dict[str, Any]) -> None:
+    """Per-state translated/failed counts for a translate run."""
+    print("\n[SUMMARY] Per state:")
+    for key in sorted(progress.total, key=lambda k: progress.names[k]):
+        failed = stats['failed_by_key'].get(key, 0)
+        print(f"   - {progress.names[key]}: {progress.done[key]}/{progress.total[key]} translated"
+              + (f", {failed} FAILED" if failed else ""))
+
+def translate_state_corpus(corpus: Dict[str, List[Dict[str, Any]]], resume: bool = False, backend: str = 'google') -> None:
+    """
+    Translate the missing fields of the loaded state files (state code -> questions)
+    in one engine pass. Missing translations, and translations whose German source
+    was edited since (per the fingerprint store), are deduplicated per language
+    (state files share many answer texts) and translated in batches. All states go
+    through the same engine, so they are translated concurrently behind one global
+    rate limit and one translation memory. Every result is journaled as it arrives
+    and files are checkpointed periodically, so an interrupted run can continue with
+    resume=True. Progress is reported per state.
+    """
+    # Work keyed by file path (journal entries); fingerprints are keyed by
+    # question ID, so they match the ones translate_questions.py records.
+    files = {state_file(code, STATES_DIR): questions for code, questions in corpus.items()}
+    codes = {state_file(code, STATES_DIR): code for code in corpus}
+    
+    journal = TranslationJournal(JOURNAL_FILE)
+    restored = 0
+    if resume:
+        restored = journal.replay(files)
+        print(f"[INFO] Resumed: restored {restored} translations from {JOURNAL_FILE}")
+    elif journal.exists():
+        print(f"[WARNING] Discarding journal of an earlier run ({JOURNAL_FILE}); use --resume to continue it")
+    
+    fingerprints = FingerprintStore()
+    jobs = []
+    for path, questions in files.items():
+        jobs.extend(collect_jobs(questions, TARGET_LANGUAGES, SOURCE_LANGUAGE,
+                                 key=path, fingerprints=fingerprints))
+    total = sum(len(questions) for questions in corpus.values())
+    stale = sum(1 for job in jobs if job.stale)
+    print(f"[INFO] {total} questions in {len(corpus)} state file(s), "
+          f"{len(jobs)} translations needed ({stale} stale)")
+    if not jobs and not restored:
+        fingerprints.save()
+        journal.discard()
+        print("[INFO] All translations are up to date, files left unchanged")
+        return
+    for lang, texts in sorted(unique_strings(jobs).items()):
+        print(f"   {lang}: {len(texts)} unique strings")
+    
+    engine = create_engine(backend)
+    # Checkpoints only rewrite the state file; the store is updated once at the
+    # end (an interrupted run is completed with resume=True)
+    checkpointer = Checkpointer(lambda path: atomic_write_json(files[path], path))
+    journal.open(append=resume)
+    record = journaled(journal, checkpointer, SOURCE_LANGUAGE, fingerprints)
+    progress = StateProgress(jobs, codes)
+    
+    def on_translated(job: TranslationJob) -> None:
+        record(job)
+        progress(job)
+    
+    with stage('translate'):
+        stats = engine.run(jobs, verbose=False, on_translated=on_translated)
+    
+    with stage('save'):
+        save_state_files(corpus)
+    fingerprints.save()
+    journal.discard()
+    
+    print_state_summary(progress, stats)
+    print_run_stats(stats)
+    print_stats(default_memory())
+    print_pool_stats()
+
+def translate_existing_state_file(state_code: str, resume: bool = False, backend: str = 'google') -> None:
     """Translate all questions in a state file that are missing translations."""
-    questions = load_state_file(state_code)
+    with stage('load'):
+        questions = load_state_file(state_code)
     
     if not questions:
         print(f"[WARNING] No questions found for {state_code}")
         return
     
     print(f"[INFO] Translating {len(questions)} questions for {state_code}...")
+    translate_state_corpus({state_code.upper(): questions}, resume, backend)
+    print(f"[SUCCESS] Translation completed for {state_code}")
+
+def translate_all_state_files(resume: bool = False, backend: str = 'google') -> None:
+    """Translate all 16 state files concurrently in one pass (see translate_state_corpus)."""
+    start = time.perf_counter()
+    corpus = {}
+    with stage('load'):
+        for state_code in STATES:
+            questions = load_state_file(state_code)
+            if questions:
+                corpus[state_code] = questions
+            else:
+                print(f"[WARNING] No questions found for {state_code}")
+    
+    translate_state_corpus(corpus, resume, backend)
+    print(f"   - Total wall time: {time.perf_counter() - start:.2f}s")
+
+def read_import_rows(file_path: str) -> List[Tuple[int, Any]]:
+    """
+    Read (line number, row) pairs from a .csv or .jsonl import file. JSONL rows
+    are kept as text and decoded by parse_import_row, so a malformed line is
+    reported with the other validation errors.
+    """
+    rows = []
+    if file_path.lower().endswith('.csv'):
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                rows.append((reader.line_num, row))
+    else:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line_num, line in enumerate(f, 1):
+                if line.strip():
+                    rows.append((line_num, line))
+    return rows
+
+def parse_import_row(row: Any) -> Tuple[str, Optional[int], str, List[str], str]:
+    """(state code, id or None, German question, German answers, correct answer) of a row."""
+    if isinstance(row, str):
+        row = json.loads(row)
+    state_code = str(row.get('state_code') or '').strip().upper()
+    raw_id = row.get('id')
+    question_id = int(raw_id) if raw_id not in (None, '') else None
+    if isinstance(row.get('question'), dict):
+        # Question object in the state file schema
+        question_de = row['question'].get(SOURCE_LANGUAGE, '')
+        answers = sorted(row.get('answers', []), key=lambda a: a.get('id', ''))
+        answers_de = [a.get('text', {}).get(SOURCE_LANGUAGE, '') for a in answers]
+    else:
+        question_de = row.get('question') or ''
+        answers_de = [row.get(f'answer_{a.lower()}') or '' for a in ANSWER_IDS]
+    correct_answer = str(row.get('correct_answer') or '').strip().upper()
+    return state_code, question_id, question_de.strip(), [a.strip() for a in answers_de], correct_answer
+
+def validate_import(rows: List[Tuple[int, Any]], registry: QuestionRegistry) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, List[Dict[str, Any]]], List[str]]:
+    """
+    Validate import rows against each other, the existing state files and the
+    question ID registry (IDs of new questions are reserved in it).
+    Returns (existing questions per state, new questions per state, errors).
+    """
+    existing: Dict[str, List[Dict[str, Any]]] = {}
+    new: Dict[str, List[Dict[str, Any]]] = {}
+    texts: Dict[str, Set[str]] = {}
+    errors = []
     
-    for i, question in enumerate(questions, 1):
-        print(f"  [{i}/{len(questions)}] Translating question ID: {question.get('id', 'unknown')}...")
-        question = translate_question(question)
+    for line_num, row in rows:
+        try:
+            state_code, question_id, question_de, answers_de, correct = parse_import_row(row)
+        except (TypeError, ValueError, AttributeError) as e:
+            errors.append(f"line {line_num}: malformed row ({e})")
+            continue
+        
+        problems = []
+        if state_code not in STATES:
+            problems.append(f"unknown state code '{state_code}'")
+        if not question_de:
+            problems.append("question text is empty")
+        if len(answers_de) != 4 or not all(answers_de):
+            problems.append("exactly 4 non-empty answers are required")
+        if correct not in ANSWER_IDS:
+            problems.append(f"correct_answer must be one of {', '.join(ANSWER_IDS)}")
+        if problems:
+            errors.append(f"line {line_num}: " + '; '.join(problems))
+            continue
+        
+        if state_code not in existing:
+            existing[state_code] = load_state_file(state_code)
+            texts[state_code] = {q.get('question', {}).get(SOURCE_LANGUAGE, '').strip() for q in existing[state_code]}
+        
+        if question_de in texts[state_code]:
+            errors.append(f"line {line_num}: question already exists in {STATES[state_code].filename}")
+            continue
+        if question_id is None:
+            question_id = next_question_id(state_code, existing[state_code] + new.get(state_code, []), registry)
+        elif question_id in registry:
+            errors.append(f"line {line_num}: id {question_id} is already used in "
+                          f"{', '.join(sorted(registry.owners(question_id)))}")
+            continue
+        
+        question = build_question(state_code, question_id, question_de, answers_de, correct)
+        registry.reserve(question_id, state_file(state_code, STATES_DIR), question)
+        texts[state_code].add(question_de)
+        new.setdefault(state_code, []).append(question)
     
-    save_state_file(state_code, questions)
-    print(f"[SUCCESS] Translation completed for {state_code}")
+    return existing, new, errors
+
+def import_questions(file_path: str, backend: str = 'google') -> bool:
+    """
+    Bulk-add questions from a CSV/JSONL file: validate every row, translate all
+    new questions in one engine pass, then write each affected state file once.
+    Returns False (and writes nothing) if any row is invalid.
+    """
+    with stage('parse'):
+        rows = read_import_rows(file_path)
+    with stage('load'):
+        registry = QuestionRegistry.load()
+    with stage('validate'):
+        existing, new, errors = validate_import(rows, registry)
+    if errors:
+        for error in errors:
+            print(f"[ERROR] {error}")
+        print(f"[ERROR] {len(errors)} invalid row(s) in {file_path}, nothing imported")
+        return False
+    if not new:
+        print(f"[WARNING] No questions found in {file_path}")
+        return True
+    
+    total = sum(len(questions) for questions in new.values())
+    print(f"[INFO] {total} valid questions for {len(new)} state(s)")
+    warn_similar(new, existing)
+    
+    # Only the imported questions are translated; fields of existing questions
+    # are left to translate/translate-all.
+    fingerprints = FingerprintStore()
+    jobs = []
+    for state_code, questions in new.items():
+        jobs.extend(collect_jobs(questions, TARGET_LANGUAGES, SOURCE_LANGUAGE,
+                                 key=state_file(state_code, STATES_DIR), fingerprints=fingerprints))
+    for lang, texts in sorted(unique_strings(jobs).items()):
+        print(f"   {lang}: {len(texts)} unique strings")
+    
+    engine = create_engine(backend)
+    with stage('translate'):
+        stats = engine.run(jobs, on_translated=fingerprints.record_job)
+    
+    with stage('save'):
+        save_state_files({state_code: existing[state_code] + questions
+                          for state_code, questions in sorted(new.items())})
+        for state_code, questions in sorted(new.items()):
+            registry.update_file(state_file(state_code, STATES_DIR), existing[state_code] + questions)
+        registry.save()
+        fingerprints.save()
+    metrics().count('imported_questions', total)
+    
+    print_run_stats(stats)
+    print_stats(default_memory())
+    print_pool_stats()
+    return True
 
 def create_template_file(state_code: str) -> None:
     """Create a template file for a state with example structure."""
-    filename = STATE_MAP.get(state_code.upper())
-    if not filename:
+    file_path = state_file(state_code, STATES_DIR)
+    if not file_path:
         print(f"[ERROR] Invalid state code: {state_code}")
         return
     
-    file_path = os.path.join(STATES_DIR, filename)
-    
     if os.path.exists(file_path):
         print(f"[WARNING] File already exists: {file_path}")
         response = input("Overwrite? (y/n): ")
         if response.lower() != 'y':
             return
     
+    registry = QuestionRegistry.load()
+    question_id = next_question_id(state_code, [], registry)
     template = [
         {
-            "id": 20001,
+            "id": question_id,
             "category_id": "state",
             "state_code": state_code.upper(),
             "question": {
@@ -243,6 +554,8 @@ def create_template_file(state_code: str) -> None:
     ]
     
     save_state_file(state_code, template)
+    registry.update_file(file_path, template)
+    registry.save()
     print(f"[SUCCESS] Template file created for {state_code}")
 
 def main():
@@ -252,6 +565,15 @@ def main():
     print("State Questions Generator & Translator")
     print("=" * 70)
     
+    resume = '--resume' in sys.argv
+    if resume:
+        sys.argv.remove('--resume')
+    backend = 'google'
+    if '--backend' in sys.argv:
+        index = sys.argv.index('--backend')
+        backend = sys.argv[index + 1] if index + 1 < len(sys.argv) else backend
+        del sys.argv[index:index + 2]
+    
     if len(sys.argv) < 2:
         print("\nUsage:")
         print("  python scripts/generate_state_questions.py create <STATE_CODE>")
@@ -260,8 +582,13 @@ def main():
         print("    - Translate all questions in a state file")
         print("\n  python scripts/generate_state_questions.py translate-all")
         print("    - Translate all state files")
+        print("\n  Add --resume to translate/translate-all to continue an interrupted run")
         print("\n  python scripts/generate_state_questions.py add <STATE_CODE>")
         print("    - Interactive mode to add a question")
+        print("\n  python scripts/generate_state_questions.py import <FILE.csv|FILE.jsonl>")
+        print("    - Validate, translate and add many questions for many states at once")
+        print("\n  Add --backend fake to translate/translate-all/import to test offline")
+        print("    (writes placeholder translations; the translation memory is not used)")
         print("\nExample:")
         print("  python scripts/generate_state_questions.py create HE")
         print("  python scripts/generate_state_questions.py translate SN")
@@ -281,13 +608,11 @@ def main():
             print("[ERROR] Please provide state code (e.g., HE, BY, BE)")
             return
         state_code = sys.argv[2].upper()
-        translate_existing_state_file(state_code)
+        translate_existing_state_file(state_code, resume, backend)
     
     elif command == 'translate-all':
         print("[INFO] Translating all state files...")
-        for state_code in STATE_MAP.keys():
-            print(f"\n--- Processing {state_code} ---")
-            translate_existing_state_file(state_code)
+        translate_all_state_files(resume, backend)
         print("\n[SUCCESS] All state files translated!")
     
     elif command == 'add':
@@ -311,9 +636,19 @@ def main():
         
         add_question_to_state(state_code, question_de, answers_de, correct)
     
+    elif command == 'import':
+        if len(sys.argv) < 3:
+            print("[ERROR] Please provide a CSV or JSONL file")
+            return
+        if import_questions(sys.argv[2], backend):
+            print("\n[SUCCESS] Import completed!")
+        else:
+            sys.exit(1)
+    
     else:
         print(f"[ERROR] Unknown command: {command}")
 
 if __name__ == "__main__":
-    main()
+    with run_metrics('generate_state_questions'):
+        main()
 
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Glossary Link Index
+Finds every glossary term in the text of every bundled question and its
+answers, per language, and writes a compact index the app can use to highlight
+terms without scanning text at runtime:
+
+  {"de": {"questions": {"43": [15, 66]}, "terms": {"15": [43, 89]}}, "en": {...}, ...}
+
+(question id -> term ids, term id -> question ids; written to
+assets/data/glossary_links.json as compact JSON).
+
+Matching works on tokens: text is split into case-folded words and German words
+are reduced to a light stem (inflection endings such as -e, -en, -er, -es, -n,
+-s removed), so "Abgeordnete", "Abgeordneten" and "Abgeordneter", or "Soziale
+Marktwirtschaft" and "sozialen Marktwirtschaft", are the same term. All terms
+go into one Aho-Corasick automaton over token sequences, so each text is
+scanned once, left to right, whatever the number of terms: build time is
+linear in corpus size.
+
+The glossary names its terms in German only. German text is matched with
+stems; the other languages are matched on the German term words unstemmed,
+which finds the names translations keep (Bundestag, Bundesrat, Grundgesetz).
+
+Usage:
+  python scripts/glossary_links.py              # build the index from the question store
+  python scripts/glossary_links.py --check      # exit 1 if the index is out of date
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Sequence, Set
+
+from corpus import Corpus, Question, Text, load_questions
+from json_io import write_text_if_changed
+from metrics import metrics, run_metrics, stage
+from question_store import LAYOUT_FILE, STORE_FILE, load_layout
+
+# Configuration
+GLOSSARY_FILE = 'assets/data/glossary.json'
+OUTPUT_FILE = 'assets/data/glossary_links.json'
+LANGUAGES = ['de', 'ar', 'en', 'tr', 'uk', 'ru']
+TERM_LANGUAGE = 'de'
+# German inflection endings, longest first; a stem keeps at least MIN_STEM letters
+GERMAN_ENDINGS = ('ern', 'em', 'en', 'er', 'es', 'e', 'n', 's')
+MIN_STEM = 4
+
+_WORD = re.compile(r'\w+')
+
+
+def german_stem(word: str) -> str:
+    for ending in GERMAN_ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= MIN_STEM:
+            return word[:-len(ending)]
+    return word
+
+
+def tokens(text: str, stem: bool) -> List[str]:
+    words = _WORD.findall(text.casefold())
+    return [german_stem(word) for word in words] if stem else words
+
+
+class TermMatcher:
+    """
+    Aho-Corasick automaton whose alphabet is tokens: add() the token sequence
+    of every term, build() the failure links, then find() reports all terms
+    occurring in a token sequence (overlapping ones included) in one scan.
+    """
+
+    def __init__(self) -> None:
+        self._next: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Sequence[int]] = [()]
+
+    def add(self, term_tokens: Sequence[str], term_id: int) -> None:
+        state = 0
+        for token in term_tokens:
+            child = self._next[state].get(token)
+            if child is None:
+                child = len(self._next)
+                self._next[state][token] = child
+                self._next.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = child
+        self._out[state] = tuple(self._out[state]) + (term_id,)
+
+    def build(self) -> 'TermMatcher':
+        """Failure links breadth-first; a state also reports the terms of its failure state."""
+        queue = deque(self._next[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self._next[state].items():
+                fallback = self._fail[state]
+                while fallback and token not in self._next[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._next[fallback].get(token, 0)
+                self._out[child] = tuple(self._out[child]) + tuple(self._out[self._fail[child]])
+                queue.append(child)
+        return self
+
+    def find(self, text_tokens: Iterable[str]) -> Set[int]:
+        found: Set[int] = set()
+        state = 0
+        for token in text_tokens:
+            while state and token not in self._next[state]:
+                state = self._fail[state]
+            state = self._next[state].get(token, 0)
+            found.update(self._out[state])
+        return found
+
+    def __len__(self) -> int:
+        return len(self._next)
+
+
+def term_matchers(terms: List[Dict[str, Any]]) -> Dict[bool, TermMatcher]:
+    """Automata for stemmed (German) and unstemmed text: {stem: matcher}."""
+    matchers = {True: TermMatcher(), False: TermMatcher()}
+    for term in terms:
+        for stem, matcher in matchers.items():
+            term_tokens = tokens(term.get('term', ''), stem)
+            if term_tokens:
+                matcher.add(term_tokens, term['id'])
+    return {stem: matcher.build() for stem, matcher in matchers.items()}
+
+
+def question_texts(question: Question, lang: str) -> Iterable[str]:
+    """The question and answer texts of one language."""
+    yield question.text(lang)
+    for answer in question.answers:
+        if isinstance(answer.text, Text):
+            yield answer.text.get(lang, '')
+
+
+def link_index(questions: Iterable[Question], terms: List[Dict[str, Any]],
+               langs: List[str] = LANGUAGES) -> Dict[str, Dict[str, Dict[int, List[int]]]]:
+    """{lang: {'questions': {question id: term ids}, 'terms': {term id: question ids}}}, in one pass."""
+    matchers = term_matchers(terms)
+    links: Dict[str, Dict[int, Set[int]]] = {lang: {} for lang in langs}
+    for question in questions:
+        for lang in langs:
+            matcher = matchers[lang == TERM_LANGUAGE]
+            found: Set[int] = set()
+            for text in question_texts(question, lang):
+                found |= matcher.find(tokens(text, lang == TERM_LANGUAGE))
+            if found:
+                links[lang][question.id] = found
+    index = {}
+    for lang, by_question in links.items():
+        by_term: Dict[int, List[int]] = {}
+        for question_id in sorted(by_question):
+            for term_id in by_question[question_id]:
+                by_term.setdefault(term_id, []).append(question_id)
+        index[lang] = {'questions': {question_id: sorted(term_ids)
+                                     for question_id, term_ids in sorted(by_question.items())},
+                       'terms': dict(sorted(by_term.items()))}
+    return index
+
+
+def bundled_questions(store_file: str = STORE_FILE, layout_file: str = LAYOUT_FILE) -> List[Question]:
+    """The store's questions that some generated file selects."""
+    selected = {question_id for ids in load_layout(layout_file).values() for question_id in ids}
+    return [question for question in Corpus.load([store_file]).file(store_file) if question.id in selected]
+
+
+def compact(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the glossary term -> question link index")
+    parser.add_argument('--out', default=OUTPUT_FILE, help=f"Output file (default {OUTPUT_FILE})")
+    parser.add_argument('--check', action='store_true', help="Exit 1 if the index is out of date, write nothing")
+    args = parser.parse_args()
+
+    with stage('load'):
+        terms = load_questions(GLOSSARY_FILE)
+    start = time.perf_counter()
+    with stage('index'):
+        index = link_index(bundled_questions(), terms)
+    seconds = time.perf_counter() - start
+    text = compact(index)
+
+    if args.check:
+        current = ''
+        if os.path.exists(args.out):
+            with open(args.out, 'r', encoding='utf-8') as f:
+                current = f.read()
+        up_to_date = current == text
+        print(f"[{'OK' if up_to_date else 'ERROR'}] {args.out} is {'up to date' if up_to_date else 'out of date'}")
+        sys.exit(0 if up_to_date else 1)
+    with stage('save'):
+        written = write_text_if_changed(text, args.out)
+
+    print(f"[{'OK' if written else 'SKIP'}] {args.out} ({len(text.encode('utf-8')):,} bytes, "
+          f"{len(terms)} terms, {seconds * 1000:.0f} ms)")
+    total = 0
+    for lang, links in index.items():
+        pairs = sum(len(term_ids) for term_ids in links['questions'].values())
+        total += pairs
+        print(f"   {lang}: {pairs} links, {len(links['questions'])} questions, {len(links['terms'])} terms")
+    unused = sorted(term['id'] for term in terms if term['id'] not in index[TERM_LANGUAGE]['terms'])
+    if unused:
+        print(f"[INFO] {len(unused)} terms occur in no German question: {', '.join(map(str, unused))}")
+    metrics().count('glossary_links', total)
+
+
+if __name__ == '__main__':
+    with run_metrics('glossary_links'):
+        main()
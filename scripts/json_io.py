@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON file helpers shared by the content scripts.
+Writes are atomic: data goes to a temp file in the target directory, which is
+then renamed over the destination, so an interrupted run never leaves a
+half-written asset behind. The *_if_changed variants leave files whose content
+would not change untouched (no mtime change, no asset cache invalidation).
+Bytes read and written are reported to the run metrics (see metrics.py).
+"""
+
+import hashlib
+import json
+import os
+import stat
+import tempfile
+from typing import Any, Dict, Iterator
+
+from metrics import metrics
+
+# Streaming configuration
+READ_CHUNK_SIZE = 64 * 1024
+# Permissions of newly created files (mkstemp creates its temp files 0600)
+NEW_FILE_MODE = 0o644
+
+
+def dump_json(data: Any) -> str:
+    """Serialize data the way all asset files are formatted (indent=2, ensure_ascii=False)."""
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def atomic_write_text(text: str, file_path: str) -> None:
+    """Write text to file_path via temp file + rename."""
+    _atomic_write(text, file_path, 'w', encoding='utf-8')
+
+
+def atomic_write_bytes(data: bytes, file_path: str) -> None:
+    """Write bytes to file_path via temp file + rename."""
+    _atomic_write(data, file_path, 'wb')
+
+
+def _replace(tmp_path: str, file_path: str) -> None:
+    """Rename tmp_path over file_path, keeping file_path's permissions."""
+    if os.path.exists(file_path):
+        os.chmod(tmp_path, stat.S_IMODE(os.stat(file_path).st_mode))
+    else:
+        os.chmod(tmp_path, NEW_FILE_MODE)
+    os.replace(tmp_path, file_path)
+
+
+def _atomic_write(data: Any, file_path: str, mode: str, **open_args: Any) -> None:
+    directory = os.path.dirname(file_path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(fd, mode, **open_args) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        _replace(tmp_path, file_path)
+        metrics().wrote(os.path.getsize(file_path))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write_json(data: Any, file_path: str) -> None:
+    """Write data as formatted JSON via temp file + rename."""
+    atomic_write_text(dump_json(data), file_path)
+
+
+def file_sha256(file_path: str) -> str:
+    """sha256 of a file's bytes, or '' if it does not exist."""
+    if not os.path.exists(file_path):
+        return ''
+    h = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def write_text_if_changed(text: str, file_path: str) -> bool:
+    """Atomically write text unless the file already holds exactly it. Returns True if written."""
+    data = text.encode('utf-8')
+    if (os.path.exists(file_path) and os.path.getsize(file_path) == len(data)
+            and file_sha256(file_path) == hashlib.sha256(data).hexdigest()):
+        return False
+    atomic_write_text(text, file_path)
+    return True
+
+
+def write_json_if_changed(data: Any, file_path: str) -> bool:
+    """Formatted-JSON variant of write_text_if_changed."""
+    return write_text_if_changed(dump_json(data), file_path)
+
+
+def iter_json_array(file_path: str, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the objects of a top-level JSON array one at a time.
+    Only the current object and one read buffer are held in memory.
+    """
+    decoder = json.JSONDecoder()
+    with open(file_path, 'r', encoding='utf-8') as f:
+        metrics().read(os.fstat(f.fileno()).st_size)
+        buffer = ''
+        pos = 0
+        eof = False
+
+        def fill() -> bool:
+            nonlocal buffer, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return True
+
+        def skip_whitespace() -> str:
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+                    pos += 1
+                if pos < len(buffer):
+                    return buffer[pos]
+                if not fill():
+                    return ''
+
+        if skip_whitespace() != '[':
+            raise ValueError(f"{file_path}: expected a JSON array")
+        pos += 1
+        if skip_whitespace() == ']':
+            return
+
+        while True:
+            if skip_whitespace() != '{':
+                raise ValueError(f"{file_path}: expected an object at offset {pos}")
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                    break
+                except json.JSONDecodeError:
+                    if eof or not fill():
+                        raise
+            pos = end
+            yield item
+
+            separator = skip_whitespace()
+            pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f"{file_path}: expected ',' or ']' at offset {pos - 1}")
+
+
+class JsonArrayWriter:
+    """
+    Incrementally writes a JSON array byte-identical to
+    json.dump(items, f, ensure_ascii=False, indent=2). Items go to a temp file
+    that replaces file_path atomically on close(), unless file_path already
+    holds the same bytes. With dry_run=True nothing is written: close() only
+    tells whether file_path differs.
+    """
+
+    def __init__(self, file_path: str, dry_run: bool = False) -> None:
+        self.file_path = file_path
+        self.count = 0
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._tmp_path = None
+        self._file = None
+        if not dry_run:
+            directory = os.path.dirname(file_path) or '.'
+            os.makedirs(directory, exist_ok=True)
+            fd, self._tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+            self._file = os.fdopen(fd, 'w', encoding='utf-8')
+
+    def write(self, item: Any) -> None:
+        text = json.dumps(item, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+        self._emit(('[\n  ' if self.count == 0 else ',\n  ') + text)
+        self.count += 1
+
+    def _emit(self, text: str) -> None:
+        data = text.encode('utf-8')
+        self._hash.update(data)
+        self.size += len(data)
+        if self._file:
+            self._file.write(text)
+
+    def close(self) -> bool:
+        """Finish the array. Returns True if file_path was (or, dry run, would be) rewritten."""
+        self._emit('\n]' if self.count else '[]')
+        if self._file:
+            self._file.close()
+        if (os.path.exists(self.file_path) and os.path.getsize(self.file_path) == self.size
+                and file_sha256(self.file_path) == self._hash.hexdigest()):
+            if self._tmp_path:
+                os.remove(self._tmp_path)
+            return False
+        if not self._tmp_path:
+            return True
+        with open(self._tmp_path, 'rb') as f:
+            os.fsync(f.fileno())
+        _replace(self._tmp_path, self.file_path)
+        metrics().wrote(self.size)
+        return True
+
+    def abort(self) -> None:
+        """Discard the partial output and keep the existing file."""
+        if self._file:
+            self._file.close()
+        if self._tmp_path and os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
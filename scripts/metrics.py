@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Run Metrics
+Process-wide instrumentation shared by the content scripts:
+
+- stage timers:      with stage('translate'): ...   (load, parse, translate, refine, save)
+- backend calls:     latency histogram, failures and empty results per backend
+- file I/O:          bytes read and written (json_io and corpus report these)
+- counters:          any named count
+
+A script wraps its main() in run_metrics('<script>'); when it finishes, the run's
+metrics are written as JSON to .cache/metrics/<script>-<timestamp>-<pid>.json, so
+run cost can be tracked over time.
+
+Profiling: set CONTENT_PROFILE to a comma-separated list of stage names (or
+'all') and those stages run under cProfile; each profile is saved next to the
+metrics file as <script>-<timestamp>-<pid>-<stage>.prof (read with python -m pstats).
+
+Usage:
+  python scripts/metrics.py show [FILE]     # summarize a metrics file (default: the latest)
+  python scripts/metrics.py history         # one line per recorded run
+"""
+
+import argparse
+import cProfile
+import copy
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Configuration
+METRICS_DIR = '.cache/metrics'
+PROFILE_ENV = 'CONTENT_PROFILE'
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+class BackendStats:
+    """Call latencies of one backend, bucketed, with failure and empty-result counts."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.failures = 0
+        self.empty = 0
+        self.strings = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, seconds: float, strings: int, failed: bool, empty: int) -> None:
+        self.calls += 1
+        self.strings += strings
+        self.failures += int(failed)
+        self.empty += empty
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        ms = seconds * 1000
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            'calls': self.calls,
+            'strings': self.strings,
+            'failures': self.failures,
+            'empty_results': self.empty,
+            'total_seconds': round(self.total_seconds, 3),
+            'mean_ms': round(1000 * self.total_seconds / self.calls, 2) if self.calls else 0.0,
+            'max_ms': round(1000 * self.max_seconds, 2),
+            'histogram': {label: count for label, count in zip(labels, self.buckets) if count},
+        }
+
+
+class Metrics:
+    """Thread-safe collector for one process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.time()
+            self.stages: Dict[str, Dict[str, float]] = {}
+            self.backends: Dict[str, BackendStats] = {}
+            self.counters: Dict[str, int] = {}
+            self.bytes_read = 0
+            self.bytes_written = 0
+            self.files_read = 0
+            self.files_written = 0
+            self.profiles: Dict[str, str] = {}
+            self.profile_stages = _profile_stages()
+            self.profile_prefix: Optional[str] = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a stage (stages may repeat and nest; time is added per name)."""
+        profiler = None
+        if self.profile_prefix and ('all' in self.profile_stages or name in self.profile_stages):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:  # another profiler is active (nested stage)
+                profiler = None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+                path = f"{self.profile_prefix}-{name}.prof"
+                profiler.dump_stats(path)
+                self.profiles[name] = path
+            with self._lock:
+                entry = self.stages.setdefault(name, {'count': 0, 'seconds': 0.0})
+                entry['count'] += 1
+                entry['seconds'] += seconds
+
+    def backend_call(self, backend: str, seconds: float, strings: int = 1,
+                     failed: bool = False, empty: int = 0) -> None:
+        """Record one request to a translation backend (a batch counts as one call)."""
+        with self._lock:
+            self.backends.setdefault(backend, BackendStats()).record(seconds, strings, failed, empty)
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def read(self, size: int) -> None:
+        with self._lock:
+            self.files_read += 1
+            self.bytes_read += size
+
+    def wrote(self, size: int) -> None:
+        with self._lock:
+            self.files_written += 1
+            self.bytes_written += size
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Picklable copy of the counts, for merge() in another process."""
+        with self._lock:
+            return {'stages': {name: dict(s) for name, s in self.stages.items()},
+                    'backends': {name: copy.copy(stats) for name, stats in self.backends.items()},
+                    'counters': dict(self.counters),
+                    'io': (self.files_read, self.bytes_read, self.files_written, self.bytes_written)}
+
+    def merge(self, snapshot: Dict[str, Any]) -> None:
+        """Add the counts of a worker process (see in_worker)."""
+        with self._lock:
+            for name, s in snapshot['stages'].items():
+                entry = self.stages.setdefault(name, {'count': 0, 'seconds': 0.0})
+                entry['count'] += s['count']
+                entry['seconds'] += s['seconds']
+            for name, stats in snapshot['backends'].items():
+                own = self.backends.setdefault(name, BackendStats())
+                own.calls += stats.calls
+                own.failures += stats.failures
+                own.empty += stats.empty
+                own.strings += stats.strings
+                own.total_seconds += stats.total_seconds
+                own.max_seconds = max(own.max_seconds, stats.max_seconds)
+                own.buckets = [x + y for x, y in zip(own.buckets, stats.buckets)]
+            for name, n in snapshot['counters'].items():
+                self.counters[name] = self.counters.get(name, 0) + n
+            files_read, bytes_read, files_written, bytes_written = snapshot['io']
+            self.files_read += files_read
+            self.bytes_read += bytes_read
+            self.files_written += files_written
+            self.bytes_written += bytes_written
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'seconds': round(time.time() - self.started, 3),
+                'stages': {name: {'count': s['count'], 'seconds': round(s['seconds'], 3)}
+                           for name, s in self.stages.items()},
+                'backends': {name: stats.to_dict() for name, stats in self.backends.items()},
+                'counters': dict(self.counters),
+                'io': {'files_read': self.files_read, 'bytes_read': self.bytes_read,
+                       'files_written': self.files_written, 'bytes_written': self.bytes_written},
+                'profiles': dict(self.profiles),
+            }
+
+
+def _profile_stages() -> List[str]:
+    return [name.strip() for name in os.environ.get(PROFILE_ENV, '').split(',') if name.strip()]
+
+
+_metrics = Metrics()
+
+
+def metrics() -> Metrics:
+    """Return the process-wide collector."""
+    return _metrics
+
+
+def stage(name: str):
+    """Shortcut for metrics().stage(name)."""
+    return _metrics.stage(name)
+
+
+def in_worker(fn: Callable[..., Any], *args: Any) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Run fn(*args) in a pool worker process and return (result, snapshot); the
+    parent adds the snapshot with metrics().merge(), so file I/O and backend
+    calls made in workers count towards the run.
+    """
+    _metrics.reset()
+    result = fn(*args)
+    return result, _metrics.snapshot()
+
+
+@contextmanager
+def run_metrics(script: str, metrics_dir: str = METRICS_DIR) -> Iterator[Metrics]:
+    """
+    Collect metrics for one script run and write them to
+    metrics_dir/<script>-<timestamp>-<pid>.json when the block exits (also on errors).
+    """
+    _metrics.reset()
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    prefix = os.path.join(metrics_dir, f"{script}-{stamp}-{os.getpid()}")
+    if _metrics.profile_stages:
+        os.makedirs(metrics_dir, exist_ok=True)
+        _metrics.profile_prefix = prefix
+    status = 'ok'
+    try:
+        yield _metrics
+    except BaseException as e:
+        status = 'interrupted' if isinstance(e, KeyboardInterrupt) else (
+            'ok' if isinstance(e, SystemExit) and not e.code else 'error')
+        raise
+    finally:
+        report = {
+            'script': script,
+            'argv': sys.argv[1:],
+            'started': datetime.fromtimestamp(_metrics.started, timezone.utc).isoformat(timespec='seconds'),
+            'status': status,
+            **_metrics.to_dict(),
+        }
+        try:
+            from json_io import atomic_write_text
+            atomic_write_text(json.dumps(report, ensure_ascii=False, indent=2), f"{prefix}.json")
+        except OSError as e:
+            print(f"[WARNING] Could not write run metrics: {e}")
+
+
+def metrics_files(metrics_dir: str = METRICS_DIR) -> List[str]:
+    return sorted(glob.glob(os.path.join(metrics_dir, '*.json')), key=os.path.getmtime)
+
+
+def show(path: str) -> None:
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    print(f"[INFO] {report['script']} {' '.join(report['argv'])} ({report['status']}), "
+          f"started {report['started']}, {report['seconds']}s")
+    for name, s in sorted(report['stages'].items(), key=lambda item: -item[1]['seconds']):
+        print(f"   stage {name:<12} {s['seconds']:>9.3f}s  ({s['count']}x)")
+    for name, b in report['backends'].items():
+        print(f"   backend {name}: {b['calls']} calls for {b['strings']} strings, mean {b['mean_ms']} ms, "
+              f"max {b['max_ms']} ms, {b['failures']} failed, {b['empty_results']} empty")
+        print(f"      {', '.join(f'{label} {count}' for label, count in b['histogram'].items())}")
+    io_stats = report['io']
+    print(f"   read {io_stats['bytes_read']:,} bytes ({io_stats['files_read']} files), "
+          f"wrote {io_stats['bytes_written']:,} bytes ({io_stats['files_written']} files)")
+    for name, value in sorted(report['counters'].items()):
+        print(f"   {name}: {value}")
+    for name, profile in report['profiles'].items():
+        print(f"   profile {name}: {profile}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run metrics tools")
+    sub = parser.add_subparsers(dest='command')
+    show_parser = sub.add_parser('show', help="Summarize a metrics file")
+    show_parser.add_argument('file', nargs='?')
+    sub.add_parser('history', help="One line per recorded run")
+    args = parser.parse_args()
+
+    files = metrics_files()
+    if args.command == 'show':
+        if not args.file and not files:
+            print(f"[INFO] No metrics in {METRICS_DIR}")
+            return
+        show(args.file or files[-1])
+    elif args.command == 'history':
+        for path in files:
+            with open(path, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+            stages = ', '.join(f"{name} {s['seconds']}s" for name, s in report['stages'].items())
+            print(f"{report['started']}  {report['script']:<34} {report['seconds']:>8}s  {report['status']:<11} {stages}")
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Near-Duplicate Questions
+Finds questions whose text is almost the same in the question store
+(questions.json) without comparing every pair. The general, category and state
+files are generated from the store and the backup is an old copy of it, so they
+are only scanned when given on the command line:
+
+1. Each distinct question text is normalized (case-folded, punctuation and ✓
+   removed) and cut into character 5-gram shingles; copies with identical text
+   are grouped first.
+2. Each shingle set gets a MinHash signature by one-permutation hashing: one
+   64-bit hash per shingle, split into SIGNATURE_BINS bins, minimum per bin
+   (an empty bin copies another bin of the same text). The share of equal bins
+   estimates the Jaccard similarity of two texts.
+3. Locality-sensitive hashing: signatures are cut into bands, and only texts
+   that share a band bucket become candidate pairs. The band layout is chosen
+   from the threshold, so pairs above it are found with high probability.
+4. Candidates are verified with the exact Jaccard similarity of their shingle
+   sets, and pairs above the threshold are merged into clusters.
+
+Work grows with the number of texts plus the number of candidate pairs, not
+with the number of all pairs.
+
+Usage:
+  python scripts/near_duplicates.py find                     # clusters of near-duplicate questions
+  python scripts/near_duplicates.py find assets/data/questions_general.json assets/data/states/*.json
+  python scripts/near_duplicates.py find --threshold 0.6 --answers --langs de,en
+  python scripts/near_duplicates.py find --include-exact --out /tmp/duplicates.json
+  python scripts/near_duplicates.py bench [--questions 20000]
+"""
+
+import argparse
+import os
+import random
+import re
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from corpus import DATA_DIR, Corpus, Question, StringTable, Text, question_files
+from metrics import in_worker, metrics, run_metrics, stage
+
+# Configuration
+SOURCE_LANGUAGE = 'de'
+SHINGLE_SIZE = 5
+SIGNATURE_BINS = 128
+DEFAULT_THRESHOLD = 0.8
+# The band layout is tuned for threshold - LSH_MARGIN, weighting misses over candidates
+LSH_MARGIN = 0.1
+FALSE_NEGATIVE_WEIGHT = 0.8
+# Texts per worker task when signatures are computed in parallel
+PARALLEL_CHUNK = 2000
+
+_MASK64 = (1 << 64) - 1
+_MULTIPLIER = 0x9E3779B97F4A7C15
+_BIN_BITS = SIGNATURE_BINS.bit_length() - 1
+_VALUE_BITS = 64 - _BIN_BITS
+_VALUE_MASK = (1 << _VALUE_BITS) - 1
+_EMPTY = _VALUE_MASK + 1
+_NON_WORD = re.compile(r'[\W_]+')
+# Per bin, the other bins in a fixed pseudo-random order (densification)
+_PROBES = [random.Random(i).sample([j for j in range(SIGNATURE_BINS) if j != i], SIGNATURE_BINS - 1)
+           for i in range(SIGNATURE_BINS)]
+
+# A question copy: (file path relative to the data dir, question id)
+Member = Tuple[str, Any]
+
+
+def normalize(text: str) -> str:
+    """Comparison form: case-folded words separated by single spaces."""
+    return _NON_WORD.sub(' ', text.replace('✓', '').casefold()).strip()
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """Hashed character shingles of normalized text (texts shorter than size give one shingle)."""
+    padded = f" {text} "
+    if len(padded) <= size:
+        return {zlib.crc32(padded.encode('utf-8'))}
+    return {zlib.crc32(padded[i:i + size].encode('utf-8')) for i in range(len(padded) - size + 1)}
+
+
+def minhash(shingle_set: Iterable[int]) -> Tuple[int, ...]:
+    """One-permutation MinHash signature of SIGNATURE_BINS values."""
+    bins = [_EMPTY] * SIGNATURE_BINS
+    # Multiplicative hashing spreads the 32-bit shingle hashes over 64 bits;
+    # the top bits pick the bin, the rest is the value.
+    for h in [(shingle * _MULTIPLIER) & _MASK64 for shingle in shingle_set]:
+        index = h >> _VALUE_BITS
+        if h & _VALUE_MASK < bins[index]:
+            bins[index] = h & _VALUE_MASK
+    # Optimal densification: an empty bin copies the first non-empty bin of its
+    # own fixed probe order, so the bins of a short text stay independent.
+    if _EMPTY in bins:
+        original = bins[:]
+        for i, value in enumerate(original):
+            if value == _EMPTY:
+                for j in _PROBES[i]:
+                    if original[j] != _EMPTY:
+                        bins[i] = original[j]
+                        break
+    return tuple(bins)
+
+
+def signatures(texts: Sequence[str]) -> List[Tuple[Tuple[int, ...], Set[int]]]:
+    """(signature, shingle set) per text (process-pool worker)."""
+    result = []
+    for text in texts:
+        shingle_set = shingles(text)
+        result.append((minhash(shingle_set), shingle_set))
+    return result
+
+
+@lru_cache(maxsize=None)
+def band_layout(threshold: float, bins: int = SIGNATURE_BINS) -> Tuple[int, int]:
+    """
+    (bands, rows) with bands * rows <= bins. A pair with similarity s shares a
+    bucket with probability 1 - (1 - s^rows)^bands. The layout minimizes the
+    weighted area of misses above and candidates below threshold - LSH_MARGIN,
+    so pairs at the threshold itself are found with high probability; candidates
+    below it only cost a verification.
+    """
+    target = max(0.05, threshold - LSH_MARGIN)
+    steps = 50
+
+    def area(probability, start: float, end: float) -> float:
+        width = (end - start) / steps
+        return sum(probability(start + (i + 0.5) * width) for i in range(steps)) * width
+
+    best = (float('inf'), bins, 1)
+    for bands in range(1, bins + 1):
+        for rows in range(1, bins // bands + 1):
+            def probability(s: float, bands: int = bands, rows: int = rows) -> float:
+                return 1 - (1 - s ** rows) ** bands
+            error = ((1 - FALSE_NEGATIVE_WEIGHT) * area(probability, 0.0, target)
+                     + FALSE_NEGATIVE_WEIGHT * area(lambda s: 1 - probability(s), target, 1.0))
+            if error < best[0]:
+                best = (error, bands, rows)
+    return best[1], best[2]
+
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class DuplicateIndex:
+    """MinHash/LSH index over texts, queried for near-duplicates of a new text."""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD) -> None:
+        self.threshold = threshold
+        self.bands, self.rows = band_layout(threshold)
+        self.keys: List[Any] = []
+        self.shingle_sets: List[Set[int]] = []
+        self.buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> Iterable[Tuple[int, Tuple[int, ...]]]:
+        rows = self.rows
+        for band in range(self.bands):
+            yield band, signature[band * rows:(band + 1) * rows]
+
+    def add(self, key: Any, text: str, signature: Optional[Tuple[Tuple[int, ...], Set[int]]] = None) -> int:
+        """Index text under key (signature: precomputed (minhash, shingles)). Returns its index."""
+        minhash_values, shingle_set = signature or signatures([normalize(text)])[0]
+        index = len(self.keys)
+        self.keys.append(key)
+        self.shingle_sets.append(shingle_set)
+        for band, band_key in self._band_keys(minhash_values):
+            self.buckets[band].setdefault(band_key, []).append(index)
+        return index
+
+    def candidates(self, minhash_values: Tuple[int, ...]) -> Set[int]:
+        found: Set[int] = set()
+        for band, band_key in self._band_keys(minhash_values):
+            found.update(self.buckets[band].get(band_key, ()))
+        return found
+
+    def query(self, text: str) -> List[Tuple[Any, float]]:
+        """(key, similarity) of indexed texts at or above the threshold, most similar first."""
+        minhash_values, shingle_set = signatures([normalize(text)])[0]
+        matches = []
+        for index in self.candidates(minhash_values):
+            similarity = jaccard(shingle_set, self.shingle_sets[index])
+            if similarity >= self.threshold:
+                matches.append((self.keys[index], similarity))
+        return sorted(matches, key=lambda item: -item[1])
+
+    def pairs(self) -> Iterable[Tuple[int, int, float]]:
+        """Every verified pair (i, j, similarity) with i < j at or above the threshold."""
+        # Per text, the later texts sharing one of its buckets (each bucket lists
+        # texts in index order), so every candidate pair is verified once.
+        later: List[Set[int]] = [set() for _ in self.keys]
+        for buckets in self.buckets:
+            for members in buckets.values():
+                for position in range(len(members) - 1):
+                    later[members[position]].update(members[position + 1:])
+        candidates = 0
+        for i, others in enumerate(later):
+            candidates += len(others)
+            shingle_set = self.shingle_sets[i]
+            for j in sorted(others):
+                similarity = jaccard(shingle_set, self.shingle_sets[j])
+                if similarity >= self.threshold:
+                    yield i, j, similarity
+        metrics().count('candidate_pairs', candidates)
+
+
+def question_text(question: Question, langs: Sequence[str], answers: bool) -> str:
+    """The text compared for a question: its question (and answer) text in langs."""
+    parts = []
+    for lang in langs:
+        if question.text(lang):
+            parts.append(str(question.text(lang)))
+        if answers:
+            parts.extend(str(answer.text[lang]) for answer in question.answers
+                         if isinstance(answer.text, Text) and answer.text.get(lang))
+    return normalize(' '.join(parts))
+
+
+def similar_questions(new: List[Dict[str, Any]], existing: List[Dict[str, Any]],
+                      threshold: float = DEFAULT_THRESHOLD) -> List[Tuple[Dict[str, Any], Dict[str, Any], float]]:
+    """
+    (new question, similar question, similarity) for every new question whose
+    German text is near an existing question or an earlier new one.
+    """
+    index = DuplicateIndex(threshold)
+    table = StringTable()
+    records: List[Dict[str, Any]] = []
+    found = []
+    for question, is_new in [(q, False) for q in existing] + [(q, True) for q in new]:
+        text = question_text(Question.from_dict(question, table), [SOURCE_LANGUAGE], False)
+        if not text:
+            continue
+        if is_new:
+            found.extend((question, records[key], similarity) for key, similarity in index.query(text))
+        index.add(len(records), text)
+        records.append(question)
+    return found
+
+
+def load_texts(paths: List[str], langs: Sequence[str], answers: bool) -> Dict[str, List[Member]]:
+    """Normalized text -> every (file, id) holding it."""
+    corpus = Corpus.load(paths)
+    texts: Dict[str, List[Member]] = {}
+    for path in paths:
+        name = os.path.relpath(path, DATA_DIR)
+        for question in corpus.file(path):
+            text = question_text(question, langs, answers)
+            if text:
+                texts.setdefault(text, []).append((name, question.id))
+    return texts
+
+
+def build_index(texts: List[str], threshold: float, jobs: Optional[int] = None) -> DuplicateIndex:
+    """Index texts (keyed by position), computing signatures in parallel for large inputs."""
+    chunks = [texts[i:i + PARALLEL_CHUNK] for i in range(0, len(texts), PARALLEL_CHUNK)]
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(chunks)))
+    if jobs == 1:
+        results = [signatures(chunk) for chunk in chunks]
+    else:
+        results = []
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for result, snapshot in pool.map(in_worker, [signatures] * len(chunks), chunks):
+                metrics().merge(snapshot)
+                results.append(result)
+    index = DuplicateIndex(threshold)
+    position = 0
+    for chunk, result in zip(chunks, results):
+        for text, signature in zip(chunk, result):
+            index.add(position, text, signature)
+            position += 1
+    return index
+
+
+def clusters(index: DuplicateIndex) -> List[Tuple[List[int], List[Tuple[int, int, float]]]]:
+    """Connected groups of verified pairs: (member indexes, pairs), largest first."""
+    parent = list(range(len(index)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    edges = list(index.pairs())
+    for a, b, _ in edges:
+        parent[find(a)] = find(b)
+    groups: Dict[int, Tuple[List[int], List[Tuple[int, int, float]]]] = {}
+    for a, b, similarity in edges:
+        members, pairs = groups.setdefault(find(a), ([], []))
+        pairs.append((a, b, similarity))
+    for members, pairs in groups.values():
+        members.extend(sorted({i for a, b, _ in pairs for i in (a, b)}))
+    return sorted(groups.values(), key=lambda group: (-len(group[0]), group[0][0]))
+
+
+def find_duplicates(paths: List[str], threshold: float = DEFAULT_THRESHOLD,
+                    langs: Sequence[str] = (SOURCE_LANGUAGE,), answers: bool = False,
+                    include_exact: bool = False, jobs: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Clusters of near-duplicate questions. Each cluster lists its text variants
+    with every (file, id) copy and the similarity of the variant to the first one;
+    with include_exact, texts copied unchanged into several places are reported too.
+    """
+    with stage('load'):
+        by_text = load_texts(paths, langs, answers)
+    texts = list(by_text)
+    with stage('index'):
+        index = build_index(texts, threshold, jobs)
+    with stage('cluster'):
+        groups = clusters(index)
+
+    result = []
+    clustered: Set[int] = set()
+    for members, pairs in groups:
+        clustered.update(members)
+        first = index.shingle_sets[members[0]]
+        result.append({
+            'similarity': round(min(similarity for _, _, similarity in pairs), 3),
+            'variants': [{
+                'similarity': round(jaccard(first, index.shingle_sets[i]), 3),
+                'text': texts[i],
+                'questions': [f"{name}#{question_id}" for name, question_id in by_text[texts[i]]],
+            } for i in members],
+        })
+    if include_exact:
+        for i, text in enumerate(texts):
+            if i not in clustered and len(by_text[text]) > 1:
+                result.append({'similarity': 1.0, 'variants': [{
+                    'similarity': 1.0, 'text': text,
+                    'questions': [f"{name}#{question_id}" for name, question_id in by_text[text]],
+                }]})
+    metrics().count('texts', len(texts))
+    metrics().count('clusters', len(result))
+    return result
+
+
+def print_clusters(found: List[Dict[str, Any]], limit: int) -> None:
+    for number, cluster in enumerate(found[:limit] if limit else found, 1):
+        print(f"\n[{number}] {len(cluster['variants'])} variant(s), similarity >= {cluster['similarity']}")
+        for variant in cluster['variants']:
+            copies = ', '.join(variant['questions'][:6]) + (' ...' if len(variant['questions']) > 6 else '')
+            print(f"   {variant['similarity']:.2f}  {variant['text'][:90]}")
+            print(f"         {copies}")
+    if limit and len(found) > limit:
+        print(f"\n... {len(found) - limit} more cluster(s) (--limit 0 shows all)")
+
+
+def bench(questions: int, threshold: float, jobs: Optional[int]) -> None:
+    """Time detection on a synthetic corpus of edited copies of the real questions."""
+    rng = random.Random(42)
+    base = list(load_texts(question_files(DATA_DIR, include_backup=True), [SOURCE_LANGUAGE], False))
+    vocabulary = sorted({word for text in base for word in text.split()})
+    texts = []
+    for i in range(questions):
+        if i >= len(base) and i % 10 == 0:
+            # Every tenth text is an edited copy of an earlier one (one word replaced)
+            words = texts[rng.randrange(len(texts))].split()
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+        else:
+            # Otherwise a real question with about half of its words replaced
+            words = base[i % len(base)].split()
+            if i >= len(base):
+                words = [rng.choice(vocabulary) if rng.random() < 0.5 else w for w in words]
+        texts.append(' '.join(words))
+
+    start = time.perf_counter()
+    index = build_index(texts, threshold, jobs)
+    indexed = time.perf_counter() - start
+    start = time.perf_counter()
+    found = list(index.pairs())
+    paired = time.perf_counter() - start
+    print(f"[INFO] {questions} texts, bands {index.bands} x rows {index.rows}: "
+          f"index {indexed:.2f}s, pairs {paired:.2f}s, {len(found)} pairs >= {threshold}")
+
+    # Recall against all pairs of a sample
+    sample = list(range(min(questions, 1500)))
+    exact = {(a, b) for a in sample for b in sample if a < b
+             and jaccard(index.shingle_sets[a], index.shingle_sets[b]) >= threshold}
+    hits = exact & {(a, b) for a, b, _ in found}
+    print(f"[INFO] Recall on the first {len(sample)} texts: {len(hits)}/{len(exact)} pairs "
+          f"(all-pairs check of the sample: {len(sample) * (len(sample) - 1) // 2:,} comparisons)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate questions with MinHash/LSH")
+    sub = parser.add_subparsers(dest='command')
+    find_parser = sub.add_parser('find', help="Report clusters of near-duplicate questions")
+    find_parser.add_argument('files', nargs='*', help="Question files (default: the question store)")
+    find_parser.add_argument('--langs', default=SOURCE_LANGUAGE, help="Comma-separated languages to compare (default de)")
+    find_parser.add_argument('--answers', action='store_true', help="Compare answer texts as well")
+    find_parser.add_argument('--include-exact', action='store_true',
+                             help="Also report texts copied unchanged into several places")
+    find_parser.add_argument('--limit', type=int, default=50, help="Clusters to print (0 = all)")
+    find_parser.add_argument('--out', help="Write the clusters as JSON")
+    bench_parser = sub.add_parser('bench', help="Time detection on a synthetic corpus")
+    bench_parser.add_argument('--questions', type=int, default=20000)
+    for p in (find_parser, bench_parser):
+        p.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                       help=f"Minimum shingle Jaccard similarity (default {DEFAULT_THRESHOLD})")
+        p.add_argument('--jobs', type=int, default=None, help="Worker processes for signatures")
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        bench(args.questions, args.threshold, args.jobs)
+        return
+    if args.command != 'find':
+        parser.print_help()
+        return
+
+    from question_store import STORE_FILE
+    paths = args.files or [STORE_FILE]
+    start = time.perf_counter()
+    found = find_duplicates(paths, args.threshold, args.langs.split(','), args.answers,
+                            args.include_exact, args.jobs)
+    seconds = time.perf_counter() - start
+    print_clusters(found, args.limit)
+    if args.out:
+        from json_io import atomic_write_json
+        atomic_write_json(found, args.out)
+        print(f"\n[OK] Clusters written to {args.out}")
+    print(f"\n[INFO] {len(found)} cluster(s) in {len(paths)} file(s) ({seconds * 1000:.0f} ms)")
+
+
+if __name__ == '__main__':
+    with run_metrics('near_duplicates'):
+        main()
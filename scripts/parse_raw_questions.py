@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Raw Catalogue Parser
+Parses the raw catalogue files (assets/data/raw_questions_*.txt) into the
+questions.json schema. Replaces tool_scripts/parse_questions.dart, which
+wrote the catalogue over the whole store (state questions included).
+
+Raw layout, one block per question:
+
+  1 – In Deutschland dürfen Menschen offen etwas gegen die Regierung
+  sagen, weil …                              <- wrapped German line
+  في ألمانيا مسموح للناس ...                  <- Arabic question
+  A: hier Religionsfreiheit gilt.
+  B: die Menschen Steuern zahlen.
+  C: die Menschen das Wahlrecht haben.
+  D: hier Meinungsfreiheit gilt.
+  يوجد حرية التعبير عن الرأي                  <- Arabic text of the answer above
+
+Lines are classified by script: a Latin line continues the German text it
+follows, an Arabic line holds the Arabic text of the question or answer. The
+correct answer is the one marked with ✓, otherwise the one followed by an
+Arabic line (the catalogue only translates the correct answer).
+
+Each file is parsed line by line in its own worker process; the results are
+merged by question number in file order, so the output does not depend on
+which worker finishes first. Translations in the existing output file are kept
+for every question and answer whose German text did not change.
+
+Usage:
+  python scripts/parse_raw_questions.py                     # parse and update questions.json
+  python scripts/parse_raw_questions.py --dry-run           # report what would change
+  python scripts/parse_raw_questions.py --out /tmp/q.json assets/data/raw_questions_4.txt
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from json_io import write_json_if_changed
+from metrics import in_worker, metrics, run_metrics, stage
+
+# Configuration
+DATA_DIR = 'assets/data'
+RAW_PATTERN = 'raw_questions_*.txt'
+OUTPUT_FILE = 'assets/data/questions.json'
+CATEGORY_ID = 'general'
+ANSWER_IDS = ['A', 'B', 'C', 'D']
+
+_QUESTION = re.compile(r'^(\d+)\s*[-–]\s*(.+)$')
+_ANSWER = re.compile(r'^([A-D]):\s*(.*)$')
+_ARABIC_LETTER = re.compile(r'[\u0600-\u06FF\u0750-\u077F]')
+_CHECK_MARK = '✓'
+
+
+def raw_files(data_dir: str = DATA_DIR) -> List[str]:
+    """Raw catalogue files in numeric order (raw_questions_2 before raw_questions_10)."""
+    def number(path: str) -> Tuple[int, str]:
+        digits = re.findall(r'\d+', os.path.basename(path))
+        return (int(digits[-1]) if digits else 0, path)
+    return sorted(glob.glob(os.path.join(data_dir, RAW_PATTERN)), key=number)
+
+
+def is_arabic(line: str) -> bool:
+    """
+    True for lines holding Arabic text: any Arabic letter (Arabic lines quote
+    German terms, German lines never contain Arabic), or no letters at all.
+    """
+    if _ARABIC_LETTER.search(line):
+        return True
+    return not any(char.isalpha() for char in line)
+
+
+def _join(current: str, line: str, separator: str = ' ') -> str:
+    return f"{current}{separator}{line}" if current else line
+
+
+def parse_lines(lines: Iterable[str], source: str = '') -> Iterator[Tuple[Dict[str, Any], List[str]]]:
+    """
+    Yield (question, warnings) for each question block in lines. Questions are
+    yielded as soon as the next block starts, so memory stays at one question.
+    """
+    question: Optional[Dict[str, Any]] = None
+    answer: Optional[Dict[str, Any]] = None
+    marked: Optional[str] = None
+    translated: List[str] = []
+    line_no = 0
+
+    def finish() -> Tuple[Dict[str, Any], List[str]]:
+        # Prefer the ✓ mark; otherwise the single answer the catalogue translated
+        if marked:
+            question['correct_answer'] = marked
+        elif len(translated) == 1:
+            question['correct_answer'] = translated[0]
+        warnings = []
+        ids = [a['id'] for a in question['answers']]
+        if ids != ANSWER_IDS:
+            warnings.append(f"answers {','.join(ids) or 'none'}")
+        if not question['question']['ar']:
+            warnings.append("no Arabic question")
+        if not question['correct_answer']:
+            warnings.append("no correct answer")
+        return question, [f"{source}:{question['_line']}: question {question['id']}: {w}" for w in warnings]
+
+    for line_no, raw_line in enumerate(lines, 1):
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        match = _QUESTION.match(line)
+        if match:
+            if question is not None:
+                yield finish()
+            question = {
+                'id': int(match.group(1)),
+                'category_id': CATEGORY_ID,
+                'question': {'de': match.group(2).strip(), 'ar': ''},
+                'answers': [],
+                'correct_answer': '',
+                '_line': line_no,
+            }
+            answer, marked, translated = None, None, []
+            continue
+        if question is None:
+            continue
+
+        match = _ANSWER.match(line)
+        if match:
+            text = match.group(2).strip()
+            if _CHECK_MARK in text:
+                text = text.replace(_CHECK_MARK, '').strip()
+                marked = match.group(1)
+            answer = {'id': match.group(1), 'text': {'de': text, 'ar': ''}}
+            question['answers'].append(answer)
+            continue
+
+        target = answer['text'] if answer is not None else question['question']
+        if not is_arabic(line):
+            # Wrapped German text; a late check mark still marks the answer
+            if _CHECK_MARK in line:
+                line = line.replace(_CHECK_MARK, '').strip()
+                if answer is not None:
+                    marked = answer['id']
+            target['de'] = _join(target['de'], line)
+        else:
+            if answer is not None and not target['ar']:
+                translated.append(answer['id'])
+            target['ar'] = _join(target['ar'], line, '\n')
+
+    if question is not None:
+        yield finish()
+
+
+def parse_file(path: str) -> Tuple[str, List[Dict[str, Any]], List[str], float]:
+    """Parse one raw file (process-pool worker). Returns (path, questions, warnings, seconds)."""
+    start = time.perf_counter()
+    questions, warnings = [], []
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        metrics().read(os.fstat(f.fileno()).st_size)
+        for question, problems in parse_lines(f, os.path.basename(path)):
+            questions.append(question)
+            warnings.extend(problems)
+    return path, questions, warnings, time.perf_counter() - start
+
+
+def merge(parsed: List[Tuple[str, List[Dict[str, Any]]]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Merge per-file results (in file order) by question number. A number seen
+    twice keeps its first occurrence and is reported.
+    """
+    merged: Dict[int, Dict[str, Any]] = {}
+    origin: Dict[int, str] = {}
+    warnings = []
+    for path, questions in parsed:
+        name = os.path.basename(path)
+        for question in questions:
+            line = question.pop('_line')
+            if question['id'] in merged:
+                warnings.append(f"{name}:{line}: question {question['id']}: duplicate, "
+                                f"already defined in {origin[question['id']]}")
+                continue
+            merged[question['id']] = question
+            origin[question['id']] = name
+    return [merged[question_id] for question_id in sorted(merged)], warnings
+
+
+def keep_translations(questions: List[Dict[str, Any]], existing: List[Dict[str, Any]]) -> int:
+    """
+    Copy the translations of existing questions into parsed ones where the
+    German text is unchanged. The parsed Arabic and correct answer win where
+    they are set. Returns the number of questions that kept translations.
+    """
+    by_id = {q.get('id'): q for q in existing if isinstance(q, dict)}
+    kept = 0
+    for question in questions:
+        old = by_id.get(question['id'])
+        if not old or _de(old.get('question')) != question['question']['de']:
+            continue
+        kept += 1
+        if not question['correct_answer'] and old.get('correct_answer'):
+            question['correct_answer'] = old['correct_answer']
+        question['question'] = _carry(old['question'], question['question'])
+        old_answers = {a.get('id'): a for a in old.get('answers', [])}
+        for answer in question['answers']:
+            old_answer = old_answers.get(answer['id'])
+            if old_answer and _de(old_answer.get('text')) == answer['text']['de']:
+                answer['text'] = _carry(old_answer['text'], answer['text'])
+    return kept
+
+
+def keep_fields(questions: List[Dict[str, Any]], existing: List[Dict[str, Any]]) -> None:
+    """Fields the catalogue does not have (such as topic) stay on the parsed questions."""
+    by_id = {q.get('id'): q for q in existing if isinstance(q, dict)}
+    for question in questions:
+        for key, value in by_id.get(question['id'], {}).items():
+            question.setdefault(key, value)
+
+
+def _de(text: Any) -> str:
+    """German text without check marks (older files keep ✓ in the answer text)."""
+    if not isinstance(text, dict):
+        return ''
+    return text.get('de', '').replace(_CHECK_MARK, '').strip()
+
+
+def _carry(old: Dict[str, str], new: Dict[str, str]) -> Dict[str, str]:
+    result = {lang: value for lang, value in old.items() if lang != 'de'}
+    result['de'] = new['de']
+    if new.get('ar'):
+        result['ar'] = new['ar']
+    result.setdefault('ar', '')
+    # German first, then the existing language order
+    return {'de': result.pop('de'), **result}
+
+
+def print_changes(questions: List[Dict[str, Any]], existing: List[Dict[str, Any]]) -> None:
+    """Summarize added, removed and changed questions against the existing file."""
+    old = {q.get('id'): q for q in existing if isinstance(q, dict)}
+    new = {q['id']: q for q in questions}
+    added = sorted(set(new) - set(old))
+    removed = sorted(set(old) - set(new))
+    changed = sorted(i for i in set(new) & set(old) if new[i] != old[i])
+    print(f"[INFO] {len(added)} added, {len(removed)} removed, {len(changed)} changed question(s)")
+    for label, ids in (('added', added), ('removed', removed), ('changed', changed)):
+        if ids:
+            shown = ', '.join(str(i) for i in ids[:20])
+            print(f"   - {label}: {shown}{' ...' if len(ids) > 20 else ''}")
+
+
+def run(paths: List[str], out: str, jobs: Optional[int] = None, dry_run: bool = False,
+        keep: bool = True) -> List[Dict[str, Any]]:
+    """Parse paths in parallel, merge, and write out (unless dry_run). Returns the questions."""
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(paths)))
+    start = time.perf_counter()
+    with stage('parse'):
+        if jobs == 1:
+            results = [parse_file(path) for path in paths]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                results = []
+                for result, snapshot in pool.map(in_worker, [parse_file] * len(paths), paths):
+                    metrics().merge(snapshot)
+                    results.append(result)
+
+    warnings = []
+    for path, questions, problems, seconds in results:
+        print(f"   {os.path.basename(path):<24} {len(questions):>4} questions ({seconds * 1000:.0f} ms)")
+        warnings.extend(problems)
+    questions, duplicates = merge([(path, questions) for path, questions, _, _ in results])
+    warnings.extend(duplicates)
+    for warning in warnings:
+        print(f"[WARN] {warning}")
+
+    existing = []
+    if os.path.exists(out):
+        with stage('load'):
+            with open(out, 'r', encoding='utf-8') as f:
+                metrics().read(os.fstat(f.fileno()).st_size)
+                existing = json.load(f)
+    # Questions that are not from the catalogue stay as they are: state questions
+    # and general questions numbered after the catalogue (see question_store.py)
+    parsed_ids = {question['id'] for question in questions}
+    last = max(parsed_ids, default=0)
+    extra = [q for q in existing if isinstance(q, dict) and q.get('id') not in parsed_ids
+             and (q.get('category_id') != CATEGORY_ID or q.get('id', 0) > last)]
+    keep_fields(questions, existing)
+    if extra:
+        questions = sorted(questions + extra, key=lambda q: q['id'])
+        print(f"[INFO] Kept {len(extra)} non-catalogue question(s) from {out}")
+    if keep and existing:
+        print(f"[INFO] Kept existing translations for {keep_translations(questions, existing)} question(s)")
+    print_changes(questions, existing)
+
+    seconds = time.perf_counter() - start
+    if dry_run:
+        print(f"[DRY RUN] {len(questions)} questions parsed in {seconds:.2f}s, nothing written")
+    else:
+        with stage('save'):
+            written = write_json_if_changed(questions, out)
+        if written:
+            print(f"[OK] Saved {len(questions)} questions to {out} ({seconds:.2f}s)")
+        else:
+            print(f"[OK] {out} is up to date ({len(questions)} questions, {seconds:.2f}s)")
+    metrics().count('questions_parsed', len(questions))
+    metrics().count('parse_warnings', len(warnings))
+    return questions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse the raw catalogue files into questions.json")
+    parser.add_argument('files', nargs='*', help=f"Raw files (default: {DATA_DIR}/{RAW_PATTERN})")
+    parser.add_argument('--out', default=OUTPUT_FILE, help=f"Output file (default: {OUTPUT_FILE})")
+    parser.add_argument('--jobs', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--dry-run', action='store_true', help="Parse and compare, but write nothing")
+    parser.add_argument('--no-keep', action='store_true',
+                        help="Do not copy translations from the existing output file")
+    args = parser.parse_args()
+
+    paths = args.files or raw_files()
+    if not paths:
+        print(f"[ERROR] No raw files found in {DATA_DIR}")
+        sys.exit(1)
+    run(paths, args.out, args.jobs, args.dry_run, keep=not args.no_keep)
+
+
+if __name__ == '__main__':
+    with run_metrics('parse_raw_questions'):
+        main()
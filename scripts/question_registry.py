@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Question ID Registry
+Index of every question ID in the asset files: id -> the files it appears in,
+with category, state and a hash of the German question text.
+
+The same question legitimately appears in several files (questions.json, the
+category files, questions_general.json, the state files), so an ID is only a
+conflict when two files use it for different German questions.
+
+The index is persisted in .cache/question_registry.json together with each
+file's (mtime, size). Loading it only re-reads files whose signature changed;
+generators call update_file() after writing a file, so the tree is never
+rescanned as a whole. Lookups and allocation checks are dict lookups.
+
+Usage:
+  python scripts/question_registry.py build       # refresh the index, report re-read files
+  python scripts/question_registry.py check       # list conflicting IDs (exit 1 if any)
+  python scripts/question_registry.py show <ID>   # where an ID is used
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from corpus import question_files, signature
+from json_io import atomic_write_text
+from translation_memory import text_hash
+
+# Configuration
+REGISTRY_FILE = '.cache/question_registry.json'
+DATA_DIR = 'assets/data'
+SOURCE_LANGUAGE = 'de'
+
+# Per file and id: (category, state code, hash of the German question)
+Entry = Tuple[Optional[str], Optional[str], str]
+
+
+def question_entry(question: Dict[str, Any]) -> Entry:
+    text = question.get('question', {}).get(SOURCE_LANGUAGE, '') if isinstance(question.get('question'), dict) else ''
+    return question.get('category_id'), question.get('state_code'), text_hash(text.strip())[:16]
+
+
+class QuestionRegistry:
+    """Persisted id -> {file: entry} index over the question files."""
+
+    def __init__(self, path: str = REGISTRY_FILE, data_dir: str = DATA_DIR) -> None:
+        self.path = path
+        self.data_dir = data_dir
+        self.reread: List[str] = []
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._index: Dict[int, Dict[str, Entry]] = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: str = REGISTRY_FILE, data_dir: str = DATA_DIR) -> 'QuestionRegistry':
+        """Load the persisted index and re-read only the files that changed since."""
+        registry = cls(path, data_dir)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                registry._files = json.load(f).get('files', {})
+            for file_path, record in registry._files.items():
+                for question_id, category, state, text in record['questions']:
+                    registry._index.setdefault(question_id, {})[file_path] = (category, state, text)
+        registry.refresh()
+        return registry
+
+    def refresh(self) -> None:
+        """Bring the index up to date with files added, changed or removed on disk."""
+        current = set(question_files(self.data_dir))
+        for file_path in [p for p in self._files if p not in current]:
+            self._drop_file(file_path)
+        for file_path in sorted(current):
+            record = self._files.get(file_path)
+            if record is None or record['signature'] != signature(file_path):
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    questions = json.load(f)
+                self.update_file(file_path, questions)
+                self.reread.append(file_path)
+
+    def _drop_file(self, file_path: str) -> None:
+        record = self._files.pop(file_path, None)
+        if record is None:
+            return
+        for question_id, *_ in record['questions']:
+            owners = self._index.get(question_id, {})
+            owners.pop(file_path, None)
+            if not owners:
+                self._index.pop(question_id, None)
+        self._dirty = True
+
+    def update_file(self, file_path: str, questions: List[Dict[str, Any]]) -> None:
+        """Replace the entries of one file (call after writing it)."""
+        self._drop_file(file_path)
+        rows = []
+        for question in questions if isinstance(questions, list) else []:
+            if isinstance(question, dict) and isinstance(question.get('id'), int):
+                entry = question_entry(question)
+                rows.append([question['id'], *entry])
+                self._index.setdefault(question['id'], {})[file_path] = entry
+        self._files[file_path] = {
+            'signature': signature(file_path) if os.path.exists(file_path) else [0, 0],
+            'questions': rows,
+        }
+        self._dirty = True
+
+    def __contains__(self, question_id: Any) -> bool:
+        return question_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def owners(self, question_id: int) -> Dict[str, Entry]:
+        """Files using question_id -> (category, state, text hash)."""
+        return dict(self._index.get(question_id, {}))
+
+    def reserve(self, question_id: int, file_path: str, question: Dict[str, Any]) -> None:
+        """Claim an ID for a question that is about to be written to file_path."""
+        self._index.setdefault(question_id, {})[file_path] = question_entry(question)
+
+    def allocate(self, first: int, step: int = 1) -> int:
+        """First free ID of first, first + step, first + 2 * step, ..."""
+        question_id = first
+        while question_id in self._index:
+            question_id += step
+        return question_id
+
+    def is_same_question(self, question_id: int, question: Dict[str, Any]) -> bool:
+        """True if question_id is free or only used for this German question."""
+        text = question_entry(question)[2]
+        return all(entry[2] == text for entry in self._index.get(question_id, {}).values())
+
+    def conflicts(self) -> Dict[int, Dict[str, Entry]]:
+        """IDs used for more than one German question."""
+        return {question_id: dict(owners) for question_id, owners in self._index.items()
+                if len({entry[2] for entry in owners.values()}) > 1}
+
+    def save(self) -> None:
+        """Persist the index if it changed."""
+        if not self._dirty:
+            return
+        atomic_write_text(json.dumps({'files': self._files}, ensure_ascii=False,
+                                     separators=(',', ':')), self.path)
+        self._dirty = False
+
+
+def describe(owners: Dict[str, Entry]) -> Iterable[str]:
+    for file_path, (category, state, text) in sorted(owners.items()):
+        yield f"{os.path.relpath(file_path, DATA_DIR)} (category {category}, state {state or '-'}, text {text})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Question ID registry")
+    sub = parser.add_subparsers(dest='command')
+    sub.add_parser('build', help="Refresh the persisted index")
+    sub.add_parser('check', help="List IDs used for different questions")
+    show_parser = sub.add_parser('show', help="Show where an ID is used")
+    show_parser.add_argument('id', type=int)
+    args = parser.parse_args()
+
+    if args.command is None:
+        parser.print_help()
+        return
+
+    registry = QuestionRegistry.load()
+    registry.save()
+
+    if args.command == 'build':
+        print(f"[INFO] {len(registry)} question IDs in {len(question_files())} files "
+              f"({len(registry.reread)} file(s) re-read)")
+        for file_path in registry.reread:
+            print(f"   - {os.path.relpath(file_path, DATA_DIR)}")
+    elif args.command == 'check':
+        conflicts = registry.conflicts()
+        for question_id, owners in sorted(conflicts.items()):
+            print(f"[CONFLICT] id {question_id}:")
+            for line in describe(owners):
+                print(f"   - {line}")
+        print(f"[{'ERROR' if conflicts else 'OK'}] {len(conflicts)} conflicting ID(s)")
+        sys.exit(1 if conflicts else 0)
+    elif args.command == 'show':
+        owners = registry.owners(args.id)
+        if not owners:
+            print(f"[INFO] id {args.id} is free")
+        for line in describe(owners):
+            print(f"   - {line}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Question Store
+assets/data/questions.json is the single source of every question. The files
+the app loads are generated from it by id selection:
+
+  questions_general.json, questions_<category>.json, states/<state>.json
+
+assets/data/question_layout.json lists, per output file, the ids it holds in
+order ("1-300", "20430-20439", "301, 246, 99"). One streaming pass over the
+store routes each question to every output that selects it, so a question that
+appears in several files (a category file and the general file, two state
+files) is stored once and the copies cannot drift. The outputs are written
+while the store is read; only questions that arrive before their turn in an
+output are held in memory. Outputs whose content is unchanged are not
+rewritten.
+
+Only the generated files are bundled (see the asset list in pubspec.yaml); the
+store, the layout, the backup and the raw catalogue stay out of the app. Every
+build ends with a size report: output bytes before and after, bundled bytes,
+and the bytes under assets/data that the bundle leaves out.
+
+Scripts that edit a generated file (state questions, Arabic refinement) hand
+the edited questions back with write_back(), which updates the store and the
+layout and rebuilds the outputs.
+
+Usage:
+  python scripts/question_store.py build            # generate the outputs, print the size report
+  python scripts/question_store.py build --check    # exit 1 if an output is out of date, write nothing
+  python scripts/question_store.py adopt            # one-off: fold the existing outputs into the store
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from corpus import load_questions, save_questions
+from json_io import JsonArrayWriter, iter_json_array, write_json_if_changed
+from metrics import metrics, run_metrics, stage
+from near_duplicates import normalize
+
+# Configuration
+DATA_DIR = 'assets/data'
+STORE_FILE = 'assets/data/questions.json'
+LAYOUT_FILE = 'assets/data/question_layout.json'
+PUBSPEC_FILE = 'pubspec.yaml'
+GENERAL_OUTPUT = 'questions_general.json'
+CATEGORY_OUTPUTS = ['questions_rights.json', 'questions_system.json', 'questions_europe.json',
+                    'questions_history.json', 'questions_society.json', 'questions_welfare.json']
+STATES_OUTPUT_DIR = 'states'
+SOURCE_LANGUAGE = 'de'
+CHECK_MARK = '✓'
+
+# Output file (relative to the data directory) -> selected ids, in output order
+Layout = Dict[str, List[int]]
+
+
+def parse_ids(spec: str) -> List[int]:
+    """'1-3, 7' -> [1, 2, 3, 7]"""
+    ids: List[int] = []
+    for part in spec.split(','):
+        part = part.strip()
+        if part:
+            first, _, last = part.partition('-')
+            ids.extend(range(int(first), int(last or first) + 1))
+    return ids
+
+
+def format_ids(ids: List[int]) -> str:
+    """[1, 2, 3, 7] -> '1-3, 7' (runs of consecutive ids become ranges)."""
+    parts = []
+    start = 0
+    for i in range(1, len(ids) + 1):
+        if i == len(ids) or ids[i] != ids[i - 1] + 1:
+            parts.append(str(ids[start]) if i - start == 1 else f"{ids[start]}-{ids[i - 1]}")
+            start = i
+    return ', '.join(parts)
+
+
+def load_layout(layout_file: str = LAYOUT_FILE) -> Layout:
+    with open(layout_file, 'r', encoding='utf-8') as f:
+        return {output: parse_ids(spec) for output, spec in json.load(f).items()}
+
+
+def save_layout(layout: Layout, layout_file: str = LAYOUT_FILE) -> bool:
+    return write_json_if_changed({output: format_ids(ids) for output, ids in layout.items()}, layout_file)
+
+
+def output_key(path: str, data_dir: str = DATA_DIR) -> str:
+    """Layout key of an output path: the path relative to the data directory."""
+    return os.path.relpath(path, data_dir).replace(os.sep, '/')
+
+
+def select(store_file: str, layout: Layout) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Route the store's questions to the outputs that select them, in one pass:
+    yields (output, question) in each output's layout order. A question read
+    before its turn (the store is in id order, a layout need not be) is held
+    until the questions ahead of it in that output have been yielded.
+    Raises ValueError for duplicate store ids and for selected ids the store lacks.
+    """
+    slots: Dict[int, List[Tuple[str, int]]] = {}
+    for output, ids in layout.items():
+        for position, question_id in enumerate(ids):
+            slots.setdefault(question_id, []).append((output, position))
+    next_position = {output: 0 for output in layout}
+    held: Dict[str, Dict[int, Dict[str, Any]]] = {output: {} for output in layout}
+    seen = set()
+    for question in iter_json_array(store_file):
+        question_id = question.get('id')
+        if question_id in seen:
+            raise ValueError(f"Question ID {question_id} appears more than once in {store_file}")
+        seen.add(question_id)
+        for output, position in slots.get(question_id, ()):
+            held[output][position] = question
+            while next_position[output] in held[output]:
+                yield output, held[output].pop(next_position[output])
+                next_position[output] += 1
+    missing = sorted(set(slots) - seen)
+    if missing:
+        raise ValueError(f"Selected IDs missing from {store_file}: {format_ids(missing)}")
+
+
+def build(store_file: str = STORE_FILE, layout_file: str = LAYOUT_FILE, data_dir: str = DATA_DIR,
+          check: bool = False) -> Dict[str, Tuple[int, bool]]:
+    """
+    Generate every output of the layout. Returns {path: (question count, written)};
+    with check=True nothing is written and the flag means 'out of date'.
+    An error while reading the store leaves every output untouched.
+    """
+    layout = load_layout(layout_file)
+    writers = {output: JsonArrayWriter(os.path.join(data_dir, output), dry_run=check) for output in layout}
+    try:
+        with stage('select'):
+            for output, question in select(store_file, layout):
+                writers[output].write(question)
+    except BaseException:
+        for writer in writers.values():
+            writer.abort()
+        raise
+    with stage('save'):
+        written = {writer.file_path: writer.close() for writer in writers.values()}
+    metrics().count('outputs_written', sum(written.values()))
+    return {writer.file_path: (writer.count, written[writer.file_path]) for writer in writers.values()}
+
+
+def write_back(edited: Dict[str, List[Dict[str, Any]]], store_file: str = STORE_FILE,
+               layout_file: str = LAYOUT_FILE, data_dir: str = DATA_DIR) -> Dict[str, Tuple[int, bool]]:
+    """
+    Store the questions of edited output files ({path: questions}): they replace
+    the store's questions with the same IDs (new IDs are added), each output
+    selects exactly its questions, and all outputs are rebuilt, so every other
+    file selecting an edited question changes with it.
+
+    An output may only replace a stored question it already selects, or a copy
+    of it (same state and German question). Raises ValueError, and writes
+    nothing, for a question that would replace another output's question.
+    """
+    store = load_questions(store_file) if os.path.exists(store_file) else []
+    by_id = {question.get('id'): question for question in store}
+    layout = load_layout(layout_file) if os.path.exists(layout_file) else {}
+    conflicts = []
+    for path, questions in edited.items():
+        own = set(layout.get(output_key(path, data_dir), ()))
+        for question in questions:
+            stored = by_id.get(question['id'])
+            if (stored is not None and question['id'] not in own
+                    and _question_key(stored) != _question_key(question)):
+                owners = [output for output, ids in layout.items() if question['id'] in ids]
+                text = stored.get('question', {})
+                conflicts.append(f"{path} #{question['id']} would replace the question of "
+                                 f"{', '.join(owners) or store_file}: "
+                                 f"{text.get(SOURCE_LANGUAGE, '')[:60] if isinstance(text, dict) else ''}")
+    if conflicts:
+        raise ValueError("Question IDs already used for other questions:\n  - " + '\n  - '.join(conflicts))
+    for questions in edited.values():
+        by_id.update((question['id'], question) for question in questions)
+    for path, questions in edited.items():
+        layout[output_key(path, data_dir)] = [question['id'] for question in questions]
+    save_questions(sorted(by_id.values(), key=lambda q: q['id']), store_file)
+    save_layout(layout, layout_file)
+    return build(store_file, layout_file, data_dir)
+
+
+def bundled_files(pubspec: str = PUBSPEC_FILE) -> List[str]:
+    """
+    Files Flutter bundles for the asset entries of pubspec.yaml. A directory
+    entry bundles the files directly in it, not its subdirectories.
+    """
+    entries = []
+    in_assets = False
+    with open(pubspec, 'r', encoding='utf-8') as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped == 'assets:':
+                in_assets = True
+            elif in_assets and stripped.startswith('- '):
+                entries.append(stripped[2:].strip())
+            elif in_assets and stripped and not stripped.startswith('#'):
+                in_assets = False
+    root = os.path.dirname(pubspec)
+    files = set()
+    for entry in entries:
+        path = os.path.join(root, entry)
+        if entry.endswith('/'):
+            files.update(p for p in glob.glob(os.path.join(path, '*')) if os.path.isfile(p))
+        elif os.path.isfile(path):
+            files.add(path)
+    return sorted(os.path.normpath(p) for p in files)
+
+
+def output_sizes(paths: List[str]) -> Dict[str, int]:
+    return {path: os.path.getsize(path) if os.path.exists(path) else 0 for path in paths}
+
+
+def print_size_report(before: Dict[str, int], data_dir: str = DATA_DIR,
+                      pubspec: str = PUBSPEC_FILE) -> None:
+    """Output bytes before/after this run, and what the app bundle holds of data_dir."""
+    after = output_sizes(list(before))
+    old, new = sum(before.values()), sum(after.values())
+    print(f"\n[SIZE] Outputs: {len(after)} files, {new:,} bytes (before: {old:,}, {new - old:+,})")
+    if not os.path.exists(pubspec):
+        return
+    bundled = set(bundled_files(pubspec))
+    data_files = sorted(os.path.normpath(os.path.join(directory, name))
+                        for directory, _, names in os.walk(data_dir)
+                        for name in names if not name.startswith('.'))
+    inside = [path for path in data_files if path in bundled]
+    outside = [path for path in data_files if path not in bundled]
+    print(f"[SIZE] Bundled from {data_dir}: {len(inside)} files, "
+          f"{sum(os.path.getsize(p) for p in inside):,} bytes")
+    print(f"[SIZE] Left out of the bundle: {len(outside)} files, "
+          f"{sum(os.path.getsize(p) for p in outside):,} bytes")
+    for path in sorted(outside, key=os.path.getsize, reverse=True):
+        print(f"   - {output_key(path, data_dir)}: {os.path.getsize(path):,}")
+
+
+def _answers_de(question: Dict[str, Any]) -> List[str]:
+    return [answer.get('text', {}).get(SOURCE_LANGUAGE, '') for answer in question.get('answers', [])]
+
+
+def _question_key(question: Dict[str, Any]) -> Tuple[str, str]:
+    text = question.get('question', {})
+    return question.get('state_code') or '', normalize(text.get(SOURCE_LANGUAGE, '') if isinstance(text, dict) else '')
+
+
+def _content_key(question: Dict[str, Any]) -> Tuple[Any, ...]:
+    """State, German question and German answers (in any order), normalized."""
+    return _question_key(question) + tuple(sorted(normalize(text) for text in _answers_de(question)))
+
+
+def _correct_answer_of(own: Dict[str, Any], copy: Dict[str, Any]) -> Optional[str]:
+    """ID of the stored answer with the German text of the copy's correct answer."""
+    texts = {answer.get('id'): normalize(text) for answer, text in zip(copy.get('answers', []), _answers_de(copy))}
+    wanted = texts.get(copy.get('correct_answer'))
+    matches = [answer.get('id') for answer, text in zip(own.get('answers', []), _answers_de(own))
+               if wanted and normalize(text) == wanted]
+    return matches[0] if len(matches) == 1 else None
+
+
+def strip_check_marks(question: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The question without ✓ marks in its answer texts: older files marked the
+    correct answer that way (as the raw catalogue does, see parse_raw_questions),
+    which gives it away in the app. A missing correct_answer is taken from the
+    single marked answer.
+    """
+    marked, answers = [], []
+    for answer in question.get('answers', []):
+        text = answer.get('text')
+        if isinstance(text, dict) and any(isinstance(value, str) and CHECK_MARK in value
+                                          for value in text.values()):
+            marked.append(answer.get('id'))
+            answer = dict(answer, text={lang: value.replace(CHECK_MARK, '').strip() if isinstance(value, str)
+                                        else value for lang, value in text.items()})
+        answers.append(answer)
+    if not marked:
+        return question
+    question = dict(question, answers=answers)
+    if not question.get('correct_answer') and len(marked) == 1:
+        question['correct_answer'] = marked[0]
+    return question
+
+
+def _merge_copy(own: Dict[str, Any], copy: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """
+    Fill fields the stored question lacks from a copy of it. A missing correct
+    answer is taken over by its German text, as the copy may order the answers
+    differently. Returns (filled, drifted) field names; drifted fields keep the
+    stored value.
+    """
+    filled, drifted = [], []
+    for key, value in copy.items():
+        if key == 'id' or own.get(key) == value:
+            continue
+        if key == 'correct_answer' and not own.get(key):
+            value = _correct_answer_of(own, copy)
+        if own.get(key) in (None, '') and value not in (None, ''):
+            own[key] = value
+            filled.append(key)
+        else:
+            drifted.append(key)
+    return filled, drifted
+
+
+def adopt(store_file: str = STORE_FILE, layout_file: str = LAYOUT_FILE,
+          data_dir: str = DATA_DIR) -> Dict[str, List[Any]]:
+    """
+    One-off migration from hand-maintained copies to the store. The existing
+    outputs are read in order (general file, state files, category files, then
+    the store itself) and every question is claimed once:
+
+    - same ID and same German question (by state) as a claimed question: the
+      same question; empty fields are filled from the copy, differing fields
+      are reported as drift and the first copy wins
+    - same German question and answers under another ID: the copy selects the
+      claimed ID
+    - an ID already claimed for another question: the question gets the next
+      free ID
+
+    ✓ marks are stripped from every copy first (see strip_check_marks), so a
+    marked copy neither drifts from a clean one nor ships the mark.
+
+    Writes the store (sorted by ID) and the layout that regenerates the outputs.
+    Returns the decisions: matched, drifted, filled, renumbered, unselected.
+    """
+    states = sorted(output_key(path, data_dir)
+                    for path in glob.glob(os.path.join(data_dir, STATES_OUTPUT_DIR, '*.json')))
+    outputs = [output for output in [GENERAL_OUTPUT] + states + CATEGORY_OUTPUTS
+               if os.path.exists(os.path.join(data_dir, output))]
+    sources = [(output, load_questions(os.path.join(data_dir, output))) for output in outputs]
+    sources.append((None, load_questions(store_file)))
+    taken = {question.get('id') for _, questions in sources for question in questions}
+
+    claimed: Dict[int, Dict[str, Any]] = {}
+    by_content: Dict[Tuple[Any, ...], int] = {}
+    layout: Layout = {}
+    report: Dict[str, List[Any]] = {'matched': [], 'drifted': [], 'filled': [], 'renumbered': [],
+                                    'unselected': []}
+
+    def free_id(first: int) -> int:
+        while first in taken:
+            first += 1
+        taken.add(first)
+        return first
+
+    for output, questions in sources:
+        selected = []
+        for question in questions:
+            question = strip_check_marks(dict(question))
+            question_id, key = question['id'], _content_key(question)
+            own = claimed.get(question_id)
+            if own is None or _question_key(own) != _question_key(question):
+                if key in by_content:
+                    question_id = by_content[key]
+                    own = claimed[question_id]
+                    report['matched'].append((output, question['id'], question_id))
+                elif own is not None:
+                    first = max(q['id'] for q in questions) + 1
+                    question_id = question['id'] = free_id(first)
+                    report['renumbered'].append((output or 'store', own['id'], question_id))
+                    own = None
+            if own is None:
+                claimed[question_id] = question
+                by_content.setdefault(key, question_id)
+                if output is None:
+                    report['unselected'].append(question_id)
+            else:
+                filled, drifted = _merge_copy(own, question)
+                if filled:
+                    report['filled'].append((output or 'store', question_id, filled))
+                if drifted:
+                    report['drifted'].append((output or 'store', question['id'], question_id, drifted))
+            selected.append(question_id)
+        if output is not None:
+            layout[output] = selected
+
+    # General file, categories, then states: the order the app loads them in
+    order = [GENERAL_OUTPUT] + CATEGORY_OUTPUTS + states
+    save_questions(sorted(claimed.values(), key=lambda q: q['id']), store_file)
+    save_layout({output: layout[output] for output in order if output in layout}, layout_file)
+    return report
+
+
+def print_adopt_report(report: Dict[str, List[Any]]) -> None:
+    print(f"[INFO] {len(report['matched'])} copies matched to a stored question by German text")
+    for output, old, new in report['matched']:
+        print(f"   - {output} #{old} -> #{new}")
+    print(f"[INFO] {len(report['filled'])} stored questions completed from a copy")
+    for output, question_id, fields in report['filled']:
+        print(f"   - #{question_id}: {', '.join(fields)} from {output}")
+    print(f"[WARNING] {len(report['drifted'])} copies differ from the stored question (stored version kept)")
+    for output, old, new, fields in report['drifted']:
+        print(f"   - {output} #{old} (stored #{new}): {', '.join(fields)}")
+    print(f"[INFO] {len(report['renumbered'])} questions renumbered (ID used for another question)")
+    for output, old, new in report['renumbered']:
+        print(f"   - {output} #{old} -> #{new}")
+    if report['unselected']:
+        print(f"[INFO] Stored but selected by no output: {format_ids(sorted(report['unselected']))}")
+
+
+def print_build_report(results: Dict[str, Tuple[int, bool]], check: bool) -> None:
+    for path, (count, flag) in results.items():
+        status = ('STALE' if flag else 'OK') if check else ('OK' if flag else 'SKIP')
+        print(f"  [{status}] {count:>4} questions -> {path}")
+    flagged = sum(flag for _, flag in results.values())
+    print(f"\n[SUMMARY]")
+    print(f"  - Outputs: {len(results)}")
+    print(f"  - {'Out of date' if check else 'Files written'}: {flagged}")
+    if not check:
+        print(f"  - Files skipped (unchanged): {len(results) - flagged}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate the question files from the question store")
+    sub = parser.add_subparsers(dest='command', required=True)
+    build_parser = sub.add_parser('build', help="Generate the outputs of the layout")
+    build_parser.add_argument('--check', action='store_true', help="Report out-of-date outputs, write nothing")
+    sub.add_parser('adopt', help="Fold the existing output files into the store and write the layout")
+    args = parser.parse_args(argv)
+
+    if args.command == 'adopt':
+        with stage('adopt'):
+            report = adopt()
+        print_adopt_report(report)
+        print(f"[OK] Wrote {STORE_FILE} and {LAYOUT_FILE}")
+
+    check = args.command == 'build' and args.check
+    before = output_sizes([os.path.join(DATA_DIR, output) for output in load_layout()])
+    print(f"[INFO] Generating question files from {STORE_FILE} ({LAYOUT_FILE})...")
+    try:
+        results = build(check=check)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    print_build_report(results, check)
+    print_size_report(before)
+    if check and any(flag for _, flag in results.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    with run_metrics('question_store'):
+        main()
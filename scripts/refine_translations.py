@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Translation Refinement Runner
+Applies per-language terminology and phrasing rules to every translated text in
+the asset files, using the German text next to it as context.
+
+Rule sets are data files, one per language: scripts/refinement_rules/<lang>.json
+  terminology:    {"Bundestag": "...", ...}     case-insensitive whole words
+  phrases:        [["old", "new"], ...]        literal replacements, in order
+  context_rules:  [{"keywords": [...], "rules": [["regex", "replacement"], ...],
+                    "if_contains": "...", "unless_contains": "..."}, ...]
+                  applied when a keyword occurs in the lower-cased German text
+  question_mark:  appended to question texts that lost their question mark
+                  (question fields only, not answers or glossary examples)
+
+Files are processed in parallel across CPU cores (one process per file) and only
+rewritten when a string changed. By default the question store (questions.json)
+and the glossary are refined, then the generated question files are rebuilt from
+the store. A generated file given on the command line is written back to the
+store (question_store.write_back), never edited in place, so the next build keeps
+the refined texts. Results are memoized per rule-set version in
+.cache/refinement_memo/, keyed by (text, German context, question field), so reruns skip strings
+that were already refined with the same rules.
+
+--dry-run writes nothing and prints, per rule, a compact diff of every string the
+rule changed.
+
+Usage:
+  python scripts/refine_translations.py                     # all assets, all rule sets
+  python scripts/refine_translations.py --lang ar assets/data/questions_system.json
+  python scripts/refine_translations.py --jobs 4
+  python scripts/refine_translations.py --dry-run [--no-cache]
+  python scripts/refine_translations.py --verify [--synthetic 3000]
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from build_asset_shards import is_text_dict
+from json_io import atomic_write_json, atomic_write_text
+from metrics import in_worker, metrics, run_metrics, stage
+from question_store import LAYOUT_FILE, STORE_FILE, build, load_layout, output_key, write_back
+from rule_engine import RuleSet, literal_rules, word_rules
+from translation_memory import text_hash
+
+# Configuration
+RULES_DIR = 'scripts/refinement_rules'
+DATA_DIR = 'assets/data'
+ASSET_PATTERNS = ['questions*.json', 'states/*.json', 'glossary.json']
+EXCLUDED_FILES = {'questions_backup.json'}
+BASE_LANGUAGE = 'de'
+MEMO_DIR = '.cache/refinement_memo'
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+class LanguageRules:
+    """Compiled refinement rules for one target language."""
+
+    def __init__(self, lang: str, data: Dict[str, Any]) -> None:
+        self.lang = lang
+        self.question_mark = data.get('question_mark', '?')
+        self.version = hashlib.sha256(
+            json.dumps(data, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+        terminology = data.get('terminology', {})
+        phrases = [tuple(pair) for pair in data.get('phrases', [])]
+        self.terminology_rules = RuleSet(word_rules(terminology))
+        self.phrase_rules = RuleSet(word_rules(terminology) + literal_rules(phrases))
+        self.context_rules = [
+            (tuple(group['keywords']), group.get('if_contains'), group.get('unless_contains'),
+             [(re.compile(pattern), replacement) for pattern, replacement in group['rules']])
+            for group in data.get('context_rules', [])
+        ]
+
+    @classmethod
+    def load(cls, lang: str, rules_dir: str = RULES_DIR) -> 'LanguageRules':
+        with open(os.path.join(rules_dir, f"{lang}.json"), 'r', encoding='utf-8') as f:
+            return cls(lang, json.load(f))
+
+    def _context_groups(self, text: str, context_lower: str):
+        """Context rule groups that apply to text, checked just before each group runs."""
+        for keywords, if_contains, unless_contains, rules in self.context_rules:
+            if not any(word in context_lower for word in keywords):
+                continue
+            if if_contains and if_contains not in text:
+                continue
+            if unless_contains and unless_contains in text:
+                continue
+            yield keywords, rules
+
+    def _finish(self, text: str, original_text: str, context_de: str, trace=None,
+                question: bool = True) -> str:
+        """Whitespace cleanup and, for question texts, question mark restoration."""
+        cleaned = _WHITESPACE.sub(' ', text).strip()
+        if trace is not None and cleaned != text:
+            trace.append(('whitespace cleanup', text, cleaned))
+        text = cleaned
+        if question and text and not text.endswith(('.', self.question_mark, '!', '…')):
+            if self.question_mark in original_text or '?' in context_de:
+                if trace is not None:
+                    trace.append(('question mark', text, text.rstrip('.') + self.question_mark))
+                text = text.rstrip('.') + self.question_mark
+        return text
+
+    def refine(self, text: str, context_de: str = '',
+               trace: Optional[List[Tuple[str, str, str]]] = None, question: bool = True) -> str:
+        """
+        Refine one translated string given its German source text. question
+        is False for texts that are not a question (answers, glossary texts):
+        they never get a question mark appended.
+        If trace is given, (rule label, before, after) is appended for every
+        rule that changed the text.
+        """
+        original_text = text
+        text = self.phrase_rules.apply(text, trace)
+        context_lower = context_de.lower()
+        for keywords, rules in self._context_groups(text, context_lower):
+            for pattern, replacement in rules:
+                changed = pattern.sub(replacement, text)
+                if trace is not None and changed != text:
+                    trace.append((f"context {keywords[0]} {pattern.pattern!r} -> {replacement!r}", text, changed))
+                text = changed
+        return self._finish(text, original_text, context_de, trace, question)
+
+    def refine_sequential(self, text: str, context_de: str = '', question: bool = True) -> str:
+        """Reference version of refine(): one scan per rule."""
+        original_text = text
+        text = self.phrase_rules.apply_sequential(text)
+        context_lower = context_de.lower()
+        for _, rules in self._context_groups(text, context_lower):
+            for pattern, replacement in rules:
+                text = re.sub(pattern.pattern, replacement, text)
+        return self._finish(text, original_text, context_de, question=question)
+
+
+class RefinementMemo:
+    """
+    Refinement results for one rule-set version: hash of (text, German context,
+    question field or not) -> refined text, or None when the rules leave the
+    text unchanged.
+    """
+
+    def __init__(self, lang: str, version: str, memo_dir: str = MEMO_DIR) -> None:
+        self.lang = lang
+        self.version = version
+        self.memo_dir = memo_dir
+        self.path = os.path.join(memo_dir, f"{lang}-{version}.json")
+        self._dirty = False
+        self._data: Dict[str, Optional[str]] = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._data = json.load(f)
+
+    @staticmethod
+    def key(text: str, context_de: str, question: bool = True) -> str:
+        return text_hash(f"{text}\0{context_de}\0{'q' if question else 't'}")[:16]
+
+    def lookup(self, text: str, context_de: str, question: bool = True) -> Tuple[bool, Optional[str]]:
+        """(found, refined text or None if unchanged)."""
+        key = self.key(text, context_de, question)
+        if key in self._data:
+            return True, self._data[key]
+        return False, None
+
+    def store(self, text: str, context_de: str, refined: str,
+              question: bool = True) -> Tuple[str, Optional[str]]:
+        """Remember a result; returns the (key, value) entry for merge()."""
+        key = self.key(text, context_de, question)
+        self._data[key] = None if refined == text else refined
+        return key, self._data[key]
+
+    def merge(self, entries: Dict[str, Optional[str]]) -> None:
+        """Take over entries computed in a worker process."""
+        if entries:
+            self._data.update(entries)
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the memo if it grew; drop memos of older rule-set versions."""
+        if not self._dirty:
+            return
+        atomic_write_text(json.dumps(self._data, ensure_ascii=False, separators=(',', ':')), self.path)
+        self._dirty = False
+        for path in glob.glob(os.path.join(self.memo_dir, f"{self.lang}-*.json")):
+            if path != self.path:
+                os.remove(path)
+
+
+def available_languages(rules_dir: str = RULES_DIR) -> List[str]:
+    """Languages with a rule file."""
+    return sorted(os.path.splitext(os.path.basename(p))[0]
+                  for p in glob.glob(os.path.join(rules_dir, '*.json')))
+
+
+_loaded: Dict[str, LanguageRules] = {}
+
+
+def rules_for(lang: str) -> LanguageRules:
+    """Per-process cache of compiled rule sets."""
+    if lang not in _loaded:
+        _loaded[lang] = LanguageRules.load(lang)
+    return _loaded[lang]
+
+
+_memos: Dict[str, RefinementMemo] = {}
+
+
+def memo_for(lang: str) -> RefinementMemo:
+    """Per-process memo for the current version of lang's rule set."""
+    version = rules_for(lang).version
+    if lang not in _memos or _memos[lang].version != version:
+        _memos[lang] = RefinementMemo(lang, version)
+    return _memos[lang]
+
+
+def generated_outputs() -> set:
+    """Layout keys of the question files generated from the store."""
+    return set(load_layout()) if os.path.exists(LAYOUT_FILE) else set()
+
+
+def asset_files() -> List[str]:
+    """
+    Every asset file carrying translations that is not generated from the
+    question store, largest first (for scheduling).
+    """
+    generated = generated_outputs()
+    paths = set()
+    for pattern in ASSET_PATTERNS:
+        paths.update(glob.glob(os.path.join(DATA_DIR, pattern)))
+    paths = [p for p in paths
+             if os.path.basename(p) not in EXCLUDED_FILES and output_key(p, DATA_DIR) not in generated]
+    return sorted(paths, key=lambda p: (-os.path.getsize(p), p))
+
+
+def text_fields(value: Any, location: str = '') -> Iterator[Tuple[str, Dict[str, str]]]:
+    """
+    Yield (location, language dict) for every text in value, e.g.
+    ('12.question', question['question']) or ('12.answers.b.text', answer['text']).
+    List items are named by their 'id' when they have one.
+    """
+    if is_text_dict(value):
+        yield location, value
+    elif isinstance(value, dict):
+        for key, child in value.items():
+            yield from text_fields(child, f"{location}.{key}" if location else str(key))
+    elif isinstance(value, list):
+        for index, child in enumerate(value):
+            name = str(child['id']) if isinstance(child, dict) and 'id' in child else str(index)
+            yield from text_fields(child, f"{location}.{name}" if location else name)
+
+
+def is_question_field(location: str) -> bool:
+    """True for the text of a question ('12.question'), not its answers or glossary texts."""
+    return location.rsplit('.', 1)[-1] == 'question'
+
+
+def refine_data(data: Any, langs: List[str], dry_run: bool = False,
+                use_memo: bool = True) -> Dict[str, Any]:
+    """
+    Refine data in place (unless dry_run). Returns
+      changes: {lang: changed strings}, cached: strings answered by the memo,
+      memo:    {lang: new memo entries}, diffs: [(rule, location, lang, before, after)].
+    """
+    result = {'changes': {lang: 0 for lang in langs}, 'cached': 0,
+              'memo': {lang: {} for lang in langs}, 'diffs': []}
+    rule_sets = [rules_for(lang) for lang in langs]
+    memos = {lang: memo_for(lang) for lang in langs} if use_memo else {}
+    for location, field in text_fields(data):
+        context_de = field.get(BASE_LANGUAGE, '')
+        question = is_question_field(location)
+        for rules in rule_sets:
+            text = field.get(rules.lang)
+            if not text:
+                continue
+            memo = memos.get(rules.lang)
+            found, refined = memo.lookup(text, context_de, question) if memo else (False, None)
+            if found and (refined is None or not dry_run):
+                result['cached'] += 1
+            else:
+                trace = [] if dry_run else None
+                refined = rules.refine(text, context_de, trace, question)
+                if memo:
+                    key, value = memo.store(text, context_de, refined, question)
+                    result['memo'][rules.lang][key] = value
+                if trace:
+                    result['diffs'].extend((label, location, rules.lang, before, after)
+                                           for label, before, after in trace)
+                if refined == text:
+                    refined = None
+            if refined is not None:
+                if not dry_run:
+                    field[rules.lang] = refined
+                result['changes'][rules.lang] += 1
+    return result
+
+
+def refine_file(path: str, langs: List[str], dry_run: bool = False, use_memo: bool = True,
+                generated: bool = False) -> Tuple[str, Dict[str, Any], float]:
+    """
+    Refine one asset file (worker entry point). Writes it only if a string changed.
+    A generated question file is not written: its refined questions are returned
+    as result['questions'] for write_back().
+    """
+    start = time.perf_counter()
+    with open(path, 'r', encoding='utf-8') as f:
+        metrics().read(os.fstat(f.fileno()).st_size)
+        data = json.load(f)
+    result = refine_data(data, langs, dry_run, use_memo)
+    if any(result['changes'].values()) and not dry_run:
+        if generated:
+            result['questions'] = data
+        else:
+            atomic_write_json(data, path)
+    return path, result, time.perf_counter() - start
+
+
+def print_diffs(diffs: List[Tuple[str, str, str, str, str, str]]) -> None:
+    """Print changed strings grouped by rule, most-used rules first."""
+    by_rule: Dict[str, List[Tuple[str, str, str, str, str]]] = {}
+    for label, path, location, lang, before, after in diffs:
+        by_rule.setdefault(label, []).append((path, location, lang, before, after))
+    for label, entries in sorted(by_rule.items(), key=lambda item: (-len(item[1]), item[0])):
+        print(f"\n=== {label} ({len(entries)} string{'s' if len(entries) != 1 else ''})")
+        for path, location, lang, before, after in sorted(entries):
+            print(f"@@ {os.path.relpath(path, DATA_DIR)}:{location} [{lang}]")
+            print(f"-{before}")
+            print(f"+{after}")
+
+
+def run(paths: List[str], langs: List[str], jobs: Optional[int] = None,
+        dry_run: bool = False, use_memo: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Refine paths in parallel and print one line per file. Returns path -> refine_data result.
+    Refined generated files are written back to the question store; when the
+    store itself changed, the generated files are rebuilt.
+    """
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(paths)))
+    results: Dict[str, Dict[str, Any]] = {}
+    outputs = generated_outputs()
+    generated = {path: output_key(path, DATA_DIR) in outputs for path in paths}
+
+    def report(path: str, result: Dict[str, Any], seconds: float) -> None:
+        results[path] = result
+        counts = ', '.join(f"{lang} {count}" for lang, count in result['changes'].items())
+        print(f"   {os.path.relpath(path, DATA_DIR):<36} {counts}  "
+              f"({result['cached']} cached, {seconds * 1000:.0f} ms)")
+
+    with stage('refine'):
+        if jobs == 1:
+            for path in paths:
+                report(*refine_file(path, langs, dry_run, use_memo, generated[path]))
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = [pool.submit(in_worker, refine_file, path, langs, dry_run, use_memo,
+                                       generated[path])
+                           for path in paths]
+                for future in as_completed(futures):
+                    result, snapshot = future.result()
+                    metrics().merge(snapshot)
+                    report(*result)
+
+    edited = {path: result.pop('questions') for path, result in results.items() if 'questions' in result}
+    store_changed = any(os.path.abspath(path) == os.path.abspath(STORE_FILE) and any(result['changes'].values())
+                        for path, result in results.items())
+    if (edited or store_changed) and not dry_run:
+        with stage('store'):
+            written = write_back(edited) if edited else build()
+        print(f"   Updated the question store, {sum(w for _, w in written.values())} files regenerated.")
+
+    if use_memo:
+        with stage('save'):
+            for lang in langs:
+                memo = memo_for(lang)
+                for result in results.values():
+                    memo.merge(result['memo'][lang])
+                memo.save()
+    metrics().count('strings_changed', sum(sum(r['changes'].values()) for r in results.values()))
+    if dry_run:
+        print_diffs([(label, path, *rest) for path, result in results.items()
+                     for label, *rest in result['diffs']])
+    return results
+
+
+def verify(langs: List[str], synthetic: int = 0) -> bool:
+    """Check that compiled refinement matches sequential rule application on all assets."""
+    ok = True
+    fields = []
+    for path in asset_files():
+        with open(path, 'r', encoding='utf-8') as f:
+            fields.extend((field, is_question_field(location)) for location, field in text_fields(json.load(f)))
+    for lang in langs:
+        rules = rules_for(lang)
+        if synthetic:
+            # Padding rules never occur in the data; they only grow the rule set
+            padding = literal_rules((f"\0rule{i}", f"replacement{i}") for i in range(synthetic))
+            rules.phrase_rules = RuleSet(rules.phrase_rules.rules + padding)
+        pairs = [(field[lang], field.get(BASE_LANGUAGE, ''), question)
+                 for field, question in fields if field.get(lang)]
+
+        start = time.perf_counter()
+        expected = [rules.refine_sequential(text, context, question=question) for text, context, question in pairs]
+        sequential_time = time.perf_counter() - start
+        start = time.perf_counter()
+        actual = [rules.refine(text, context, question=question) for text, context, question in pairs]
+        compiled_time = time.perf_counter() - start
+
+        mismatches = [(pair[0], e, a) for pair, e, a in zip(pairs, expected, actual) if e != a]
+        print(f"[{lang}] {len(pairs)} strings, {len(rules.phrase_rules)} rules ({synthetic} synthetic): "
+              f"sequential {sequential_time * 1000:.1f} ms, compiled {compiled_time * 1000:.1f} ms, "
+              f"{len(mismatches)} mismatches")
+        for text, e, a in mismatches[:10]:
+            print(f"  MISMATCH: {text!r}\n    sequential: {e!r}\n    compiled:   {a!r}")
+        ok = ok and not mismatches
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refine translations in the asset files")
+    parser.add_argument('files', nargs='*', help="Asset files (default: every questions, state and glossary file)")
+    parser.add_argument('--lang', action='append', help="Target language (repeatable, default: every rule file)")
+    parser.add_argument('--jobs', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Write nothing; print the strings each rule would change")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Ignore and do not update the refinement memo")
+    parser.add_argument('--verify', action='store_true',
+                        help="Compare compiled and sequential rule application on all assets")
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help="With --verify: add N never-matching rules to measure scaling")
+    args = parser.parse_args()
+
+    langs = args.lang or available_languages()
+    missing = [lang for lang in langs if lang not in available_languages()]
+    if missing:
+        parser.error(f"no rule file for: {', '.join(missing)} (looked in {RULES_DIR})")
+
+    if args.verify:
+        raise SystemExit(0 if verify(langs, args.synthetic) else 1)
+
+    paths = args.files or asset_files()
+    print("=" * 70)
+    print(f"Refining {len(paths)} file(s) for: {', '.join(langs)}")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    results = run(paths, langs, args.jobs, args.dry_run, not args.no_cache)
+    changed_files = sum(1 for r in results.values() if any(r['changes'].values()))
+    total = {lang: sum(r['changes'][lang] for r in results.values()) for lang in langs}
+
+    print(f"\n[SUMMARY]")
+    print(f"  - Strings {'to change' if args.dry_run else 'changed'}: "
+          f"{', '.join(f'{lang} {count}' for lang, count in total.items())}")
+    print(f"  - Strings skipped (memoized): {sum(r['cached'] for r in results.values())}")
+    print(f"  - Files {'to rewrite' if args.dry_run else 'rewritten'}: {changed_files} of {len(paths)}")
+    print(f"  - Wall time: {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    with run_metrics('refine_translations'):
+        main()
@@ -4,34 +4,43 @@
 German Citizenship Test - Question Translator Script
 Translates questions from German (de) to English, Turkish, Ukrainian, and Russian.
 Uses deep_translator library with Google Translator.
+
+Translates the question store (questions.json), which holds every question,
+state questions included, and then regenerates the files the app loads from
+it (see question_store.py), so they are never edited directly.
 """
 
+import argparse
 import json
 import os
-import shutil
+import sys
+import time
 from pathlib import Path
-from deep_translator import GoogleTranslator
 from typing import Dict, List, Any
 
+from corpus import load_questions as read_questions
+from json_io import atomic_write_json
+from metrics import metrics, run_metrics, stage
+from question_store import build as build_outputs, print_build_report
+from translation_engine import (
+    BACKENDS, DEFAULT_RPS, DEFAULT_WORKERS, TranslationEngine, collect_jobs,
+    create_backend, print_run_stats, unique_strings,
+)
+from translation_fingerprints import FingerprintStore
+from translation_journal import Checkpointer, TranslationJournal, journaled
+from translation_memory import default_memory, print_stats
+from translator_pool import default_pool, print_pool_stats
+
 # Configuration
 SOURCE_LANGUAGE = 'de'
 TARGET_LANGUAGES = ['en', 'tr', 'uk', 'ru']
 QUESTIONS_FILE = 'assets/data/questions.json'
-BACKUP_FILE = 'assets/data/questions_backup.json'
-
-def create_backup(source_path: str, backup_path: str) -> None:
-    """Create a backup of the original file before modification."""
-    if os.path.exists(source_path):
-        shutil.copy2(source_path, backup_path)
-        print(f"[OK] Backup created: {backup_path}")
-    else:
-        print(f"[WARNING] Source file not found: {source_path}")
+JOURNAL_FILE = '.cache/translate_questions.journal.jsonl'
 
 def load_questions(file_path: str) -> List[Dict[str, Any]]:
     """Load questions from JSON file."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = read_questions(file_path)
         print(f"[OK] Loaded {len(data)} questions from {file_path}")
         return data
     except FileNotFoundError:
@@ -44,20 +53,38 @@ def load_questions(file_path: str) -> List[Dict[str, Any]]:
 def translate_text(text: str, target_lang: str, source_lang: str = SOURCE_LANGUAGE) -> str:
     """
     Translate text from source language to target language.
+    Consults the translation memory first; only misses hit the network.
     Returns empty string if translation fails.
     """
     if not text or not text.strip():
         return ""
     
+    memory = default_memory()
+    cached = memory.get(text, target_lang, source_lang)
+    if cached is not None:
+        return cached
+    
+    start = time.perf_counter()
     try:
-        translator = GoogleTranslator(source=source_lang, target=target_lang)
-        translated = translator.translate(text)
+        translated = default_pool().translate(text, target_lang, source_lang)
+        memory.put(text, target_lang, source_lang, translated)
+        metrics().backend_call('google', time.perf_counter() - start, empty=int(not translated))
         return translated if translated else ""
     except Exception as e:
+        metrics().backend_call('google', time.perf_counter() - start, failed=True)
         print(f"    [WARNING] Translation error ({source_lang} -> {target_lang}): {e}")
         return ""
 
-def translate_question_field(question: Dict[str, Any], field_name: str, total: int, current: int) -> None:
+def needs_translation(text_dict: Dict[str, str], target_lang: str, source_text: str,
+                      fingerprints: FingerprintStore, key: str, question_id: Any, field: str) -> bool:
+    """True if the target is empty or (with fingerprints) was translated from older German text."""
+    existing = text_dict.get(target_lang)
+    if not existing or not existing.strip():
+        return True
+    return fingerprints is not None and fingerprints.is_stale(key, question_id, field, target_lang, source_text)
+
+def translate_question_field(question: Dict[str, Any], field_name: str, total: int, current: int,
+                             fingerprints: FingerprintStore = None, key: str = QUESTIONS_FILE) -> None:
     """
     Translate a question field (question text or answer text) to all target languages.
     """
@@ -73,18 +100,22 @@ def translate_question_field(question: Dict[str, Any], field_name: str, total: i
             return
         
         for target_lang in TARGET_LANGUAGES:
-            # Skip if translation already exists and is not empty
-            if target_lang in field_data and field_data[target_lang] and field_data[target_lang].strip():
+            # Skip if an up-to-date translation already exists
+            if not needs_translation(field_data, target_lang, source_text, fingerprints,
+                                     key, question.get('id'), field_name):
                 continue
             
             print(f"  Translating {field_name} to {target_lang}...")
             translated = translate_text(source_text, target_lang)
             if translated:
                 field_data[target_lang] = translated
+                if fingerprints is not None:
+                    fingerprints.record(key, question.get('id'), field_name, target_lang, source_text)
             else:
                 print(f"    [WARNING] Failed to translate {field_name} to {target_lang}")
 
-def translate_answer(answer: Dict[str, Any], question_num: int) -> None:
+def translate_answer(answer: Dict[str, Any], question_num: int,
+                     fingerprints: FingerprintStore = None, key: str = QUESTIONS_FILE) -> None:
     """Translate an answer's text field to all target languages."""
     if 'text' not in answer:
         return
@@ -98,17 +129,55 @@ def translate_answer(answer: Dict[str, Any], question_num: int) -> None:
         return
     
     for target_lang in TARGET_LANGUAGES:
-        # Skip if translation already exists and is not empty
-        if target_lang in text_data and text_data[target_lang] and text_data[target_lang].strip():
+        # Skip if an up-to-date translation already exists
+        if not needs_translation(text_data, target_lang, source_text, fingerprints,
+                                 key, question_num, answer.get('id')):
             continue
         
         translated = translate_text(source_text, target_lang)
         if translated:
             text_data[target_lang] = translated
+            if fingerprints is not None:
+                fingerprints.record(key, question_num, answer.get('id'), target_lang, source_text)
 
-def process_questions(questions: List[Dict[str, Any]]) -> None:
-    """Process all questions and translate missing fields."""
+def process_corpus(corpus: Dict[str, List[Dict[str, Any]]], engine: TranslationEngine,
+                   on_translated=None, fingerprints: FingerprintStore = None) -> int:
+    """
+    Translate missing (and, with fingerprints, stale) fields of every file in the
+    corpus (path -> questions) in one engine pass: jobs are collected first,
+    deduplicated per target language and run concurrently in batches.
+    on_translated is called per filled field. Returns the number of jobs.
+    """
+    jobs = []
+    for path, questions in corpus.items():
+        jobs.extend(collect_jobs(questions, TARGET_LANGUAGES, SOURCE_LANGUAGE, key=path,
+                                 fingerprints=fingerprints))
+    total = sum(len(questions) for questions in corpus.values())
+    stale = sum(1 for job in jobs if job.stale)
+    print(f"\n[INFO] {total} questions, {len(jobs)} translations needed ({stale} stale)")
+    if not jobs:
+        return 0
+    print(f"   {engine.workers} workers, backend: {engine.backend.name}")
+    for lang, texts in sorted(unique_strings(jobs).items()):
+        print(f"   {lang}: {len(texts)} unique strings")
+    print()
+    stats = engine.run(jobs, on_translated=on_translated)
+    print_run_stats(stats)
+    return len(jobs)
+
+def process_questions(questions: List[Dict[str, Any]], engine: TranslationEngine = None,
+                      fingerprints: FingerprintStore = None, key: str = QUESTIONS_FILE) -> None:
+    """
+    Process all questions and translate missing fields.
+    With an engine, see process_corpus; without one, fields are translated one
+    at a time.
+    """
     total = len(questions)
+    
+    if engine is not None:
+        process_corpus({key: questions}, engine, fingerprints=fingerprints)
+        return
+    
     print(f"\n[INFO] Starting translation process for {total} questions...\n")
     
     for index, question in enumerate(questions, 1):
@@ -116,12 +185,12 @@ def process_questions(questions: List[Dict[str, Any]]) -> None:
         print(f"[{index}/{total}] Processing Question ID: {question_id}...")
         
         # Translate question text
-        translate_question_field(question, 'question', total, index)
+        translate_question_field(question, 'question', total, index, fingerprints, key)
         
         # Translate answers
         if 'answers' in question and isinstance(question['answers'], list):
             for answer_index, answer in enumerate(question['answers'], 1):
-                translate_answer(answer, question_id)
+                translate_answer(answer, question_id, fingerprints, key)
         
         # Progress indicator
         if index % 10 == 0:
@@ -131,21 +200,34 @@ def save_questions(questions: List[Dict[str, Any]], file_path: str) -> None:
     """
     Save questions to JSON file with proper formatting.
     CRITICAL: Uses indent=2 and ensure_ascii=False to maintain readability and Unicode characters.
+    The write is atomic (temp file + rename), so an interrupted save keeps the old file.
     """
-    # Ensure directory exists
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(questions, f, ensure_ascii=False, indent=2)
+        atomic_write_json(questions, file_path)
         print(f"\n[OK] Successfully saved {len(questions)} questions to {file_path}")
         print(f"   File is properly formatted (indent=2, ensure_ascii=False)")
     except Exception as e:
         print(f"[ERROR] Error saving file: {e}")
         raise
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Translate missing question fields")
+    parser.add_argument('--sequential', action='store_true',
+                        help="Translate one string at a time (legacy path)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"Concurrent translation workers (default {DEFAULT_WORKERS})")
+    parser.add_argument('--rps', type=float, default=DEFAULT_RPS,
+                        help=f"Global requests per second limit, 0 = unlimited (default {DEFAULT_RPS})")
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='google',
+                        help="Translation backend (default google)")
+    parser.add_argument('--resume', action='store_true',
+                        help=f"Replay {JOURNAL_FILE} from an interrupted run and continue")
+    return parser.parse_args()
+
 def main():
     """Main execution function."""
+    args = parse_args()
+    
     print("=" * 70)
     print("German Citizenship Test - Question Translator")
     print("=" * 70)
@@ -156,23 +238,66 @@ def main():
         print(f"   Please ensure the file exists in the project root.")
         return
     
-    # Create backup
-    print("\n[INFO] Creating backup...")
-    create_backup(QUESTIONS_FILE, BACKUP_FILE)
+    # Load the store (no backup copy: saves are atomic, an interrupted run is
+    # continued with --resume, and the store is under version control)
+    corpus = {}
+    with stage('load'):
+        print(f"\n[INFO] Loading questions from {QUESTIONS_FILE}...")
+        corpus[QUESTIONS_FILE] = load_questions(QUESTIONS_FILE)
+    questions = [q for file_questions in corpus.values() for q in file_questions]
     
-    # Load questions
-    print(f"\n[INFO] Loading questions from {QUESTIONS_FILE}...")
-    questions = load_questions(QUESTIONS_FILE)
+    journal = TranslationJournal(JOURNAL_FILE)
+    restored = 0
+    if args.resume:
+        restored = journal.replay(corpus)
+        print(f"\n[INFO] Resumed: restored {restored} translations from {JOURNAL_FILE}")
+    elif journal.exists():
+        print(f"\n[WARNING] Discarding journal of an earlier run ({JOURNAL_FILE}); use --resume to continue it")
     
     # Process translations
     print(f"\n[INFO] Starting translation process...")
     print(f"   This may take a while (300 questions x 4 languages = ~1200 translations)")
     print(f"   Please be patient and ensure you have internet connection.\n")
-    process_questions(questions)
+    fingerprints = FingerprintStore()
+    changed = True
+    with stage('translate'):
+        if args.sequential:
+            for path, file_questions in corpus.items():
+                process_questions(file_questions, fingerprints=fingerprints, key=path)
+        else:
+            # Only real translations go into the translation memory: its key has
+            # no backend, so placeholders of the fake backend would be reused
+            engine = TranslationEngine(create_backend(args.backend), workers=args.workers,
+                                       rps=args.rps,
+                                       memory=default_memory() if args.backend == 'google' else None,
+                                       source_lang=SOURCE_LANGUAGE)
+            checkpointer = Checkpointer(lambda path: save_questions(corpus[path], path))
+            journal.open(append=args.resume)
+            jobs = process_corpus(corpus, engine,
+                                  journaled(journal, checkpointer, SOURCE_LANGUAGE, fingerprints),
+                                  fingerprints)
+            changed = jobs > 0 or restored > 0
     
     # Save translated questions
-    print(f"\n[INFO] Saving translated questions...")
-    save_questions(questions, QUESTIONS_FILE)
+    if changed:
+        print(f"\n[INFO] Saving translated questions...")
+        with stage('save'):
+            for path, file_questions in corpus.items():
+                save_questions(file_questions, path)
+    else:
+        print(f"\n[INFO] All translations are up to date, files left unchanged")
+    fingerprints.save()
+    journal.discard()
+    
+    # Regenerate the general, category and state files from the store
+    print(f"\n[INFO] Generating question files from {QUESTIONS_FILE}...")
+    with stage('build'):
+        try:
+            results = build_outputs()
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            sys.exit(1)
+    print_build_report(results, check=False)
     
     print("\n" + "=" * 70)
     print("[SUCCESS] Translation process completed successfully!")
@@ -180,9 +305,11 @@ def main():
     print(f"\n[SUMMARY]")
     print(f"   - Total questions processed: {len(questions)}")
     print(f"   - Target languages: {', '.join(TARGET_LANGUAGES)}")
-    print(f"   - Backup saved to: {BACKUP_FILE}")
-    print(f"   - Updated file: {QUESTIONS_FILE}")
+    print(f"   - Question files regenerated: {sum(written for _, written in results.values())}")
+    print_stats(default_memory())
+    print_pool_stats()
 
 if __name__ == "__main__":
-    main()
+    with run_metrics('translate_questions'):
+        main()
 
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Concurrent Translation Engine
+Collects every missing (field, language) translation up front, deduplicates
+identical source strings per target language, and runs the network calls in
+batches through a bounded thread pool behind a global requests-per-second
+limit. Results are fanned back out into every question dict that needs them.
+
+Backends are pluggable: 'google' (deep_translator) for real runs and 'fake'
+(offline, configurable latency) for testing and benchmarking.
+
+Usage:
+  python scripts/translation_engine.py bench [--limit 50] [--latency 0.02] [--workers 8] [--batch-size 25]
+    - Compare sequential, pooled and pooled+batched runs with the fake backend
+"""
+
+import argparse
+import copy
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from metrics import metrics
+from translation_memory import TranslationMemory
+from translator_pool import TranslatorPool, default_pool
+
+# Configuration
+DEFAULT_WORKERS = 8
+DEFAULT_RPS = 5.0
+
+
+class TranslationBackend:
+    """
+    Interface for translation backends.
+    Backends that can carry several strings in one request set max_batch_size > 1
+    and override translate_batch.
+    """
+
+    name = 'base'
+    max_batch_size = 1
+
+    def translate(self, text: str, target_lang: str, source_lang: str) -> str:
+        raise NotImplementedError
+
+    def translate_batch(self, texts: List[str], target_lang: str, source_lang: str) -> List[str]:
+        return [self.translate(text, target_lang, source_lang) for text in texts]
+
+
+class GoogleBackend(TranslationBackend):
+    """Google Translate via deep_translator, using pooled keep-alive sessions."""
+
+    name = 'google'
+
+    def __init__(self, pool: Optional[TranslatorPool] = None) -> None:
+        self.pool = pool or default_pool()
+
+    def translate(self, text: str, target_lang: str, source_lang: str) -> str:
+        return self.pool.translate(text, target_lang, source_lang)
+
+
+class FakeBackend(TranslationBackend):
+    """
+    Offline backend that tags the source text. Sleeps `latency` seconds per
+    request (single string or batch) to simulate network round trips.
+    """
+
+    name = 'fake'
+
+    def __init__(self, latency: float = 0.0, batch_size: int = 25) -> None:
+        self.latency = latency
+        self.max_batch_size = max(1, batch_size)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def translate(self, text: str, target_lang: str, source_lang: str) -> str:
+        return self.translate_batch([text], target_lang, source_lang)[0]
+
+    def translate_batch(self, texts: List[str], target_lang: str, source_lang: str) -> List[str]:
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return [f"[{target_lang}] {text}" for text in texts]
+
+
+BACKENDS = {
+    'google': GoogleBackend,
+    'fake': FakeBackend,
+}
+
+
+def create_backend(name: str, latency: float = 0.0, batch_size: int = 25) -> TranslationBackend:
+    """
+    Instantiate a backend by name. The fake backend also accepts a latency in
+    milliseconds per request as part of the name: 'fake:20'.
+    """
+    name, _, latency_ms = name.partition(':')
+    if name not in BACKENDS or (latency_ms and name != 'fake'):
+        raise ValueError(f"Unknown translation backend: {name} (choose from {', '.join(BACKENDS)})")
+    if name == 'fake':
+        return FakeBackend(float(latency_ms) / 1000 if latency_ms else latency, batch_size)
+    return BACKENDS[name]()
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing calls at most `rps` per second (0 = unlimited)."""
+
+    def __init__(self, rps: float) -> None:
+        self.interval = 1.0 / rps if rps and rps > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+@dataclass
+class TranslationJob:
+    """
+    One missing translation: the text dict to fill and the target language.
+    key/question_id/field locate the text again (e.g. when replaying a journal);
+    field is 'question' or an answer id. stale marks an existing translation whose
+    German source has changed.
+    """
+
+    text_dict: Dict[str, str]
+    target_lang: str
+    source_text: str
+    key: str = ''
+    question_id: Any = None
+    field: str = ''
+    stale: bool = False
+
+    @property
+    def label(self) -> str:
+        return f"{self.question_id}/{self.field}"
+
+
+def _missing_jobs(text_dict: Any, target_langs: List[str], source_lang: str,
+                  key: str, question_id: Any, field: str, fingerprints: Any) -> List[TranslationJob]:
+    if not isinstance(text_dict, dict):
+        return []
+    source_text = text_dict.get(source_lang, "")
+    if not source_text:
+        return []
+    jobs = []
+    for lang in target_langs:
+        existing = text_dict.get(lang)
+        stale = False
+        if existing and existing.strip():
+            if fingerprints is None or not fingerprints.is_stale(key, question_id, field, lang, source_text):
+                continue
+            stale = True
+        jobs.append(TranslationJob(text_dict, lang, source_text, key, question_id, field, stale))
+    return jobs
+
+
+def collect_jobs(questions: List[Dict[str, Any]], target_langs: List[str],
+                 source_lang: str = 'de', key: str = '',
+                 fingerprints: Any = None) -> List[TranslationJob]:
+    """
+    Collect every missing question/answer translation. key names the source file.
+    With a FingerprintStore, existing translations of edited German text are
+    collected as well (stale jobs).
+    """
+    jobs = []
+    for index, question in enumerate(questions, 1):
+        question_id = question.get('id', index)
+        jobs.extend(_missing_jobs(question.get('question'), target_langs, source_lang,
+                                  key, question_id, 'question', fingerprints))
+        answers = question.get('answers')
+        if isinstance(answers, list):
+            for answer in answers:
+                if isinstance(answer, dict):
+                    jobs.extend(_missing_jobs(answer.get('text'), target_langs, source_lang,
+                                              key, question_id, answer.get('id', '?'), fingerprints))
+    return jobs
+
+
+def unique_strings(jobs: List[TranslationJob]) -> Dict[str, Set[str]]:
+    """Return the set of distinct source strings needed per target language."""
+    unique: Dict[str, Set[str]] = {}
+    for job in jobs:
+        unique.setdefault(job.target_lang, set()).add(job.source_text)
+    return unique
+
+
+class TranslationEngine:
+    """Runs translation jobs through a bounded worker pool and a global rate limit."""
+
+    def __init__(self, backend: TranslationBackend, workers: int = DEFAULT_WORKERS,
+                 rps: float = DEFAULT_RPS, memory: Optional[TranslationMemory] = None,
+                 source_lang: str = 'de') -> None:
+        self.backend = backend
+        self.workers = max(1, workers)
+        self.limiter = RateLimiter(rps)
+        self.memory = memory
+        self.source_lang = source_lang
+
+    def _call_backend(self, texts: List[str], target_lang: str) -> List[str]:
+        self.limiter.acquire()
+        start = time.perf_counter()
+        try:
+            if len(texts) == 1:
+                results = [self.backend.translate(texts[0], target_lang, self.source_lang)]
+            else:
+                results = self.backend.translate_batch(texts, target_lang, self.source_lang)
+        except Exception as e:
+            metrics().backend_call(self.backend.name, time.perf_counter() - start, len(texts), failed=True)
+            print(f"    [WARNING] Translation error ({self.source_lang} -> {target_lang}): {e}")
+            return [""] * len(texts)
+        seconds = time.perf_counter() - start
+        if len(results) != len(texts):
+            metrics().backend_call(self.backend.name, seconds, len(texts), failed=True)
+            print(f"    [WARNING] Batch size mismatch ({self.source_lang} -> {target_lang}): "
+                  f"sent {len(texts)}, got {len(results)}")
+            return [""] * len(texts)
+        results = [r if r else "" for r in results]
+        metrics().backend_call(self.backend.name, seconds, len(texts), empty=results.count(""))
+        return results
+
+    def run(self, jobs: List[TranslationJob], verbose: bool = True,
+            on_translated: Optional[Callable[[TranslationJob], None]] = None) -> Dict[str, Any]:
+        """
+        Translate all jobs and write results back. Each distinct (text, language)
+        pair is requested once and fanned out to every job that needs it as soon
+        as its request completes; on_translated is called (on this thread) for
+        every job that was filled. New languages are added to each text dict in
+        job order (the callers' target language order), not in completion order.
+        Returns run statistics, including
+        failed_by_key (job key, e.g. file path -> failed jobs).
+        """
+        start = time.perf_counter()
+        groups: Dict[Tuple[str, str], List[TranslationJob]] = {}
+        for job in jobs:
+            groups.setdefault((job.source_text, job.target_lang), []).append(job)
+
+        stats = {'jobs': len(jobs), 'unique': len(groups), 'cached': 0,
+                 'requests': 0, 'strings': 0, 'failed': 0, 'failed_by_key': {}}
+
+        langs = list(dict.fromkeys(job.target_lang for job in jobs))
+        new_langs = {(id(job.text_dict), job.target_lang) for job in jobs
+                     if job.target_lang not in job.text_dict}
+
+        def fan_out(group_key: Tuple[str, str], translated: str) -> None:
+            for job in groups[group_key]:
+                text_dict = job.text_dict
+                text_dict[job.target_lang] = translated
+                if (id(text_dict), job.target_lang) in new_langs:
+                    # Move languages that come later and were filled first behind it
+                    for lang in langs[langs.index(job.target_lang) + 1:]:
+                        if lang in text_dict and (id(text_dict), lang) in new_langs:
+                            text_dict[lang] = text_dict.pop(lang)
+                if on_translated is not None:
+                    on_translated(job)
+
+        # Cache lookups and stores stay on this thread; only misses go to the pool.
+        filled: Set[Tuple[str, str]] = set()
+        misses: Dict[str, List[str]] = {}
+        for text, lang in groups:
+            cached = self.memory.get(text, lang, self.source_lang) if self.memory is not None else None
+            if cached is not None:
+                fan_out((text, lang), cached)
+                filled.add((text, lang))
+                stats['cached'] += 1
+            else:
+                misses.setdefault(lang, []).append(text)
+
+        size = max(1, self.backend.max_batch_size)
+        batches = [
+            (lang, texts[i:i + size])
+            for lang, texts in misses.items()
+            for i in range(0, len(texts), size)
+        ]
+
+        total = len(batches)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {
+                pool.submit(self._call_backend, texts, lang): (lang, texts)
+                for lang, texts in batches
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                lang, texts = futures[future]
+                stats['requests'] += 1
+                for text, translated in zip(texts, future.result()):
+                    stats['strings'] += 1
+                    if translated:
+                        fan_out((text, lang), translated)
+                        filled.add((text, lang))
+                        if self.memory is not None:
+                            self.memory.put(text, lang, self.source_lang, translated)
+                if verbose and done % 50 == 0:
+                    print(f"   [PROGRESS] {done}/{total} requests completed")
+
+        for group_key, group in groups.items():
+            if group_key not in filled:
+                stats['failed'] += len(group)
+                for job in group:
+                    stats['failed_by_key'][job.key] = stats['failed_by_key'].get(job.key, 0) + 1
+                    print(f"    [WARNING] Failed to translate {job.label} to {job.target_lang}")
+
+        stats['seconds'] = round(time.perf_counter() - start, 3)
+        stats['per_second'] = round(stats['strings'] / stats['seconds'], 1) if stats['seconds'] else 0.0
+        for name in ('jobs', 'cached', 'failed'):
+            metrics().count(f"translation_{name}", stats[name])
+        return stats
+
+
+def print_run_stats(stats: Dict[str, Any]) -> None:
+    """Print an engine run summary."""
+    print(f"   - Translation jobs: {stats['jobs']} ({stats['unique']} unique, "
+          f"{stats['cached']} from cache, {stats['failed']} failed)")
+    print(f"   - Requests: {stats['requests']} for {stats['strings']} strings "
+          f"in {stats['seconds']}s ({stats['per_second']} strings/s)")
+
+
+def bench(questions_file: str, limit: int, latency: float, workers: int, rps: float,
+          batch_size: int) -> None:
+    """Compare sequential vs. pooled translation with the offline fake backend."""
+    with open(questions_file, 'r', encoding='utf-8') as f:
+        questions = json.load(f)[:limit]
+
+    # Strip translations so every field needs work
+    for question in questions:
+        question['question'] = {'de': question.get('question', {}).get('de', '')}
+        for answer in question.get('answers', []):
+            answer['text'] = {'de': answer.get('text', {}).get('de', '')}
+
+    target_langs = ['en', 'tr', 'uk', 'ru']
+    print(f"[INFO] Fake backend, latency {latency * 1000:.0f} ms, {len(questions)} questions")
+
+    runs = (
+        ('sequential', 1, 1),
+        (f'pool x{workers}', workers, 1),
+        (f'pool+batch{batch_size}', workers, batch_size),
+    )
+    for label, n, size in runs:
+        work = copy.deepcopy(questions)
+        jobs = collect_jobs(work, target_langs)
+        engine = TranslationEngine(FakeBackend(latency, size), workers=n, rps=rps)
+        stats = engine.run(jobs, verbose=False)
+        print(f"  {label:>14}: {stats['jobs']} jobs, {stats['unique']} unique, "
+              f"{stats['requests']} requests in {stats['seconds']}s "
+              f"({stats['per_second']} strings/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent translation engine tools")
+    sub = parser.add_subparsers(dest='command')
+    bench_parser = sub.add_parser('bench', help="Compare sequential vs. pooled throughput offline")
+    bench_parser.add_argument('--file', default='assets/data/questions.json')
+    bench_parser.add_argument('--limit', type=int, default=50, help="Number of questions to use")
+    bench_parser.add_argument('--latency', type=float, default=0.02)
+    bench_parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    bench_parser.add_argument('--rps', type=float, default=0)
+    bench_parser.add_argument('--batch-size', type=int, default=25)
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        bench(args.file, args.limit, args.latency, args.workers, args.rps, args.batch_size)
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
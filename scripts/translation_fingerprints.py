@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Translation Fingerprints
+Remembers which German text each translation was produced from, so a run can
+tell stale translations (German source edited since) from current ones and
+retranslate only those fields.
+
+The record is committed next to the question store, so an edit of the German
+text is detected in any clone, whoever made it and whenever the next run is.
+It maps "<question id>|<field>" to the hash of the 'de' text the translations
+were made from, or to {language: hash} while the languages differ. Question
+IDs are unique across the store, so a question has one record whichever file
+(store, state or category file) it is translated in.
+
+Fields without a record (questions added by hand with their translations)
+are seeded with the current hash, i.e. assumed to match their German text.
+
+Usage:
+  python scripts/translation_fingerprints.py stale    # list fields whose German text changed
+  python scripts/translation_fingerprints.py seed     # record the fields of the store that have no record
+"""
+
+import argparse
+import json
+import os
+from typing import Any, Dict, Iterator, Tuple, Union
+
+from corpus import load_questions
+from json_io import atomic_write_text
+from translation_engine import TranslationJob
+from translation_memory import text_hash
+
+# Configuration
+FINGERPRINT_FILE = 'assets/data/translation_fingerprints.json'
+STORE_FILE = 'assets/data/questions.json'
+SOURCE_LANGUAGE = 'de'
+
+
+def fingerprint(text: str) -> str:
+    """Short content hash of a source string."""
+    return text_hash(text)[:16]
+
+
+def _sort_key(field_key: str) -> Tuple[Any, ...]:
+    question_id, _, field = field_key.partition('|')
+    return (0, int(question_id), field) if question_id.isdigit() else (1, question_id, field)
+
+
+class FingerprintStore:
+    """Per-field record of the source text hash behind each translation."""
+
+    def __init__(self, path: str = FINGERPRINT_FILE) -> None:
+        self.path = path
+        self.stale = 0
+        self._dirty = False
+        self._data: Dict[str, Dict[str, str]] = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self._data = {field_key: value if isinstance(value, dict) else {'*': value}
+                              for field_key, value in json.load(f).items()}
+
+    @staticmethod
+    def _field_key(question_id: Any, field: str) -> str:
+        return f"{question_id}|{field}"
+
+    @staticmethod
+    def _known(record: Dict[str, str], lang: str) -> Union[str, None]:
+        # '*' is the hash of every language without one of its own
+        return record.get(lang, record.get('*'))
+
+    def is_stale(self, key: str, question_id: Any, field: str, lang: str, source_text: str) -> bool:
+        """
+        True if the existing translation was made from a different source text.
+        key (the file being translated) is not part of the record: a question
+        is identified by its ID alone.
+        """
+        record = self._data.setdefault(self._field_key(question_id, field), {})
+        current = fingerprint(source_text)
+        known = self._known(record, lang)
+        if known is None:
+            if not record:
+                record['*'] = current
+            else:
+                record[lang] = current
+            self._dirty = True
+            return False
+        if known != current:
+            self.stale += 1
+            return True
+        return False
+
+    def record(self, key: str, question_id: Any, field: str, lang: str, source_text: str) -> None:
+        """Record that field/lang now holds a translation of source_text."""
+        record = self._data.setdefault(self._field_key(question_id, field), {})
+        current = fingerprint(source_text)
+        if self._known(record, lang) != current:
+            record[lang] = current
+            self._dirty = True
+
+    def record_job(self, job: TranslationJob) -> None:
+        """Engine callback: record a completed translation job."""
+        self.record(job.key, job.question_id, job.field, job.target_lang, job.source_text)
+
+    def _compact(self) -> Dict[str, Union[str, Dict[str, str]]]:
+        """A record whose languages all share one hash is stored as that hash."""
+        data: Dict[str, Union[str, Dict[str, str]]] = {}
+        for field_key in sorted(self._data, key=_sort_key):
+            record = self._data[field_key]
+            hashes = set(record.values())
+            data[field_key] = hashes.pop() if len(hashes) == 1 else dict(sorted(record.items()))
+        return data
+
+    def save(self) -> None:
+        """Write the record if anything changed."""
+        if not self._dirty:
+            return
+        atomic_write_text(json.dumps(self._compact(), ensure_ascii=False, indent=2) + '\n', self.path)
+        self._dirty = False
+
+
+def store_fields(questions: Any) -> Iterator[Tuple[Any, str, Dict[str, str]]]:
+    """(question id, field, text dict) of every question and answer text."""
+    for question in questions:
+        if isinstance(question.get('question'), dict):
+            yield question.get('id'), 'question', question['question']
+        for answer in question.get('answers', []):
+            if isinstance(answer, dict) and isinstance(answer.get('text'), dict):
+                yield question.get('id'), answer.get('id', '?'), answer['text']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Translation fingerprint tools")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('stale', help="List translated fields whose German text changed")
+    sub.add_parser('seed', help="Record the current German text of fields without a record")
+    args = parser.parse_args()
+
+    fingerprints = FingerprintStore()
+    stale = []
+    for question_id, field, text in store_fields(load_questions(STORE_FILE)):
+        source_text = text.get(SOURCE_LANGUAGE, '')
+        if not source_text:
+            continue
+        langs = [lang for lang, value in text.items()
+                 if lang != SOURCE_LANGUAGE and isinstance(value, str) and value.strip()]
+        stale_langs = [lang for lang in langs
+                       if fingerprints.is_stale(STORE_FILE, question_id, field, lang, source_text)]
+        if stale_langs:
+            stale.append((question_id, field, stale_langs))
+
+    if args.command == 'seed':
+        fingerprints.save()
+        print(f"[OK] {FINGERPRINT_FILE}")
+    for question_id, field, langs in stale:
+        print(f"   - #{question_id} {field}: {', '.join(langs)}")
+    print(f"[INFO] {len(stale)} fields with stale translations in {STORE_FILE}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Translation Journal & Checkpoints
+Makes long translation runs resumable.
+
+- TranslationJournal appends every completed translation to a JSONL file as it
+  happens. On --resume the journal is replayed onto the freshly loaded files, so
+  only the remaining work is sent to the translator.
+- Checkpointer rewrites changed files atomically, at most once per interval,
+  so the 730 KB questions file is not rewritten after every string.
+"""
+
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from translation_engine import TranslationJob
+from translation_fingerprints import FingerprintStore
+from translation_memory import text_hash
+
+# Configuration
+CHECKPOINT_INTERVAL = 60.0
+
+
+def find_text_dict(question: Dict[str, Any], field: str) -> Any:
+    """Locate the text dict for a journal entry field ('question' or an answer id)."""
+    if field == 'question':
+        return question.get('question')
+    for answer in question.get('answers', []):
+        if isinstance(answer, dict) and answer.get('id') == field:
+            return answer.get('text')
+    return None
+
+
+class TranslationJournal:
+    """Append-only JSONL log of completed translations."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.recorded = 0
+        self._file = None
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path) and os.path.getsize(self.path) > 0
+
+    def replay(self, corpus: Dict[str, List[Dict[str, Any]]]) -> int:
+        """
+        Apply journal entries to the loaded corpus (key -> questions).
+        Entries whose German source changed since they were written are ignored.
+        Returns the number of translations restored.
+        """
+        if not self.exists():
+            return 0
+        restored = 0
+        index: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a torn last line
+                    continue
+                key = entry.get('key')
+                if key not in corpus:
+                    continue
+                if key not in index:
+                    index[key] = {q.get('id'): q for q in corpus[key]}
+                question = index[key].get(entry.get('id'))
+                if question is None:
+                    continue
+                text_dict = find_text_dict(question, entry.get('field'))
+                if not isinstance(text_dict, dict):
+                    continue
+                if text_hash(text_dict.get(entry.get('source_lang', 'de'), '')) != entry.get('source_hash'):
+                    continue
+                text_dict[entry['lang']] = entry['text']
+                restored += 1
+        return restored
+
+    def open(self, append: bool) -> None:
+        """Open for writing; append=False discards previous entries."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._file = open(self.path, 'a' if append else 'w', encoding='utf-8')
+
+    def record(self, job: TranslationJob, source_lang: str = 'de') -> None:
+        """Append one completed translation and flush it to disk."""
+        entry = {
+            'key': job.key,
+            'id': job.question_id,
+            'field': job.field,
+            'source_lang': source_lang,
+            'source_hash': text_hash(job.source_text),
+            'lang': job.target_lang,
+            'text': job.text_dict[job.target_lang],
+        }
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+        self.recorded += 1
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        """Delete the journal after the results were saved."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class Checkpointer:
+    """Saves changed corpus entries at most once per interval."""
+
+    def __init__(self, save: Callable[[str], None], interval: float = CHECKPOINT_INTERVAL) -> None:
+        self.save = save
+        self.interval = interval
+        self.flushes = 0
+        self._dirty = set()
+        self._last = time.monotonic()
+
+    def mark(self, key: str) -> None:
+        """Mark a corpus entry as changed and flush if the interval has passed."""
+        self._dirty.add(key)
+        if time.monotonic() - self._last >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        for key in sorted(self._dirty):
+            self.save(key)
+        if self._dirty:
+            self.flushes += 1
+        self._dirty.clear()
+        self._last = time.monotonic()
+
+
+def journaled(journal: TranslationJournal, checkpointer: Checkpointer,
+              source_lang: str = 'de',
+              fingerprints: Optional[FingerprintStore] = None) -> Callable[[TranslationJob], None]:
+    """
+    Build an engine callback that journals each result, schedules checkpoints
+    and, if given, records the source fingerprint of the new translation.
+    """
+    def on_translated(job: TranslationJob) -> None:
+        journal.record(job, source_lang)
+        if fingerprints is not None:
+            fingerprints.record_job(job)
+        checkpointer.mark(job.key)
+    return on_translated
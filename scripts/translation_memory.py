@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Translation Memory
+Persistent on-disk cache of previous translations, shared by
+translate_questions.py and generate_state_questions.py.
+
+Entries are keyed by (sha256 of source text, source language, target language)
+and stored in a small SQLite database. Entries older than the configured age
+expire, and the least recently used entries are evicted once the memory grows
+beyond the configured size.
+
+Usage:
+  python scripts/translation_memory.py stats
+  python scripts/translation_memory.py purge
+  python scripts/translation_memory.py clear
+"""
+
+import atexit
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Dict, Optional
+
+# Configuration
+TM_FILE = '.cache/translation_memory.sqlite3'
+MAX_AGE_DAYS = 180
+MAX_ENTRIES = 100000
+COMMIT_EVERY = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    source_hash TEXT NOT NULL,
+    source_lang TEXT NOT NULL,
+    target_lang TEXT NOT NULL,
+    source_text TEXT NOT NULL,
+    translated_text TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (source_hash, source_lang, target_lang)
+)
+"""
+
+
+def text_hash(text: str) -> str:
+    """Return the hex sha256 digest of a source string."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class TranslationMemory:
+    """SQLite backed translation cache with hit/miss counters."""
+
+    def __init__(self, path: str = TM_FILE, max_age_days: float = MAX_AGE_DAYS,
+                 max_entries: int = MAX_ENTRIES) -> None:
+        self.path = path
+        self.max_age = max_age_days * 24 * 3600
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self._pending = 0
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def get(self, text: str, target_lang: str, source_lang: str) -> Optional[str]:
+        """Return the cached translation, or None on a miss or expired entry."""
+        key = (text_hash(text), source_lang, target_lang)
+        row = self._conn.execute(
+            "SELECT translated_text, created_at FROM translations "
+            "WHERE source_hash = ? AND source_lang = ? AND target_lang = ?",
+            key,
+        ).fetchone()
+
+        now = time.time()
+        if row is None or (self.max_age and now - row[1] > self.max_age):
+            self.misses += 1
+            return None
+
+        self._conn.execute(
+            "UPDATE translations SET last_used = ? "
+            "WHERE source_hash = ? AND source_lang = ? AND target_lang = ?",
+            (now,) + key,
+        )
+        self._mark_dirty()
+        self.hits += 1
+        return row[0]
+
+    def put(self, text: str, target_lang: str, source_lang: str, translated: str) -> None:
+        """Store a translation. Empty results are never cached."""
+        if not translated:
+            return
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (text_hash(text), source_lang, target_lang, text, translated, now, now),
+        )
+        self.stores += 1
+        self._mark_dirty()
+
+    def evict(self) -> int:
+        """Drop expired entries and trim to max_entries (least recently used first)."""
+        removed = 0
+        if self.max_age:
+            cursor = self._conn.execute(
+                "DELETE FROM translations WHERE created_at < ?",
+                (time.time() - self.max_age,),
+            )
+            removed += cursor.rowcount
+        if self.max_entries:
+            cursor = self._conn.execute(
+                "DELETE FROM translations WHERE rowid IN ("
+                "SELECT rowid FROM translations ORDER BY last_used DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            removed += cursor.rowcount
+        self._conn.commit()
+        self._pending = 0
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._conn.execute("DELETE FROM translations")
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def __bool__(self) -> bool:
+        # An empty memory is still a memory: without this, __len__ makes
+        # `if memory:` false until the first entry is stored
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for this session."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self),
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'hit_rate_pct': round(100 * self.hits / lookups) if lookups else 0,
+        }
+
+    def close(self) -> None:
+        """Evict, flush and close the database."""
+        if self._conn is None:
+            return
+        self.evict()
+        self._conn.close()
+        self._conn = None
+
+    def _mark_dirty(self) -> None:
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self._conn.commit()
+            self._pending = 0
+
+
+_default_memory: Optional[TranslationMemory] = None
+
+
+def default_memory() -> TranslationMemory:
+    """Return the process-wide translation memory, opened on first use."""
+    global _default_memory
+    if _default_memory is None:
+        _default_memory = TranslationMemory()
+        atexit.register(_default_memory.close)
+    return _default_memory
+
+
+def print_stats(memory: TranslationMemory) -> None:
+    """Print a one-line cache summary for script run summaries."""
+    s = memory.stats()
+    print(f"   - Translation memory: {s['hits']} hits, {s['misses']} misses "
+          f"({s['hit_rate_pct']}% hit rate), {s['entries']} entries")
+
+
+def main():
+    import sys
+
+    command = sys.argv[1].lower() if len(sys.argv) > 1 else 'stats'
+    memory = TranslationMemory()
+
+    if command == 'stats':
+        print(f"[INFO] {TM_FILE}: {len(memory)} entries")
+    elif command == 'purge':
+        removed = memory.evict()
+        print(f"[OK] Removed {removed} expired/evicted entries, {len(memory)} left")
+    elif command == 'clear':
+        memory.clear()
+        print(f"[OK] Cleared {TM_FILE}")
+    else:
+        print(f"[ERROR] Unknown command: {command}")
+    memory.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Translator Session Pool
+Reuses translator clients instead of building a new GoogleTranslator for every
+string. Sessions are pooled per (source, target) language pair; each session
+owns one client and one requests.Session, so HTTP connections are kept alive
+across calls. A session is used by one thread at a time (GoogleTranslator keeps
+per-call state on the instance), so concurrent callers get separate sessions.
+
+Every session records its call latencies; stats() aggregates them per pair.
+
+Usage:
+  python scripts/translator_pool.py bench [--calls 1500] [--setup-ms 5] [--latency-ms 0]
+    - Offline comparison of per-call client construction vs. pooled sessions
+"""
+
+import argparse
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+_local = threading.local()
+
+
+class TranslatorSession:
+    """One reusable client (plus optional HTTP session) with latency stats."""
+
+    def __init__(self, client: Any, http: Any = None) -> None:
+        self.client = client
+        self.http = http
+        self.latencies: List[float] = []
+
+    def translate(self, text: str) -> str:
+        start = time.perf_counter()
+        _local.http = self.http
+        try:
+            translated = self.client.translate(text)
+        finally:
+            _local.http = None
+            self.latencies.append(time.perf_counter() - start)
+        return translated if translated else ""
+
+    def close(self) -> None:
+        if self.http is not None:
+            self.http.close()
+
+
+class _SessionRouter:
+    """
+    Stand-in for the `requests` module inside deep_translator.google:
+    GET calls go through the calling session's requests.Session (keep-alive)
+    instead of opening a new connection each time.
+    """
+
+    def __init__(self, requests_module: Any) -> None:
+        self._requests = requests_module
+
+    def get(self, *args, **kwargs):
+        http = getattr(_local, 'http', None)
+        return (http or self._requests).get(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._requests, name)
+
+
+def _install_keepalive() -> None:
+    """Route deep_translator's HTTP calls through the active session (once)."""
+    import deep_translator.google as google_module
+
+    current = getattr(google_module, 'requests', None)
+    if current is not None and not isinstance(current, _SessionRouter):
+        google_module.requests = _SessionRouter(current)
+
+
+def google_session(source_lang: str, target_lang: str) -> TranslatorSession:
+    """Session factory for Google Translate via deep_translator."""
+    import requests
+    from deep_translator import GoogleTranslator
+
+    _install_keepalive()
+    return TranslatorSession(GoogleTranslator(source=source_lang, target=target_lang),
+                             requests.Session())
+
+
+class TranslatorPool:
+    """Pool of translator sessions keyed by (source, target)."""
+
+    def __init__(self, factory: Callable[[str, str], TranslatorSession] = google_session) -> None:
+        self.factory = factory
+        self._idle: Dict[Tuple[str, str], List[TranslatorSession]] = {}
+        self._all: Dict[Tuple[str, str], List[TranslatorSession]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def session(self, source_lang: str, target_lang: str) -> Iterator[TranslatorSession]:
+        """Check out an idle session for the pair (creating one if needed)."""
+        key = (source_lang, target_lang)
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            session = idle.pop() if idle else None
+        if session is None:
+            session = self.factory(source_lang, target_lang)
+            with self._lock:
+                self._all.setdefault(key, []).append(session)
+        try:
+            yield session
+        finally:
+            with self._lock:
+                self._idle[key].append(session)
+
+    def translate(self, text: str, target_lang: str, source_lang: str) -> str:
+        with self.session(source_lang, target_lang) as session:
+            return session.translate(text)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per language pair: sessions, calls and latency (ms) mean/p95/max."""
+        result = {}
+        with self._lock:
+            for (source, target), sessions in sorted(self._all.items()):
+                latencies = sorted(t for s in sessions for t in s.latencies)
+                if not latencies:
+                    continue
+                result[f"{source}->{target}"] = {
+                    'sessions': len(sessions),
+                    'calls': len(latencies),
+                    'mean_ms': round(1000 * sum(latencies) / len(latencies), 1),
+                    'p95_ms': round(1000 * latencies[int(0.95 * (len(latencies) - 1))], 1),
+                    'max_ms': round(1000 * latencies[-1], 1),
+                }
+        return result
+
+    def close(self) -> None:
+        with self._lock:
+            for sessions in self._all.values():
+                for session in sessions:
+                    session.close()
+            self._all.clear()
+            self._idle.clear()
+
+
+_default_pool: Optional[TranslatorPool] = None
+_default_lock = threading.Lock()
+
+
+def default_pool() -> TranslatorPool:
+    """Return the process-wide Google Translate session pool."""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = TranslatorPool()
+        return _default_pool
+
+
+def print_pool_stats(pool: Optional[TranslatorPool] = None) -> None:
+    """Print per-pair session latency stats for script run summaries."""
+    pool = pool or _default_pool
+    if pool is None:
+        return
+    for pair, s in pool.stats().items():
+        print(f"   - {pair}: {s['calls']} calls on {s['sessions']} session(s), "
+              f"mean {s['mean_ms']} ms, p95 {s['p95_ms']} ms, max {s['max_ms']} ms")
+
+
+class OfflineClient:
+    """Stand-in client: `setup` seconds to construct (client + connection), `latency` per call."""
+
+    def __init__(self, target_lang: str, setup: float, latency: float) -> None:
+        self.target_lang = target_lang
+        self.latency = latency
+        time.sleep(setup)
+
+    def translate(self, text: str) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        return f"[{self.target_lang}] {text}"
+
+
+def bench(calls: int, setup: float, latency: float) -> None:
+    """Compare per-call construction against pooled sessions, offline."""
+    langs = ['en', 'tr', 'uk', 'ru']
+    texts = [(f"Text {i}", langs[i % len(langs)]) for i in range(calls)]
+    print(f"[INFO] {calls} calls, client setup {setup * 1000:.1f} ms, call latency {latency * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    for text, lang in texts:
+        OfflineClient(lang, setup, latency).translate(text)
+    per_call = time.perf_counter() - start
+
+    pool = TranslatorPool(lambda source, target: TranslatorSession(OfflineClient(target, setup, latency)))
+    start = time.perf_counter()
+    for text, lang in texts:
+        pool.translate(text, lang, 'de')
+    pooled = time.perf_counter() - start
+
+    print(f"  per-call construction: {per_call:.3f}s ({1000 * per_call / calls:.3f} ms/call)")
+    print(f"  pooled sessions:       {pooled:.3f}s ({1000 * pooled / calls:.3f} ms/call)")
+    print_pool_stats(pool)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Translator session pool tools")
+    sub = parser.add_subparsers(dest='command')
+    bench_parser = sub.add_parser('bench', help="Offline per-call vs. pooled comparison")
+    bench_parser.add_argument('--calls', type=int, default=1500)
+    bench_parser.add_argument('--setup-ms', type=float, default=5.0)
+    bench_parser.add_argument('--latency-ms', type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        bench(args.calls, args.setup_ms / 1000, args.latency_ms / 1000)
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Asset Validator
+Checks every question file, state file and glossary.json under assets/data in
+one parallel pass (one worker process per file) and reports every violation
+with its file and id:
+
+- questions:  integer id unique in its file, category_id, a question text in
+              every language, exactly four answers A-D with text in every
+              language, correct_answer naming one of the answers
+- states:     state_code of a state file matches the file (saarland.json holds
+              SL questions), state_code only on 'state' questions elsewhere
+- glossary:   unique integer id, term, definition (and example) in every
+              language, keywords, related question ids that exist
+- tree:       an id used for different German questions in different files
+
+The rules are compiled once per file kind into a list of small check functions
+with their constants bound, so validating a question is one pass over that list.
+
+Known violations (data that predates the validator) are listed in
+scripts/validation_allowlist.json as {file: {rule: ids}}, ids in the layout
+format ("1-3, 7"). They are reported as known and do not fail the run; only new
+violations do. Allowlisted violations that no longer occur are reported, so the
+list only shrinks.
+
+Usage:
+  python scripts/validate_assets.py                 # validate assets/data, exit 1 on new violations
+  python scripts/validate_assets.py --summary       # only the count per rule
+  python scripts/validate_assets.py --update-allowlist   # accept the current violations as known
+  python scripts/validate_assets.py assets/data/states/saarland.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from corpus import DATA_DIR, STATES, question_files
+from json_io import write_json_if_changed
+from metrics import in_worker, metrics, run_metrics, stage
+from question_store import format_ids, parse_ids
+
+# Configuration
+GLOSSARY_FILE = 'assets/data/glossary.json'
+ALLOWLIST_FILE = 'scripts/validation_allowlist.json'
+LANGUAGES = ['de', 'ar', 'en', 'tr', 'uk', 'ru']
+ANSWER_IDS = ['A', 'B', 'C', 'D']
+SOURCE_LANGUAGE = 'de'
+STATE_CATEGORY = 'state'
+
+# (rule, message) for one record
+Problem = Tuple[str, str]
+Check = Callable[[Dict[str, Any]], Iterator[Problem]]
+# (path, record id, rule, message)
+Violation = Tuple[str, Any, str, str]
+# (file relative to the data directory, record id, rule)
+AllowKey = Tuple[str, Any, str]
+
+_STATE_BY_FILE = {state.filename: state.code for state in STATES.values()}
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _text_check(field: str, rule_prefix: str, langs: List[str], required: bool = True) -> Check:
+    """Check that record[field] maps every language to a non-empty string."""
+    langs = tuple(langs)
+
+    def check(record: Dict[str, Any]) -> Iterator[Problem]:
+        text = record.get(field)
+        if text is None and not required:
+            return
+        if not isinstance(text, dict):
+            yield f"{rule_prefix}-type", f"{field} is {type(text).__name__}, expected an object"
+            return
+        missing = [lang for lang in langs if lang not in text]
+        if missing:
+            yield 'missing-language', f"{field} has no {', '.join(missing)}"
+        empty = [lang for lang in langs if lang in text and not (isinstance(text[lang], str) and text[lang].strip())]
+        if empty:
+            yield 'empty-text', f"{field} is empty for {', '.join(empty)}"
+    return check
+
+
+def _answers_check(langs: List[str]) -> Check:
+    expected = tuple(ANSWER_IDS)
+    text = _text_check('text', 'answer-text', langs)
+
+    def check(question: Dict[str, Any]) -> Iterator[Problem]:
+        answers = question.get('answers')
+        if not isinstance(answers, list):
+            yield 'answers-type', f"answers is {type(answers).__name__}, expected a list"
+            return
+        ids = tuple(a.get('id') if isinstance(a, dict) else None for a in answers)
+        if len(answers) != len(expected):
+            yield 'answer-count', f"{len(answers)} answers, expected {len(expected)}"
+        if ids != expected[:len(ids)] or len(set(ids)) != len(ids):
+            yield 'answer-ids', f"answer ids {', '.join(str(i) for i in ids)}, expected {', '.join(expected)}"
+        for answer in answers:
+            if not isinstance(answer, dict):
+                yield 'answers-type', f"answer is {type(answer).__name__}, expected an object"
+                continue
+            for rule, message in text(answer):
+                yield rule, f"answer {answer.get('id')}: {message}"
+        correct = question.get('correct_answer')
+        if correct not in ids or correct is None:
+            yield 'correct-answer', f"correct_answer {correct!r} is not one of the answer ids"
+    return check
+
+
+def _category_check(question: Dict[str, Any]) -> Iterator[Problem]:
+    category = question.get('category_id')
+    if not isinstance(category, str) or not category:
+        yield 'category', f"category_id {category!r}, expected a non-empty string"
+
+
+def _optional_strings_check(fields: Tuple[str, ...]) -> Check:
+    def check(record: Dict[str, Any]) -> Iterator[Problem]:
+        for field in fields:
+            value = record.get(field)
+            if value is not None and not isinstance(value, str):
+                yield 'field-type', f"{field} is {type(value).__name__}, expected a string"
+    return check
+
+
+def _state_check(expected: Optional[str]) -> Check:
+    """state_code equal to expected (a state file), or only on 'state' questions (any other file)."""
+    if expected is not None:
+        def check(question: Dict[str, Any]) -> Iterator[Problem]:
+            code = question.get('state_code')
+            if code != expected:
+                yield 'state-code', f"state_code {code!r}, expected {expected!r} for this file"
+            if question.get('category_id') != STATE_CATEGORY:
+                yield 'state-category', f"category_id {question.get('category_id')!r} in a state file, expected {STATE_CATEGORY!r}"
+        return check
+
+    def check(question: Dict[str, Any]) -> Iterator[Problem]:
+        code = question.get('state_code')
+        if code is not None and code not in STATES:
+            yield 'state-code', f"unknown state_code {code!r}"
+        elif (code is not None) != (question.get('category_id') == STATE_CATEGORY):
+            yield 'state-category', f"state_code {code!r} with category_id {question.get('category_id')!r}"
+    return check
+
+
+def question_checks(path: str, langs: List[str] = LANGUAGES) -> List[Check]:
+    """The compiled checks for one question file (state files also check their state code)."""
+    return [
+        _category_check,
+        _text_check('question', 'question', langs),
+        _answers_check(langs),
+        _state_check(_STATE_BY_FILE.get(os.path.basename(path))
+                     if os.path.basename(os.path.dirname(path)) == 'states' else None),
+        _optional_strings_check(('topic', 'image')),
+    ]
+
+
+def _glossary_fields_check(term: Dict[str, Any]) -> Iterator[Problem]:
+    if not isinstance(term.get('term'), str) or not term['term'].strip():
+        yield 'term', f"term {term.get('term')!r}, expected a non-empty string"
+    keywords = term.get('keywords')
+    if keywords is not None and not (isinstance(keywords, list) and all(isinstance(k, str) for k in keywords)):
+        yield 'keywords', "keywords must be a list of strings"
+    related = term.get('related_question_ids')
+    if related is not None and not (isinstance(related, list) and all(_is_int(i) for i in related)):
+        yield 'related-ids', "related_question_ids must be a list of integers"
+    single = term.get('related_question_id')
+    if single is not None and not _is_int(single):
+        yield 'related-ids', f"related_question_id {single!r}, expected an integer"
+
+
+def glossary_checks(langs: List[str] = LANGUAGES) -> List[Check]:
+    return [
+        _glossary_fields_check,
+        _text_check('definition', 'definition', langs),
+        _text_check('example', 'example', langs, required=False),
+        _optional_strings_check(('category',)),
+    ]
+
+
+def is_glossary(path: str) -> bool:
+    return os.path.basename(path) == os.path.basename(GLOSSARY_FILE)
+
+
+def validate_file(path: str, langs: List[str] = LANGUAGES) -> Dict[str, Any]:
+    """
+    Validate one file (worker entry point). Returns its violations plus what the
+    tree-wide checks need: German text per question id, or the question ids a
+    glossary refers to.
+    """
+    result = {'path': path, 'records': 0, 'violations': [], 'questions': {}, 'references': []}
+    violations: List[Violation] = result['violations']
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            metrics().read(os.fstat(f.fileno()).st_size)
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        violations.append((path, None, 'json', str(e)))
+        return result
+    if not isinstance(data, list):
+        violations.append((path, None, 'json', f"top level is {type(data).__name__}, expected a list"))
+        return result
+
+    glossary = is_glossary(path)
+    checks = glossary_checks(langs) if glossary else question_checks(path, langs)
+    seen = set()
+    result['records'] = len(data)
+    for index, record in enumerate(data):
+        if not isinstance(record, dict):
+            violations.append((path, f"#{index}", 'record-type', f"{type(record).__name__}, expected an object"))
+            continue
+        record_id = record.get('id')
+        if not _is_int(record_id):
+            violations.append((path, f"#{index}", 'id', f"id {record_id!r}, expected an integer"))
+        elif record_id in seen:
+            violations.append((path, record_id, 'duplicate-id', "id used twice in this file"))
+        else:
+            seen.add(record_id)
+        for check in checks:
+            for rule, message in check(record):
+                violations.append((path, record_id, rule, message))
+
+        if glossary:
+            related = record.get('related_question_ids')
+            ids = list(related) if isinstance(related, list) else []
+            if record.get('related_question_id') is not None:
+                ids.append(record['related_question_id'])
+            result['references'].append((record_id, [i for i in ids if _is_int(i)]))
+        elif _is_int(record_id) and isinstance(record.get('question'), dict):
+            result['questions'][record_id] = str(record['question'].get(SOURCE_LANGUAGE, '')).strip()
+    return result
+
+
+def cross_file_violations(results: List[Dict[str, Any]]) -> List[Violation]:
+    """Ids used for different German questions, and glossary references to missing questions."""
+    violations = []
+    texts: Dict[int, Dict[str, str]] = {}
+    for result in results:
+        for question_id, text in result['questions'].items():
+            texts.setdefault(question_id, {})[result['path']] = text
+    for question_id, by_file in sorted(texts.items()):
+        if len(set(by_file.values())) > 1:
+            files = ', '.join(os.path.relpath(p, DATA_DIR) for p in sorted(by_file))
+            for path in sorted(by_file):
+                violations.append((path, question_id, 'id-conflict',
+                                   f"id used for different questions in {files}"))
+    if not texts:
+        # Only the glossary was given; its references cannot be resolved
+        return violations
+    for result in results:
+        for term_id, ids in result['references']:
+            missing = sorted({i for i in ids if i not in texts})
+            if missing:
+                violations.append((result['path'], term_id, 'related-ids',
+                                   f"related question(s) {', '.join(str(i) for i in missing)} do not exist"))
+    return violations
+
+
+def asset_files(data_dir: str = DATA_DIR) -> List[str]:
+    """Every question file (without the backup) plus the glossary."""
+    glossary = os.path.join(data_dir, os.path.basename(GLOSSARY_FILE))
+    return question_files(data_dir) + ([glossary] if os.path.exists(glossary) else [])
+
+
+def validate(paths: List[str], jobs: Optional[int] = None,
+             langs: List[str] = LANGUAGES) -> Tuple[List[Dict[str, Any]], List[Violation]]:
+    """Validate paths in parallel. Returns (per-file results, all violations in file order)."""
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(paths)))
+    if jobs == 1:
+        results = [validate_file(path, langs) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = []
+            for result, snapshot in pool.map(in_worker, [validate_file] * len(paths), paths,
+                                             [langs] * len(paths)):
+                metrics().merge(snapshot)
+                results.append(result)
+    violations = [v for result in results for v in result['violations']]
+    violations.extend(cross_file_violations(results))
+    order = {path: i for i, path in enumerate(paths)}
+    violations.sort(key=lambda v: order.get(v[0], len(order)))
+    return results, violations
+
+
+def data_file(path: str, data_dir: str = DATA_DIR) -> str:
+    """Allowlist name of a file: its path relative to the data directory."""
+    return os.path.relpath(path, data_dir).replace(os.sep, '/')
+
+
+def allow_key(violation: Violation) -> AllowKey:
+    path, record_id, rule, _ = violation
+    return data_file(path), record_id, rule
+
+
+def load_allowlist(allowlist_file: str = ALLOWLIST_FILE) -> Set[AllowKey]:
+    if not os.path.exists(allowlist_file):
+        return set()
+    with open(allowlist_file, 'r', encoding='utf-8') as f:
+        return {(file, record_id, rule)
+                for file, rules in json.load(f).items()
+                for rule, spec in rules.items()
+                for record_id in parse_ids(spec)}
+
+
+def save_allowlist(violations: List[Violation], allowlist_file: str = ALLOWLIST_FILE) -> bool:
+    """Allowlist the violations of records with an integer id. Returns True if written."""
+    data: Dict[str, Dict[str, Set[int]]] = {}
+    for violation in violations:
+        file, record_id, rule = allow_key(violation)
+        if _is_int(record_id):
+            data.setdefault(file, {}).setdefault(rule, set()).add(record_id)
+    return write_json_if_changed({file: {rule: format_ids(sorted(ids)) for rule, ids in sorted(rules.items())}
+                                  for file, rules in sorted(data.items())}, allowlist_file)
+
+
+def print_report(results: List[Dict[str, Any]], violations: List[Violation], summary: bool) -> None:
+    if not summary:
+        for path, record_id, rule, message in violations:
+            where = f"id {record_id}" if record_id is not None else 'file'
+            print(f"[ERROR] {path}: {where}: [{rule}] {message}")
+    by_rule: Dict[str, int] = {}
+    for _, _, rule, _ in violations:
+        by_rule[rule] = by_rule.get(rule, 0) + 1
+    if by_rule:
+        print("\n[SUMMARY]")
+        for rule, count in sorted(by_rule.items(), key=lambda item: (-item[1], item[0])):
+            print(f"  - {rule}: {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate the question and glossary assets")
+    parser.add_argument('files', nargs='*', help=f"Files to check (default: every asset file in {DATA_DIR})")
+    parser.add_argument('--jobs', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--summary', action='store_true', help="Only print the number of violations per rule")
+    parser.add_argument('--update-allowlist', action='store_true',
+                        help=f"Write the current violations to {ALLOWLIST_FILE} as known")
+    args = parser.parse_args()
+    if args.update_allowlist and args.files:
+        parser.error("--update-allowlist needs the whole tree (no files)")
+
+    paths = args.files or asset_files()
+    start = time.perf_counter()
+    with stage('validate'):
+        results, violations = validate(paths, args.jobs)
+    seconds = time.perf_counter() - start
+    metrics().count('violations', len(violations))
+
+    if args.update_allowlist:
+        written = save_allowlist(violations)
+        print(f"[{'OK' if written else 'SKIP'}] {ALLOWLIST_FILE}: {len(violations)} known violation(s)")
+        return
+
+    allowlist = load_allowlist()
+    new = [v for v in violations if allow_key(v) not in allowlist]
+    known = len(violations) - len(new)
+    checked = {data_file(path) for path in paths}
+    fixed = {key for key in allowlist if key[0] in checked} - {allow_key(v) for v in violations}
+    metrics().count('new_violations', len(new))
+
+    print_report(results, new, args.summary)
+    records = sum(result['records'] for result in results)
+    if known:
+        print(f"\n[INFO] {known} known violation(s) allowed by {ALLOWLIST_FILE}")
+    if fixed:
+        print(f"[INFO] {len(fixed)} allowlisted violation(s) no longer occur; "
+              f"drop them with --update-allowlist")
+    if new:
+        files_with = len({v[0] for v in new})
+        print(f"\n[ERROR] {len(new)} new violation(s) in {files_with} of {len(paths)} file(s) "
+              f"({records} records, {seconds * 1000:.0f} ms)")
+        sys.exit(1)
+    print(f"[OK] {len(paths)} file(s), {records} records valid ({seconds * 1000:.0f} ms)")
+
+
+if __name__ == '__main__':
+    with run_metrics('validate_assets'):
+        main()
@@ -1,10 +1,26 @@
 import 'dart:convert';
 import 'dart:io';
 
-/// Script to extract political/legal terms from questions.json and generate enriched glossary.json
+/// Script to extract political/legal terms from the bundled catalogue and generate enriched glossary.json
+///
+/// Reads the topic files the app loads (questions_general.json and the category
+/// files), not questions.json: that is the content store, which also holds the
+/// state questions, so related question IDs taken from it may not exist in the app.
+/// Run `python scripts/build_content.py` first so the topic files are current.
 /// 
 /// Usage: dart tool/generate_glossary.dart
 
+// Same list as LocalDataSourceImpl._topicFiles
+const topicFiles = [
+  'assets/data/questions_general.json',
+  'assets/data/questions_rights.json',
+  'assets/data/questions_system.json',
+  'assets/data/questions_europe.json',
+  'assets/data/questions_history.json',
+  'assets/data/questions_society.json',
+  'assets/data/questions_welfare.json',
+];
+
 void main() async {
   stdout.writeln('🚀 Starting Glossary Generation...\n');
 
@@ -22,18 +38,26 @@ void main() async {
     stdout.writeln('📚 Loaded ${existingTerms.length} existing terms from glossary.json');
   }
 
-  // Read questions.json (main file with all questions)
-  final questionsFile = File('assets/data/questions.json');
-  if (!await questionsFile.exists()) {
-    stdout.writeln('❌ Error: questions.json not found!');
-    stdout.writeln('   Looking for: ${questionsFile.absolute.path}');
-    exit(1);
-  }
+  // Read the topic files (a question shared by two files is counted once)
+  final questions = <dynamic>[];
+  final seenIds = <int>{};
+  for (final path in topicFiles) {
+    final topicFile = File(path);
+    if (!await topicFile.exists()) {
+      stdout.writeln('❌ Error: $path not found!');
+      stdout.writeln('   Looking for: ${topicFile.absolute.path}');
+      exit(1);
+    }
 
-  stdout.writeln('📖 Reading questions.json...');
-  final questionsContent = await questionsFile.readAsString();
-  final questions = json.decode(questionsContent) as List<dynamic>;
-  stdout.writeln('✅ Loaded ${questions.length} questions from questions.json\n');
+    stdout.writeln('📖 Reading $path...');
+    final topicContent = await topicFile.readAsString();
+    for (final questionData in json.decode(topicContent) as List<dynamic>) {
+      if (seenIds.add((questionData as Map<String, dynamic>)['id'] as int)) {
+        questions.add(questionData);
+      }
+    }
+  }
+  stdout.writeln('✅ Loaded ${questions.length} questions from ${topicFiles.length} topic files\n');
 
   // Political/Legal keywords to extract (B1/C1 level)
   final keywordsToExtract = {